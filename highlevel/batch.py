@@ -0,0 +1,173 @@
+"""
+Batch module.
+Run many independent simulations in parallel, with randomized parameters, to evaluate the
+robustness of the strategy.
+"""
+import argparse
+import asyncio
+import csv
+import dataclasses
+import logging
+import math
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, TextIO
+
+import attr
+
+from highlevel.container import (SIMULATION_CONFIG, cancel_all, get_container,
+                                 register_handlers, run_until_first_completed,
+                                 start_simulated_robots)
+from highlevel.robot.entity.type import Millimeter, Millisecond, Radian
+from highlevel.simulation.controller.runner import SimulationRunner
+from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
+from highlevel.simulation.entity.robot_id import RobotID
+
+# Relative variation of the rotation speed of the wheels between two runs.
+ROTATION_SPEED_VARIATION = 0.1
+# Maximum standard deviation of the encoder noise.
+MAX_ENCODER_NOISE = 0.05
+
+
+@dataclass(frozen=True)
+class RunResult:
+    """
+    Metrics of a single simulation run.
+    """
+    seed: Optional[int]
+    rotation_speed: float
+    encoder_noise: float
+    position_error: Millimeter  # Distance between the odometry and the actual position.
+    angle_error: Radian  # Difference between the odometry and the actual angle.
+    match_time: Millisecond  # Simulated time when the run stopped.
+    strategy_completed: bool
+
+
+def randomize_configuration(simulation_configuration: SimulationConfiguration,
+                            seed: int) -> SimulationConfiguration:
+    """
+    Return a copy of the simulation configuration, with parameters randomized from the seed.
+    The runs are not recorded.
+    """
+    rng = random.Random(seed)
+    rotation_speed = simulation_configuration.rotation_speed * rng.uniform(
+        1 - ROTATION_SPEED_VARIATION, 1 + ROTATION_SPEED_VARIATION)
+    return attr.evolve(simulation_configuration,
+                       rotation_speed=rotation_speed,
+                       encoder_noise=rng.uniform(0, MAX_ENCODER_NOISE),
+                       seed=seed,
+                       replay_path=None)
+
+
+async def _simulate(
+        simulation_configuration: SimulationConfiguration) -> RunResult:
+    """
+    Run the strategy in the simulation until it is done or the match is over, the extra robots
+    running their own program as in main.
+    """
+    i = await get_container(True,
+                            False,
+                            False,
+                            simulation_configuration=simulation_configuration)
+    register_handlers(i, True)
+
+    simulation_runner: SimulationRunner = i.get('simulation_runner')
+    strategy = asyncio.create_task(i.get('strategy_controller').run())
+    runner = asyncio.create_task(simulation_runner.run())
+    simulated_robots = start_simulated_robots(i)
+    try:
+        done = await run_until_first_completed({strategy, runner})
+    finally:
+        await cancel_all(simulated_robots)
+
+    robot_state = i.get('simulation_probe').probe()
+    state = simulation_runner.state
+    simulated_robot = state.robots[RobotID.RobotA]
+    angle_error = math.remainder(robot_state['angle'] - simulated_robot.angle,
+                                 2 * math.pi)
+    return RunResult(
+        seed=simulation_configuration.seed,
+        rotation_speed=simulation_configuration.rotation_speed,
+        encoder_noise=simulation_configuration.encoder_noise,
+        position_error=(robot_state['position'] -
+                        simulated_robot.position).euclidean_norm(),
+        angle_error=abs(angle_error),
+        match_time=state.time,
+        strategy_completed=strategy in done,
+    )
+
+
+def run_simulation(
+        simulation_configuration: SimulationConfiguration) -> RunResult:
+    """
+    Run a single simulation.
+    """
+    return asyncio.run(_simulate(simulation_configuration))
+
+
+def _silence_logs() -> None:
+    """
+    The runs would be flooding the output, only keep the warnings.
+    """
+    logging.disable(logging.INFO)
+
+
+def run_batch(
+    run_count: int,
+    first_seed: int = 0,
+    max_workers: Optional[int] = None,
+    simulation_configuration: SimulationConfiguration = SIMULATION_CONFIG
+) -> List[RunResult]:
+    """
+    Run `run_count` simulations with the seeds first_seed, first_seed + 1, etc. in a process pool
+    (one process per core by default).
+    """
+    configurations = [
+        randomize_configuration(simulation_configuration, seed)
+        for seed in range(first_seed, first_seed + run_count)
+    ]
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_silence_logs) as executor:
+        return list(executor.map(run_simulation, configurations))
+
+
+def write_results(results: List[RunResult], output: TextIO) -> None:
+    """
+    Write the results as a CSV table.
+    """
+    fields = [field.name for field in dataclasses.fields(RunResult)]
+    writer = csv.DictWriter(output, fieldnames=fields)
+    writer.writeheader()
+    for result in results:
+        writer.writerow(dataclasses.asdict(result))
+
+
+def main() -> None:
+    """
+    Main function.
+    Run the batch and print the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs',
+                        type=int,
+                        default=100,
+                        help='number of simulations')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=0,
+                        help='seed of the first simulation')
+    parser.add_argument('--workers',
+                        type=int,
+                        default=None,
+                        help='number of processes, one per core by default')
+    args = parser.parse_args()
+
+    _silence_logs()
+    results = run_batch(args.runs, args.seed, args.workers)
+    write_results(results, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
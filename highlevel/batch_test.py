@@ -0,0 +1,100 @@
+"""
+Test batch module.
+"""
+import io
+import math
+
+import attr
+
+from highlevel.batch import (MAX_ENCODER_NOISE, RunResult,
+                             randomize_configuration, run_batch,
+                             run_simulation, write_results)
+from highlevel.container import SIMULATION_CONFIG
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.util.geometry.vector import Vector2
+
+SHORT_MATCH_CONFIG = attr.evolve(SIMULATION_CONFIG, match_duration=2000)
+
+
+def test_randomize_configuration():
+    """
+    The randomized parameters only depend on the seed.
+    """
+    configuration = randomize_configuration(SIMULATION_CONFIG, 42)
+
+    assert configuration == randomize_configuration(SIMULATION_CONFIG, 42)
+    assert configuration != randomize_configuration(SIMULATION_CONFIG, 43)
+    assert configuration.seed == 42
+    assert 0 <= configuration.encoder_noise <= MAX_ENCODER_NOISE
+    assert configuration.obstacles == SIMULATION_CONFIG.obstacles
+
+
+def test_run_simulation_stops_at_the_end_of_the_match():
+    """
+    The simulation stops when the match is over, even if the strategy is not done.
+    """
+    result = run_simulation(randomize_configuration(SHORT_MATCH_CONFIG, 0))
+
+    assert result.seed == 0
+    assert result.match_time == 2000
+    assert not result.strategy_completed
+    assert result.position_error >= 0
+
+
+def test_run_batch():
+    """
+    Every run gives a result, in order.
+    """
+    results = run_batch(2,
+                        first_seed=10,
+                        max_workers=2,
+                        simulation_configuration=SHORT_MATCH_CONFIG)
+
+    assert [result.seed for result in results] == [10, 11]
+    assert results[0] == run_simulation(
+        randomize_configuration(SHORT_MATCH_CONFIG, 10))
+
+
+def test_write_results():
+    """
+    The results are written as a CSV table.
+    """
+    output = io.StringIO()
+    write_results([
+        RunResult(seed=1,
+                  rotation_speed=2,
+                  encoder_noise=0.5,
+                  position_error=10,
+                  angle_error=0.25,
+                  match_time=100,
+                  strategy_completed=True)
+    ], output)
+
+    assert output.getvalue().splitlines() == [
+        'seed,rotation_speed,encoder_noise,position_error,angle_error,'
+        'match_time,strategy_completed',
+        '1,2,0.5,10,0.25,100,True',
+    ]
+
+
+def test_run_simulation_is_reproducible():
+    """
+    The robot and the simulation run in lockstep: the same seed gives the same result.
+    """
+    configuration = randomize_configuration(SHORT_MATCH_CONFIG, 3)
+
+    assert run_simulation(configuration) == run_simulation(configuration)
+
+
+def test_run_simulation_with_extra_robots():
+    """
+    The extra robots run their own program, the run still stops at the end of the match.
+    """
+    configuration = attr.evolve(
+        randomize_configuration(SHORT_MATCH_CONFIG, 0),
+        extra_robots={RobotID.RobotB: (Vector2(2000, 1000), math.pi)})
+    result = run_simulation(configuration)
+
+    assert result.match_time == 2000
+    assert not result.strategy_completed
+    assert result == run_simulation(configuration)
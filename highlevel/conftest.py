@@ -76,9 +76,6 @@ def simulation_state_mock():
     """
     return SimulationState(
         time=0,
-        cups=[],
-        left_tick=0,
-        right_tick=0,
         last_position_update=0,
     )
 
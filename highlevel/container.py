@@ -0,0 +1,296 @@
+"""
+Container module.
+Build the dependency container of the robot (and of the simulation), and run its components.
+"""
+import asyncio
+import math
+from typing import Awaitable, Iterable, List, Set
+
+import attr
+import rplidar
+from serial.tools import list_ports
+
+from highlevel.robot.adapter.lidar import LIDARAdapter
+from highlevel.robot.adapter.lidar.rplidar import RPLIDARAdapter
+from highlevel.robot.adapter.lidar.simulated import SimulatedLIDARAdapter
+from highlevel.robot.adapter.socket import SocketAdapter
+from highlevel.robot.adapter.socket.socket_adapter import TCPSocketAdapter, LoopbackSocketAdapter
+from highlevel.robot.controller.debug import DebugController
+from highlevel.robot.controller.match_action import MatchActionController
+from highlevel.robot.controller.motion.localization import LocalizationController
+from highlevel.robot.controller.motion.motion import MotionController
+from highlevel.robot.controller.motion.odometry import OdometryController
+from highlevel.robot.controller.sensor.obstacle import ObstacleController
+from highlevel.robot.controller.sensor.occupancy_grid import OccupancyGridController
+from highlevel.robot.controller.sensor.rplidar import LidarController
+from highlevel.robot.controller.strategy import StrategyController
+from highlevel.robot.controller.symmetry import SymmetryController
+from highlevel.robot.entity.color import Color
+from highlevel.robot.entity.configuration import Configuration
+from highlevel.robot.entity.configuration import DebugConfiguration
+from highlevel.robot.entity.type import Radian
+from highlevel.robot.gateway.motion.motion import MotionGateway
+from highlevel.robot.handler.protobuf import ProtobufHandler
+from highlevel.simulation.controller.collision import CollisionDetector
+from highlevel.simulation.controller.event_queue import EventQueue
+from highlevel.simulation.controller.lidar_raycaster import LidarRaycaster
+from highlevel.simulation.controller.probe import SimulationProbe
+from highlevel.simulation.controller.replay_saver import ReplaySaver
+from highlevel.simulation.controller.runner import SimulatedRobot, SimulationRunner
+from highlevel.simulation.controller.snapshot import SnapshotController
+from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.simulation.entity.simulation_state import (CupArray, RobotState,
+                                                          RobotStateArray,
+                                                          SimulationState)
+from highlevel.simulation.gateway.simulation import SimulationGateway
+from highlevel.simulation.handler.simulation import SimulationHandler
+from highlevel.util import tcp
+from highlevel.util.clock import RealClock, SimulationClock
+from highlevel.util.dependency_container import DependencyContainer
+from highlevel.util.profiler import TickProfiler
+from highlevel.util.geometry.segment import Segment
+from highlevel.util.geometry.vector import Vector2
+
+CONFIG = Configuration(
+    initial_position=Vector2(200, 1200),
+    initial_angle=0,
+    robot_width=380,
+    robot_length=240,
+    field_shape=(3000, 2000),
+    color=Color.BLUE,
+    wheel_radius=73.8 / 2,
+    encoder_ticks_per_revolution=2400,
+    distance_between_wheels=357,
+    debug=DebugConfiguration(),
+)
+
+SIMULATION_CONFIG = SimulationConfiguration(
+    speed_factor=math.inf,  # Run the simulation as fast as possible.
+    match_duration=100_000,
+    replay_path='replay.rpl',
+    obstacles=[
+        Segment(start=Vector2(0, 0), end=Vector2(0, CONFIG.field_shape[1])),
+        Segment(start=Vector2(0, 0), end=Vector2(CONFIG.field_shape[0], 0)),
+        Segment(start=Vector2(*CONFIG.field_shape),
+                end=Vector2(0, CONFIG.field_shape[1])),
+        Segment(start=Vector2(*CONFIG.field_shape),
+                end=Vector2(CONFIG.field_shape[0], 0)),
+    ])
+
+
+async def get_container(
+    simulation: bool,
+    stub_lidar: bool,
+    stub_socket_can: bool,
+    simulation_configuration: SimulationConfiguration = SIMULATION_CONFIG
+) -> DependencyContainer:
+    """
+    Build the dependency container.
+    """
+
+    i = DependencyContainer()
+
+    i.provide('configuration', CONFIG)
+    _provide_robot(i)
+
+    if simulation:
+        # The robot runs on the time of the simulation.
+        i.provide('clock', SimulationClock)
+        i.provide('simulation_configuration', simulation_configuration)
+        i.provide(
+            'tick_profiler',
+            TickProfiler(enabled=simulation_configuration.profile_ticks,
+                         capacity=simulation_configuration.profile_window))
+        i.provide('event_queue', EventQueue())
+        i.provide('robot_id', RobotID.RobotA)
+
+        i.provide('simulation_handler', SimulationHandler)
+        i.provide('simulation_runner', SimulationRunner)
+        i.provide('lidar_raycaster', LidarRaycaster)
+        i.provide('collision_detector', CollisionDetector)
+        i.provide(
+            'simulation_state',
+            SimulationState(time=0,
+                            last_position_update=0,
+                            last_lidar_update=0,
+                            robots=RobotStateArray({
+                                RobotID.RobotA:
+                                RobotState(position=CONFIG.initial_position,
+                                           angle=CONFIG.initial_angle)
+                            }),
+                            cups=CupArray(simulation_configuration.cups)))
+        i.provide('simulation_gateway', SimulationGateway)
+        i.provide('snapshot_controller', SnapshotController)
+
+        i.provide('replay_saver', ReplaySaver)
+    else:
+        i.provide('clock', RealClock)
+        i.provide('tick_profiler', TickProfiler())
+
+    if simulation or stub_lidar:
+        i.provide('lidar_adapter', SimulatedLIDARAdapter)
+    else:
+        rplidar_obj = rplidar.RPLidar(list_ports.comports()[0].device)
+        i.provide('rplidar_object', rplidar_obj)
+        i.provide('lidar_adapter', RPLIDARAdapter)
+
+    if simulation or stub_socket_can:
+        i.provide('socket_adapter', LoopbackSocketAdapter)
+        i.provide('motor_board_adapter', LoopbackSocketAdapter)
+    else:
+        reader, writer = await tcp.get_reader_writer('localhost', 32000)
+        i.provide('motor_board_adapter',
+                  TCPSocketAdapter,
+                  reader=reader,
+                  writer=writer)
+
+    if simulation:
+        i.provide('simulated_robots', [
+            _get_simulated_robot_container(i, robot_id, position, angle)
+            for robot_id, (
+                position,
+                angle) in simulation_configuration.extra_robots.items()
+        ])
+
+    return i
+
+
+def _provide_robot(i: DependencyContainer) -> None:
+    """
+    Provide the components of the robot's program.
+    """
+    i.provide('protobuf_handler', ProtobufHandler)
+
+    i.provide('odometry_controller', OdometryController)
+    i.provide('localization_controller', LocalizationController)
+    i.provide('motion_controller', MotionController)
+    i.provide('strategy_controller', StrategyController)
+    i.provide('symmetry_controller', SymmetryController)
+    i.provide('lidar_controller', LidarController)
+    i.provide('obstacle_controller', ObstacleController)
+    i.provide('occupancy_grid_controller', OccupancyGridController)
+    i.provide('debug_controller', DebugController)
+    i.provide('match_action_controller', MatchActionController)
+
+    i.provide('motion_gateway', MotionGateway)
+
+    i.provide('simulation_probe', SimulationProbe)
+    i.provide('event_loop', asyncio.get_event_loop())
+
+
+def _get_simulated_robot_container(i: DependencyContainer, robot_id: RobotID,
+                                   position: Vector2,
+                                   angle: Radian) -> DependencyContainer:
+    """
+    Build the dependency container of another robot of the simulation of `i`: it runs its own
+    copy of the robot's program, with its own event queue and loopback adapters, on the clock and
+    the state of the simulation.
+    """
+    robot = DependencyContainer()
+
+    robot.provide(
+        'configuration',
+        attr.evolve(CONFIG, initial_position=position, initial_angle=angle))
+    _provide_robot(robot)
+
+    for name in ('clock', 'simulation_configuration', 'simulation_state',
+                 'tick_profiler'):
+        robot.provide(name, i.get(name))
+    robot.provide('event_queue', EventQueue())
+    robot.provide('robot_id', robot_id)
+    robot.provide('simulation_handler', SimulationHandler)
+    robot.provide('simulation_gateway', SimulationGateway)
+    robot.provide('lidar_adapter', SimulatedLIDARAdapter)
+    robot.provide('socket_adapter', LoopbackSocketAdapter)
+    robot.provide('motor_board_adapter', LoopbackSocketAdapter)
+
+    simulation_runner: SimulationRunner = i.get('simulation_runner')
+    simulation_runner.add_robot(
+        robot_id,
+        SimulatedRobot(event_queue=robot.get('event_queue'),
+                       simulation_gateway=robot.get('simulation_gateway'),
+                       simulation_probe=robot.get('simulation_probe')),
+        position, angle)
+    return robot
+
+
+def register_handlers(i: DependencyContainer, simulation: bool) -> None:
+    """
+    Register the handlers on the adapters, so that the robots (and the simulation) get the
+    messages.
+    """
+    _register_robot_handlers(i, simulation)
+    if simulation:
+        for robot in i.get('simulated_robots'):
+            _register_robot_handlers(robot, simulation)
+
+
+def _register_robot_handlers(i: DependencyContainer, simulation: bool) -> None:
+    """
+    Register the handlers of a robot on its adapters.
+    """
+    lidar_adapter: LIDARAdapter = i.get('lidar_adapter')
+    lidar_controller: LidarController = i.get('lidar_controller')
+    lidar_adapter.register_handler(lidar_controller.set_detection)
+
+    # Register the CAN bus to call the handlers.
+    motor_board_adapter: SocketAdapter = i.get('motor_board_adapter')
+    protobuf_handler: ProtobufHandler = i.get('protobuf_handler')
+    motor_board_adapter.register_handler(protobuf_handler.translate_message)
+
+    if simulation:
+        simulation_handler: SimulationHandler = i.get('simulation_handler')
+        motor_board_adapter.register_handler(
+            simulation_handler.handle_movement_order)
+
+
+async def run_until_first_completed(
+        awaitables: Iterable[Awaitable]) -> Set[asyncio.Future]:
+    """
+    Run the coroutines until one of them stops, then cancel the others.
+    Return the futures that are done.
+    """
+    futures: Set[asyncio.Future] = {
+        asyncio.ensure_future(awaitable)
+        for awaitable in awaitables
+    }
+    done, pending = await asyncio.wait(futures,
+                                       return_when=asyncio.FIRST_COMPLETED)
+
+    # Gather the done coroutines to have proper stacktraces.
+    await asyncio.gather(*done)
+
+    # Cancel every coroutines that have not stopped yet.
+    gather = asyncio.gather(*pending)
+    gather.cancel()
+    try:
+        await gather
+    except asyncio.CancelledError:
+        pass
+
+    return done
+
+
+def start_simulated_robots(i: DependencyContainer) -> List[asyncio.Future]:
+    """
+    Start the programs of the extra robots of the simulation in the background: the match does not
+    end when one of them is done.
+    """
+    return [
+        asyncio.ensure_future(robot.get('strategy_controller').run())
+        for robot in i.get('simulated_robots')
+    ]
+
+
+async def cancel_all(futures: Iterable[asyncio.Future]) -> None:
+    """
+    Cancel the futures and wait for them, raise the exception of the ones that failed.
+    """
+    futures = list(futures)
+    for future in futures:
+        future.cancel()
+    for result in await asyncio.gather(*futures, return_exceptions=True):
+        if isinstance(result, Exception) and not isinstance(
+                result, asyncio.CancelledError):
+            raise result
@@ -0,0 +1,124 @@
+"""
+Test container module.
+"""
+import asyncio
+import math
+import time
+
+import attr
+import pytest
+
+from highlevel.container import (CONFIG, SIMULATION_CONFIG, cancel_all,
+                                 get_container, register_handlers,
+                                 run_until_first_completed,
+                                 start_simulated_robots)
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.virtual_time import run_in_virtual_time
+
+
+@pytest.mark.asyncio
+async def test_simulation_injection():
+    """
+    Make sure the simulation can be instantiated.
+    """
+    i = await get_container(True, False, False)
+    i.get('simulation_runner')
+
+
+@pytest.mark.asyncio
+async def test_simulation_is_not_injected_when_not_simulating():
+    """
+    Make sure the simulation is not instantiated when running in non-simulation mode.
+    """
+    with pytest.raises(Exception):
+        i = await get_container(False, True, True)
+        i.get('simulation_runner')
+
+
+@pytest.mark.asyncio
+async def test_strategy_injection():
+    """
+    Make sure the strategy controller can be instantiated.
+    """
+    i = await get_container(True, False, False)
+    i.get('strategy_controller')
+
+
+@pytest.mark.asyncio
+async def test_replay_injection():
+    """
+    Make sure the replay server can be instantiated.
+    """
+    i = await get_container(True, False, False)
+    i.get('replay_saver')
+
+
+@pytest.mark.asyncio
+async def test_snapshot_injection():
+    """
+    Make sure the snapshot controller can be instantiated.
+    """
+    i = await get_container(True, False, False)
+    i.get('snapshot_controller')
+
+
+def test_simulation_in_virtual_time():
+    """
+    In virtual time, the simulation runs at normal speed on the loop clock, without waiting.
+    """
+    simulation_configuration = attr.evolve(SIMULATION_CONFIG,
+                                           speed_factor=1,
+                                           match_duration=2000,
+                                           replay_path=None)
+
+    async def simulate():
+        i = await get_container(
+            True,
+            False,
+            False,
+            simulation_configuration=simulation_configuration)
+        register_handlers(i, True)
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        await run_until_first_completed({
+            i.get('simulation_runner').run(),
+            i.get('strategy_controller').run(),
+            i.get('motor_board_adapter').run(),
+        })
+        return loop.time() - start
+
+    start = time.perf_counter()
+    assert run_in_virtual_time(simulate()) == pytest.approx(2)
+    assert time.perf_counter() - start < 2
+
+
+@pytest.mark.asyncio
+async def test_simulation_with_extra_robots():
+    """
+    The extra robots run their own program in the simulation, on their own state.
+    """
+    initial_position = Vector2(2000, 1000)
+    simulation_configuration = attr.evolve(
+        SIMULATION_CONFIG,
+        match_duration=5000,
+        replay_path=None,
+        extra_robots={RobotID.RobotB: (initial_position, math.pi)})
+    i = await get_container(True, False, False, simulation_configuration)
+    register_handlers(i, True)
+    robot_b = i.get('simulated_robots')[0]
+
+    simulated_robots = start_simulated_robots(i)
+    await run_until_first_completed({
+        i.get('simulation_runner').run(),
+        i.get('strategy_controller').run(),
+    })
+    assert not any(future.done() for future in simulated_robots)
+    await cancel_all(simulated_robots)
+
+    state = i.get('simulation_state')
+    assert set(state.robots) == {RobotID.RobotA, RobotID.RobotB}
+    assert state.robots[RobotID.RobotB].position != initial_position
+    assert state.robots[RobotID.RobotA].position != CONFIG.initial_position
+    assert robot_b.get('simulation_probe').probe()['position'] != i.get(
+        'simulation_probe').probe()['position']
@@ -2,11 +2,16 @@
 LIDAR Adapter module.
 """
 from abc import ABC, abstractmethod
-from typing import Callable, Tuple
+from typing import Callable, Tuple, Union
+
+import numpy
 
 from highlevel.robot.entity.type import Radian, Millimeter
 
-Callback = Callable[[Tuple[Tuple[Radian, Millimeter], ...]], None]
+# Readings of a full rotation of the LIDAR, as (angle, distance) pairs. The RPLIDAR adapter sends
+# them as a read-only (N, 2) array.
+Readings = Union[Tuple[Tuple[Radian, Millimeter], ...], numpy.ndarray]
+Callback = Callable[[Readings], None]
 
 
 class LIDARAdapter(ABC):
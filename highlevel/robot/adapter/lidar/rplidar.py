@@ -2,23 +2,44 @@
 Lidar adapter module.
 """
 import asyncio
-from math import pi
-from typing import List
+from typing import List, Optional
 
+import numpy
 import rplidar
 
+from highlevel.logger import LOGGER
 from highlevel.robot.adapter.lidar import Callback, LIDARAdapter
+from highlevel.robot.adapter.lidar.scan_ring import ScanRing
+from highlevel.util.handoff import LatestValueHandoff
+
+# Size of the buffer of measurements of the rplidar driver.
+MAX_BUFFER_MEASURES = 3500
+# Maximum number of measurements in a scan, and number of scans decoded before their buffer is
+# reused.
+MAX_SCAN_MEASURES = 2048
+SCAN_RING_SIZE = 4
+# Scans with fewer measurements are dropped.
+MIN_SCAN_MEASURES = 5
 
 
 class RPLIDARAdapter(LIDARAdapter):
-    """Rplidar adapter receives positions of obstacles from a rplidar."""
+    """
+    Rplidar adapter receives positions of obstacles from a rplidar.
+
+    The rplidar is read on a thread of the executor, the scans are handed to the event loop, which
+    calls the handlers. If the loop is busy when a scan arrives, the scan waiting for it is dropped
+    and only the latest one is delivered.
+    """
     def __init__(self, rplidar_obj: rplidar.RPLidar):
         self._rplidar = rplidar_obj
         self._handlers: List[Callback] = []
+        self._scans = ScanRing(SCAN_RING_SIZE, MAX_SCAN_MEASURES)
+        self._handoff: Optional[LatestValueHandoff[numpy.ndarray]] = None
 
     def register_handler(self, handler: Callback) -> None:
         """
-        Register a handler to be called with the LIDAR readings.
+        Register a handler to be called on the event loop with the LIDAR readings, as a read-only
+        (N, 2) array of (angle, distance) rows. The array is reused SCAN_RING_SIZE scans later.
         """
         self._handlers.append(handler)
 
@@ -27,19 +48,37 @@ class RPLIDARAdapter(LIDARAdapter):
         Run the LIDAR.
         """
         loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._loop)
+        self._handoff = LatestValueHandoff(loop, self._dispatch)
+        await loop.run_in_executor(None, self._loop, self._handoff)
 
-    def _loop(self) -> None:
-        """ Loop to receive the obstacles from the rplidar and dispatch them to the hanler. """
+    def _loop(self, handoff: LatestValueHandoff[numpy.ndarray]) -> None:
+        """ Loop to receive the obstacles from the rplidar and hand them to the event loop. """
+        scans = self._scans
         try:
-            for scans in self._rplidar.iter_scans(scan_type='express',
-                                                  max_buf_meas=3500):
+            # Decode the measurements one by one straight into the scan ring, rather than
+            # letting iter_scans build a list of tuples for each scan.
+            for new_scan, quality, angle, distance in self._rplidar.iter_measures(
+                    scan_type='express', max_buf_meas=MAX_BUFFER_MEASURES):
+                if new_scan:
+                    if len(scans) > MIN_SCAN_MEASURES:
+                        handoff.put(scans.commit())
+                    else:
+                        scans.clear()
 
-                readings = tuple((angle * pi / 180, distance)
-                                 for _, angle, distance in scans)
-                for handler in self._handlers:
-                    handler(readings)
+                if quality > 0 and distance > 0:
+                    scans.append(angle, distance)
         finally:
             self._rplidar.stop()
             self._rplidar.stop_motor()
             self._rplidar.disconnect()
+            LOGGER.get().info('rplidar_stopped',
+                              scans=handoff.stats.put,
+                              dropped_scans=handoff.stats.dropped,
+                              dropped_measures=scans.dropped)
+
+    def _dispatch(self, readings: numpy.ndarray) -> None:
+        """
+        Call the handlers with a scan, on the event loop.
+        """
+        for handler in self._handlers:
+            handler(readings)
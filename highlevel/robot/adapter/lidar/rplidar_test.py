@@ -0,0 +1,36 @@
+"""
+Test for RPLIDAR adapter module.
+"""
+import math
+from unittest.mock import MagicMock
+
+import pytest
+import rplidar
+
+from highlevel.robot.adapter.lidar.rplidar import RPLIDARAdapter
+
+
+@pytest.mark.asyncio
+async def test_run_dispatches_scans():
+    """
+    The handlers get each full scan, without the measurements of distance or quality 0, and the
+    short scans are dropped.
+    """
+    rplidar_mock = MagicMock(spec=rplidar.RPLidar)
+    measures = [(True, 15, 90, 100)] + [(False, 15, 180, 200)] * 5 + [
+        (False, 15, 270, 0),
+        (False, 0, 45, 500),
+        (True, 15, 0, 300),
+        (False, 15, 90, 300),
+        (True, 15, 0, 400),
+    ]
+    rplidar_mock.iter_measures.return_value = iter(measures)
+    scans = []
+    adapter = RPLIDARAdapter(rplidar_mock)
+    adapter.register_handler(lambda readings: scans.append(readings.tolist()))
+
+    await adapter.run()
+
+    assert scans == [[[math.pi / 2, 100]] + [[math.pi, 200]] * 5]
+    rplidar_mock.stop.assert_called_once()
+    rplidar_mock.disconnect.assert_called_once()
@@ -0,0 +1,64 @@
+"""
+Scan ring module.
+"""
+import numpy
+
+
+class ScanRing:
+    """
+    Preallocated buffers the LIDAR scans are decoded into, so that receiving a scan does not
+    allocate anything.
+
+    The ring holds `size` buffers of `capacity` (angle, distance) rows. The measurements of the
+    current scan are appended to the current buffer, with their angle in degrees as the LIDAR
+    sends them. commit converts the angles to radians in one go and returns a read-only view of the
+    scan, then moves on to the next buffer.
+
+    The views are not copies: a scan is overwritten `size` scans later, the handlers that keep a
+    scan longer than that must copy it.
+    """
+    def __init__(self, size: int, capacity: int):
+        self._buffers = numpy.zeros((size, capacity, 2))
+        self._current = 0
+        self._length = 0
+        self.dropped = 0  # Measurements that did not fit in their buffer.
+
+    def __len__(self) -> int:
+        """
+        Number of measurements of the current scan.
+        """
+        return self._length
+
+    def append(self, angle: float, distance: float) -> None:
+        """
+        Add a measurement to the current scan, `angle` in degrees. The measurements past the
+        capacity of the buffer are dropped.
+        """
+        buffer = self._buffers[self._current]
+        if self._length == len(buffer):
+            self.dropped += 1
+            return
+
+        buffer[self._length] = angle, distance
+        self._length += 1
+
+    def clear(self) -> None:
+        """
+        Drop the measurements of the current scan.
+        """
+        self._length = 0
+
+    def commit(self) -> numpy.ndarray:
+        """
+        End the current scan and return it as a read-only (N, 2) view of (angle, distance) rows,
+        the angles in radians.
+        """
+        scan = self._buffers[self._current, :self._length]
+        numpy.radians(scan[:, 0], out=scan[:, 0])
+
+        self._current = (self._current + 1) % len(self._buffers)
+        self._length = 0
+
+        view = scan.view()
+        view.flags.writeable = False
+        return view
@@ -0,0 +1,78 @@
+"""
+Test for scan ring module.
+"""
+import math
+
+import numpy
+import pytest
+
+from highlevel.robot.adapter.lidar.scan_ring import ScanRing
+
+
+def test_commit_converts_angles():
+    """
+    The committed scan holds the measurements, the angles in radians.
+    """
+    scans = ScanRing(size=2, capacity=10)
+    scans.append(90, 100)
+    scans.append(180, 200)
+    assert len(scans) == 2
+
+    scan = scans.commit()
+
+    assert scan.tolist() == [[math.pi / 2, 100], [math.pi, 200]]
+    assert not scan.flags.writeable
+    assert len(scans) == 0
+
+
+def test_buffers_are_reused():
+    """
+    A scan is overwritten once the ring wraps around, and is not copied before.
+    """
+    scans = ScanRing(size=2, capacity=10)
+    scans.append(0, 1)
+    first = scans.commit()
+    scans.append(0, 2)
+    second = scans.commit()
+    scans.append(0, 3)
+    third = scans.commit()
+
+    assert second.tolist() == [[0, 2]]
+    assert numpy.shares_memory(first, third)
+    assert first.tolist() == [[0, 3]]
+
+
+def test_capacity():
+    """
+    The measurements past the capacity of a buffer are dropped.
+    """
+    scans = ScanRing(size=1, capacity=2)
+    for distance in range(3):
+        scans.append(0, distance)
+
+    assert scans.commit().tolist() == [[0, 0], [0, 1]]
+    assert scans.dropped == 1
+
+
+def test_clear():
+    """
+    Clearing the current scan drops its measurements.
+    """
+    scans = ScanRing(size=1, capacity=2)
+    scans.append(0, 1)
+    scans.clear()
+    scans.append(0, 2)
+
+    assert scans.commit().tolist() == [[0, 2]]
+
+
+def test_read_only():
+    """
+    The handlers cannot modify the scans.
+    """
+    scans = ScanRing(size=1, capacity=2)
+    scans.append(0, 1)
+    scan = scans.commit()
+
+    with pytest.raises(ValueError):
+        scan[0, 1] = 2
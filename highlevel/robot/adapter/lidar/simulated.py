@@ -2,14 +2,11 @@
 Simulated LIDAR module.
 """
 import asyncio
-from math import pi
 from typing import List, Tuple
 
 from highlevel.robot.adapter.lidar import LIDARAdapter, Callback
 from highlevel.robot.entity.type import Radian, Millimeter
 
-POINTS = tuple((angle * pi / 180, 100) for angle in range(36))
-
 
 class SimulatedLIDARAdapter(LIDARAdapter):
     """
@@ -24,6 +21,14 @@ class SimulatedLIDARAdapter(LIDARAdapter):
         """
         self._handlers.append(handler)
 
+    @property
+    def has_handlers(self) -> bool:
+        """
+        Check if anything reads the readings, the simulation does not need to compute them
+        otherwise.
+        """
+        return bool(self._handlers)
+
     async def run(self) -> None:
         """
         Run the adapter forever.
@@ -31,12 +36,6 @@ class SimulatedLIDARAdapter(LIDARAdapter):
         while True:
             await asyncio.sleep(1e6)
 
-    def push_simulated_circle_readings(self) -> None:
-        """
-        Push readings as if the robot was in a cylinder.
-        """
-        self.push_simulated_readings(POINTS)
-
     def push_simulated_readings(
             self, readings: Tuple[Tuple[Radian, Millimeter], ...]) -> None:
         """
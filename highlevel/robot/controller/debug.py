@@ -11,19 +11,27 @@ from websockets.protocol import State
 from highlevel.logger import LOGGER
 from highlevel.robot.entity.configuration import Configuration
 from highlevel.simulation.controller.probe import SimulationProbe
+from highlevel.util.clock import Clock
 from highlevel.util.json_encoder import RobotJSONEncoder
+from highlevel.util.profiler import TickProfiler
 
 
 class DebugController:
     """
-    Class that sends periodically the state of the robot on a websocket.
+    Class that sends periodically the state of the robot on a websocket, along with the timings of
+    the simulation ticks if they are profiled.
     """
+
+    # pylint: disable=too-many-arguments
     def __init__(self, configuration: Configuration,
                  simulation_probe: SimulationProbe,
-                 event_loop: asyncio.AbstractEventLoop):
+                 event_loop: asyncio.AbstractEventLoop, clock: Clock,
+                 tick_profiler: TickProfiler):
         self._configuration = configuration
+        self._clock = clock
         self._simulation_probe = simulation_probe
         self._event_loop = event_loop
+        self._tick_profiler = tick_profiler
 
     async def _callback(self, websocket: websockets.WebSocketServerProtocol,
                         _: str) -> None:
@@ -33,9 +41,15 @@ class DebugController:
         LOGGER.get().info("new_debug_connection")
         while websocket.state in (State.CONNECTING, State.OPEN):
             data = self._simulation_probe.probe()
+            if self._tick_profiler.enabled:
+                profile = self._tick_profiler.summary()
+                for phase, summary in profile.items():
+                    summary['histogram'] = self._tick_profiler.histogram(
+                        phase)
+                data['tick_profile'] = profile
             json_data = json.dumps(data, cls=RobotJSONEncoder)
             await websocket.send(json_data)
-            await asyncio.sleep(1 / self._configuration.debug.refresh_rate)
+            await self._clock.sleep(1 / self._configuration.debug.refresh_rate)
 
     async def run(self) -> None:
         """
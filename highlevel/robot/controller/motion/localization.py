@@ -2,6 +2,7 @@
 Localization controller module.
 """
 import asyncio
+import dataclasses
 import math
 from dataclasses import dataclass
 
@@ -127,6 +128,20 @@ class LocalizationController:
         await self.motion_gateway.rotate(distance_ticks)
         await self._state.movement_done_event.wait()
 
+    def snapshot(self) -> State:
+        """
+        Capture the state of the controller.
+        """
+        return dataclasses.replace(self._state)
+
+    def restore(self, state: State) -> None:
+        """
+        Restore a state captured by snapshot. Whoever waits for the end of the current movement
+        keeps waiting.
+        """
+        self._state = dataclasses.replace(
+            state, movement_done_event=self._state.movement_done_event)
+
     def get_angle(self) -> Radian:
         """"
         Get the robot's angle.
@@ -106,3 +106,22 @@ class TestLocalizationController:
         asyncio.create_task(localization_controller.rotate(4 * math.pi))
         await asyncio.sleep(0.1)
         motion_gateway_mock.rotate.assert_called_once_with(1)
+
+    @staticmethod
+    def test_snapshot_restore(localization_controller,
+                              odometry_controller_mock):
+        """
+        Restoring a snapshot goes back to the previous position.
+        """
+        odometry_controller_mock.odometry = MagicMock(
+            return_value=(Vector2(1, 2), 3))
+        localization_controller.update_odometry_position(10, 10)
+        snapshot = localization_controller.snapshot()
+
+        odometry_controller_mock.odometry = MagicMock(
+            return_value=(Vector2(4, 5), 6))
+        localization_controller.update_odometry_position(20, 20)
+        localization_controller.restore(snapshot)
+
+        assert localization_controller.get_position() == Vector2(1, 2)
+        assert localization_controller.get_angle() == 3
@@ -2,6 +2,7 @@
 Odemetry module
 """
 import math
+from dataclasses import dataclass
 from typing import Tuple
 
 from highlevel.robot.entity.configuration import Configuration
@@ -9,6 +10,16 @@ from highlevel.robot.entity.type import Radian, Millimeter
 from highlevel.util.geometry.vector import Vector2
 
 
+@dataclass(frozen=True)
+class OdometryState:
+    """
+    State of the odometry controller, see OdometryController.snapshot.
+    """
+    intialized: bool
+    previous_left_tick: int
+    previous_right_tick: int
+
+
 class OdometryController:
     """
     The odometry controller does the odometry calculation and return a position and angle.
@@ -31,6 +42,24 @@ class OdometryController:
         self.previous_right_tick = right_tick
         return pos, angle
 
+    def snapshot(self) -> OdometryState:
+        """
+        Capture the state of the controller.
+        """
+        return OdometryState(
+            intialized=self.intialized,
+            previous_left_tick=self.previous_left_tick,
+            previous_right_tick=self.previous_right_tick,
+        )
+
+    def restore(self, state: OdometryState) -> None:
+        """
+        Restore a state captured by snapshot.
+        """
+        self.intialized = state.intialized
+        self.previous_left_tick = state.previous_left_tick
+        self.previous_right_tick = state.previous_right_tick
+
     def _odometry(self, left_tick: int, right_tick: int, pos: Vector2, angle: Radian) -> \
             Tuple[Vector2, Radian]:
 
@@ -122,3 +122,19 @@ class TestOdometry:
         assert pos.x > 0  # Moved forward.
         assert pos.y < 0  # Went a bit down.
         assert angle < 0  # Turned right.
+
+    @staticmethod
+    def test_snapshot_restore(controller):
+        """
+        Restoring a snapshot goes back to the previous tick counts.
+        """
+        snapshot = controller.snapshot()
+        controller.odometry(20, 20, Vector2(0, 0), 0)
+
+        controller.restore(snapshot)
+
+        pos, _ = controller.odometry(20, 20, Vector2(0, 0), 0)
+        assert pos == Vector2(
+            2 * math.pi * WHEEL_RADIUS * 10 / TICK_PER_REVOLUTION,
+            0,
+        )
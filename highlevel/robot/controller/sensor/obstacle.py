@@ -0,0 +1,183 @@
+"""
+Obstacle controller module.
+"""
+import itertools
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy
+
+from highlevel.logger import LOGGER
+from highlevel.robot.entity.obstacle import TrackedObstacle
+from highlevel.robot.entity.type import Millimeter
+from highlevel.util.clock import Clock
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
+
+# Two consecutive points of a scan further apart than this belong to different obstacles.
+CLUSTER_GAP: Millimeter = 100
+# Clusters with fewer points are noise, clusters wider than this are not robots.
+MIN_CLUSTER_POINTS = 3
+MAX_OBSTACLE_RADIUS: Millimeter = 300
+# A cluster further than this from the predicted position of a track is another obstacle.
+TRACKING_GATE: Millimeter = 300
+# Gains of the alpha-beta filter, correcting the position and the velocity of a track.
+FILTER_ALPHA = 0.6
+FILTER_BETA = 0.2
+# A track is dropped once it has not been seen for that many scans.
+MAX_MISSED_SCANS = 3
+
+
+def cluster_points(
+        points: Vector2Array,
+        gap: Millimeter = CLUSTER_GAP) -> Tuple[Vector2Array, numpy.ndarray]:
+    """
+    Split the points of a scan, in the order of their angles, into clusters of consecutive points
+    less than `gap` apart, in linear time. The scan being circular, the last cluster is merged with
+    the first one if they touch.
+    Return the centroid and the radius (distance from the centroid to its furthest point) of each
+    cluster of at least MIN_CLUSTER_POINTS points.
+    """
+    coordinates = points.as_numpy()
+    if len(coordinates) < MIN_CLUSTER_POINTS:
+        return Vector2Array(numpy.empty((0, 2))), numpy.empty(0)
+
+    steps = numpy.diff(coordinates, axis=0)
+    squared_steps = numpy.einsum('ij,ij->i', steps, steps)
+    starts = numpy.flatnonzero(squared_steps > gap * gap) + 1
+    closing_step = coordinates[0] - coordinates[-1]
+    if len(starts) and closing_step @ closing_step <= gap * gap:
+        # Start the scan at the beginning of a cluster, so that the first cluster continues
+        # after the last point.
+        coordinates = numpy.roll(coordinates, -starts[0], axis=0)
+        starts = starts[1:] - starts[0]
+    starts = numpy.concatenate(([0], starts))
+
+    counts = numpy.diff(numpy.append(starts, len(coordinates)))
+    centroids = numpy.add.reduceat(coordinates, starts,
+                                   axis=0) / counts[:, None]
+    offsets = coordinates - numpy.repeat(centroids, counts, axis=0)
+    radii = numpy.sqrt(
+        numpy.maximum.reduceat(numpy.einsum('ij,ij->i', offsets, offsets),
+                               starts))
+
+    kept = counts >= MIN_CLUSTER_POINTS
+    return Vector2Array(centroids[kept]), radii[kept]
+
+
+@dataclass
+class Track:
+    """
+    State of the filter following an obstacle.
+    """
+    id: int  # pylint: disable=invalid-name
+    position: Vector2
+    velocity: Vector2
+    radius: Millimeter
+    missed_scans: int = 0
+
+
+class ObstacleController:
+    """
+    Find the obstacles around the robot in the LIDAR scans and follow them from one scan to the
+    next.
+
+    Each scan is split into clusters of points (see cluster_points), the clusters too large to be
+    a robot are ignored. Each track is matched with the nearest cluster to its predicted position,
+    and its position and velocity are corrected with an alpha-beta (constant velocity) filter. The
+    clusters not matched start new tracks, and the tracks not seen for MAX_MISSED_SCANS scans are
+    dropped.
+    """
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.tracks: List[Track] = []
+        self.obstacles: List[TrackedObstacle] = []
+        self.last_update_duration = 0.
+        self._last_update: Optional[float] = None
+        self._ids = itertools.count()
+
+    def update(self, points: Vector2Array) -> None:
+        """
+        Update the obstacles with the points of a new scan, in the field frame and in the order of
+        their angles.
+        """
+        start_time = time.perf_counter()
+
+        now = self.clock.time()
+        delta = 0. if self._last_update is None else now - self._last_update
+        self._last_update = now
+
+        centroids, radii = cluster_points(points)
+        robots = radii <= MAX_OBSTACLE_RADIUS
+        centroids, radii = centroids[robots], radii[robots]
+
+        for track in self.tracks:
+            track.position += track.velocity * delta
+
+        matches = dict(self._match(centroids))
+        for track_index, track in enumerate(self.tracks):
+            cluster_index = matches.get(track_index)
+            if cluster_index is None:
+                track.missed_scans += 1
+                continue
+
+            residual = centroids[cluster_index] - track.position
+            track.position += residual * FILTER_ALPHA
+            if delta > 0:
+                track.velocity += residual * (FILTER_BETA / delta)
+            track.radius = float(radii[cluster_index])
+            track.missed_scans = 0
+
+        matched_clusters = set(matches.values())
+        self.tracks = [
+            track for track in self.tracks
+            if track.missed_scans < MAX_MISSED_SCANS
+        ]
+        for cluster_index, centroid in enumerate(centroids):
+            if cluster_index not in matched_clusters:
+                self.tracks.append(
+                    Track(id=next(self._ids),
+                          position=centroid,
+                          velocity=Vector2(0, 0),
+                          radius=float(radii[cluster_index])))
+
+        self.obstacles = [
+            TrackedObstacle(id=track.id,
+                            position=track.position,
+                            velocity=track.velocity,
+                            radius=track.radius) for track in self.tracks
+        ]
+
+        self.last_update_duration = time.perf_counter() - start_time
+        LOGGER.get().debug('obstacle_controller_update',
+                           clusters=len(centroids),
+                           obstacles=len(self.obstacles),
+                           duration=self.last_update_duration)
+
+    def _match(self, centroids: Vector2Array) -> List[Tuple[int, int]]:
+        """
+        Match the tracks with the clusters, nearest pairs first. Return (track index, cluster
+        index) pairs, the pairs further apart than TRACKING_GATE are not matched.
+        """
+        if not self.tracks or len(centroids) == 0:
+            return []
+
+        predicted = numpy.array([(track.position.x, track.position.y)
+                                 for track in self.tracks])
+        distances = numpy.linalg.norm(predicted[:, None] -
+                                      centroids.as_numpy()[None],
+                                      axis=2)
+
+        matches = []
+        matched_tracks, matched_clusters = set(), set()
+        for flat_index in numpy.argsort(distances, axis=None).tolist():
+            track_index, cluster_index = divmod(flat_index, len(centroids))
+            if distances[track_index, cluster_index] > TRACKING_GATE:
+                break
+            if track_index in matched_tracks or cluster_index in matched_clusters:
+                continue
+            matches.append((track_index, cluster_index))
+            matched_tracks.add(track_index)
+            matched_clusters.add(cluster_index)
+        return matches
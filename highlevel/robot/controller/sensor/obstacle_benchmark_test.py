@@ -0,0 +1,34 @@
+"""
+Benchmarks for the obstacle controller: clustering and tracking a full RPLIDAR express scan.
+
+Run them with `make benchmark`.
+"""
+import math
+
+import numpy
+
+from highlevel.robot.controller.sensor.obstacle import ObstacleController
+from highlevel.util.clock import SimulationClock
+from highlevel.util.geometry.vector_array import Vector2Array
+
+# Number of measurements in an RPLIDAR express scan.
+SCAN_SIZE = 3500
+
+
+def test_benchmark_update(benchmark):
+    """
+    Benchmark updating the obstacles with a scan of 3500 points, spread over 10 obstacles.
+    The scan must be processed well within a LIDAR period (about 90 ms).
+    """
+    angles = numpy.linspace(0, 2 * math.pi, SCAN_SIZE // 10, endpoint=False)
+    circle = numpy.stack((numpy.cos(angles), numpy.sin(angles)), axis=1) * 100
+    points = Vector2Array(
+        numpy.concatenate([
+            circle + (300 + 250 * index, 1000 + 300 * (index % 2))
+            for index in range(10)
+        ]))
+    obstacle_controller = ObstacleController(SimulationClock())
+
+    benchmark(obstacle_controller.update, points)
+
+    assert len(obstacle_controller.obstacles) == 10
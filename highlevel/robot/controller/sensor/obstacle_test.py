@@ -0,0 +1,134 @@
+"""
+Test for obstacle controller module.
+"""
+import math
+
+import numpy
+import pytest
+from pytest import fixture
+
+from highlevel.robot.controller.sensor.obstacle import (MAX_MISSED_SCANS,
+                                                        ObstacleController,
+                                                        cluster_points)
+from highlevel.util.clock import SimulationClock
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
+
+
+def _circle(center, radius, count=10):
+    """
+    Points of a circle, counterclockwise.
+    """
+    angles = numpy.linspace(0, 2 * math.pi, count, endpoint=False)
+    return numpy.stack((center[0] + radius * numpy.cos(angles),
+                        center[1] + radius * numpy.sin(angles)),
+                       axis=1)
+
+
+@fixture(name='clock')
+def clock_setup():
+    """
+    Clock.
+    """
+    return SimulationClock()
+
+
+@fixture(name='obstacle_controller')
+def obstacle_controller_setup(clock):
+    """
+    Obstacle controller.
+    """
+    return ObstacleController(clock)
+
+
+def test_cluster_points():
+    """
+    The points are split where two consecutive points are far apart, the clusters with too few
+    points are dropped.
+    """
+    points = numpy.concatenate((
+        _circle((500, 500), 50),
+        [[1000, 1000]],
+        _circle((1500, 500), 20),
+    ))
+
+    centroids, radii = cluster_points(Vector2Array(points))
+
+    assert centroids.as_numpy() == pytest.approx(
+        numpy.array([[500, 500], [1500, 500]]))
+    assert radii == pytest.approx([50, 20])
+
+
+def test_cluster_points_wrap_around():
+    """
+    The cluster at the end of the scan continues at its beginning.
+    """
+    circle = _circle((500, 500), 50)
+    points = numpy.concatenate((circle[5:], _circle((1500, 500), 20),
+                                circle[:5]))
+
+    centroids, radii = cluster_points(Vector2Array(points))
+
+    # The scan now starts with the second cluster.
+    assert centroids.as_numpy() == pytest.approx(
+        numpy.array([[1500, 500], [500, 500]]))
+    assert radii == pytest.approx([20, 50])
+
+
+def test_cluster_points_empty():
+    """
+    An empty scan has no clusters.
+    """
+    centroids, radii = cluster_points(Vector2Array(numpy.empty((0, 2))))
+
+    assert len(centroids) == 0
+    assert len(radii) == 0
+
+
+def test_track_moving_obstacle(obstacle_controller, clock):
+    """
+    An obstacle moving at constant speed keeps its id, and its velocity is estimated.
+    """
+    for scan in range(30):
+        clock.advance(scan * 0.1)
+        obstacle_controller.update(
+            Vector2Array(_circle((500 + 20 * scan, 500), 50)))
+
+    obstacle, = obstacle_controller.obstacles
+    assert obstacle.id == 0
+    assert obstacle.position.x == pytest.approx(500 + 20 * 29, abs=1)
+    assert obstacle.velocity.x == pytest.approx(200, abs=1)
+    assert obstacle.velocity.y == pytest.approx(0, abs=1)
+    assert obstacle.radius == pytest.approx(50)
+
+
+def test_track_lost_obstacle(obstacle_controller, clock):
+    """
+    An obstacle not seen for several scans is dropped.
+    """
+    obstacle_controller.update(Vector2Array(_circle((500, 500), 50)))
+    for scan in range(1, MAX_MISSED_SCANS + 1):
+        assert len(obstacle_controller.obstacles) == 1
+        clock.advance(scan * 0.1)
+        obstacle_controller.update(Vector2Array(numpy.empty((0, 2))))
+
+    assert not obstacle_controller.obstacles
+
+
+def test_track_new_obstacles(obstacle_controller, clock):
+    """
+    An obstacle appearing far from the tracked ones starts a new track, and a large obstacle (a
+    wall) is not tracked.
+    """
+    obstacle_controller.update(Vector2Array(_circle((500, 500), 50)))
+    clock.advance(0.1)
+    obstacle_controller.update(
+        Vector2Array(
+            numpy.concatenate((
+                _circle((510, 500), 50),
+                _circle((1500, 500), 50),
+                _circle((1500, 1500), 500, count=100),
+            ))))
+
+    assert [obstacle.id for obstacle in obstacle_controller.obstacles] == [0, 1]
+    assert obstacle_controller.obstacles[1].position == Vector2(1500, 500)
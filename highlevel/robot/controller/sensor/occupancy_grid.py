@@ -0,0 +1,115 @@
+"""
+Occupancy grid controller module.
+"""
+import math
+from typing import Optional
+
+import numpy
+
+from highlevel.robot.entity.configuration import Configuration
+from highlevel.util.clock import Clock
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
+
+# Log-odds added to a cell for each scan a ray ends in it (occupied) or goes through it (free).
+LOG_ODDS_OCCUPIED = 0.9
+LOG_ODDS_FREE = -0.4
+# Bounds of the log-odds, so that a cell seen for a long time can still change quickly.
+LOG_ODDS_MIN = -4.
+LOG_ODDS_MAX = 4.
+# The log-odds decay towards 0 (unknown) with this time constant, in seconds, so that the cells a
+# moving obstacle left become unknown again if they are not seen.
+DECAY_TIME = 2.
+# Maximum number of rays traversed per scan, spread evenly over the scan, to bound the cost of
+# an update.
+MAX_TRAVERSED_RAYS = 360
+
+
+class OccupancyGridController:
+    """
+    Map of the field built from the LIDAR scans, as a grid of log-odds of occupancy.
+
+    For each scan, the cells where the rays end are marked occupied and the cells the rays go
+    through are marked free. The rays are traversed all at once by sampling them at half the
+    resolution of the grid. Querying a position reads a single cell.
+
+    The cost of an update is bounded by MAX_TRAVERSED_RAYS times the number of samples of a ray
+    across the whole field.
+    """
+    def __init__(self, configuration: Configuration, clock: Clock):
+        self.clock = clock
+        self.resolution = configuration.occupancy_grid_resolution
+        width, height = configuration.field_shape
+        self.log_odds = numpy.zeros((math.ceil(width / self.resolution),
+                                     math.ceil(height / self.resolution)))
+        self._last_update: Optional[float] = None
+        self._max_ray_length = math.hypot(width, height)
+
+    def update(self, origin: Vector2, hits: Vector2Array) -> None:
+        """
+        Update the grid with a scan, taken at `origin`, whose rays hit the points `hits` (in the
+        field frame).
+        """
+        self._decay()
+
+        ends = hits.as_numpy()
+        rays = ends[::max(1, math.ceil(len(ends) / MAX_TRAVERSED_RAYS))]
+        origin_array = numpy.array((origin.x, origin.y))
+        directions = rays - origin_array
+
+        # Sample positions along the rays (0 is the origin, 1 their end), enough for the longest
+        # ray of the scan.
+        longest = numpy.sqrt(numpy.einsum('ij,ij->i', directions,
+                                          directions).max(initial=0))
+        sample_count = math.ceil(
+            min(longest, self._max_ray_length) / (self.resolution / 2))
+        ray_samples = numpy.arange(sample_count) / max(sample_count, 1)
+        samples = origin_array + directions[:, None] * ray_samples[:, None]
+
+        # Each cell is updated at most once per scan, being hit wins over being seen through.
+        occupied = numpy.zeros(self.log_odds.size, dtype=bool)
+        occupied[self._cells(ends)] = True
+        free = numpy.zeros(self.log_odds.size, dtype=bool)
+        free[self._cells(samples.reshape((-1, 2)))] = True
+        free &= ~occupied
+
+        grid = self.log_odds.reshape(-1)
+        grid[free] += LOG_ODDS_FREE
+        grid[occupied] += LOG_ODDS_OCCUPIED
+        numpy.clip(self.log_odds, LOG_ODDS_MIN, LOG_ODDS_MAX, out=self.log_odds)
+
+    def occupancy(self, position: Vector2) -> float:
+        """
+        Probability that the cell of `position` is occupied. The positions outside of the field are
+        occupied.
+        """
+        cell_x = math.floor(position.x / self.resolution)
+        cell_y = math.floor(position.y / self.resolution)
+        size_x, size_y = self.log_odds.shape
+        if not (0 <= cell_x < size_x and 0 <= cell_y < size_y):
+            return 1.
+        return 1 / (1 + math.exp(-self.log_odds[cell_x, cell_y]))
+
+    def is_free(self, position: Vector2, threshold: float = 0.5) -> bool:
+        """
+        Check if `position` was seen free, i.e. its probability of occupancy is below `threshold`.
+        """
+        return self.occupancy(position) < threshold
+
+    def _decay(self) -> None:
+        now = self.clock.time()
+        if self._last_update is not None and now > self._last_update:
+            self.log_odds *= math.exp(-(now - self._last_update) / DECAY_TIME)
+        self._last_update = now
+
+    def _cells(self, points: numpy.ndarray) -> numpy.ndarray:
+        """
+        Flat indices of the cells of the grid containing the points, the points outside of the
+        grid are ignored.
+        """
+        cells = numpy.floor(points / self.resolution).astype(numpy.int64)
+        size_x, size_y = self.log_odds.shape
+        inside = ((cells[:, 0] >= 0) & (cells[:, 0] < size_x)
+                  & (cells[:, 1] >= 0) & (cells[:, 1] < size_y))
+        cells = cells[inside]
+        return cells[:, 0] * size_y + cells[:, 1]
@@ -0,0 +1,32 @@
+"""
+Benchmarks for the occupancy grid controller: updating the grid with a full RPLIDAR express scan.
+
+Run them with `make benchmark`.
+"""
+import math
+
+import numpy
+
+from highlevel.container import CONFIG
+from highlevel.robot.controller.sensor.occupancy_grid import OccupancyGridController
+from highlevel.util.clock import SimulationClock
+from highlevel.util.geometry.vector_array import Vector2Array
+
+# Number of measurements in an RPLIDAR express scan.
+SCAN_SIZE = 3500
+
+
+def test_benchmark_update(benchmark):
+    """
+    Benchmark updating the grid with a scan of 3500 points, the rays going as far as 2 meters.
+    """
+    occupancy_grid_controller = OccupancyGridController(
+        CONFIG, SimulationClock())
+    position = CONFIG.initial_position
+    angles = numpy.linspace(0, 2 * math.pi, SCAN_SIZE, endpoint=False)
+    hits = Vector2Array.from_polar(angles, numpy.full(SCAN_SIZE, 2000.))
+    hits = hits.translate(position)
+
+    benchmark(occupancy_grid_controller.update, position, hits)
+
+    assert occupancy_grid_controller.is_free(position)
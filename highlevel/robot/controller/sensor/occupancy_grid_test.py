@@ -0,0 +1,76 @@
+"""
+Test for occupancy grid controller module.
+"""
+import numpy
+from pytest import fixture
+
+from highlevel.robot.controller.sensor.occupancy_grid import (
+    LOG_ODDS_MAX, OccupancyGridController)
+from highlevel.util.clock import SimulationClock
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
+
+
+@fixture(name='clock')
+def clock_setup():
+    """
+    Clock.
+    """
+    return SimulationClock()
+
+
+@fixture(name='occupancy_grid_controller')
+def occupancy_grid_controller_setup(configuration_test, clock):
+    """
+    Occupancy grid controller, with cells of 20x20 over a field of 100x100.
+    """
+    return OccupancyGridController(configuration_test, clock)
+
+
+def test_update(occupancy_grid_controller):
+    """
+    The cells where the rays end are occupied, the cells they go through are free, the others are
+    unknown.
+    """
+    occupancy_grid_controller.update(Vector2(10, 10),
+                                     Vector2Array(numpy.array([[90, 10]])))
+
+    assert occupancy_grid_controller.log_odds.shape == (5, 5)
+    assert occupancy_grid_controller.occupancy(Vector2(90, 10)) > 0.5
+    for x in (10, 30, 50, 70):
+        assert occupancy_grid_controller.is_free(Vector2(x, 10))
+    assert occupancy_grid_controller.occupancy(Vector2(10, 90)) == 0.5
+
+
+def test_update_clips_log_odds(occupancy_grid_controller):
+    """
+    The log-odds stay within bounds, and the points outside of the field are ignored.
+    """
+    for _ in range(20):
+        occupancy_grid_controller.update(
+            Vector2(10, 10), Vector2Array(numpy.array([[90, 10], [150,
+                                                                  10]])))
+
+    assert occupancy_grid_controller.log_odds.max() == LOG_ODDS_MAX
+
+
+def test_outside_of_field(occupancy_grid_controller):
+    """
+    The positions outside of the field are occupied.
+    """
+    assert occupancy_grid_controller.occupancy(Vector2(-1, 50)) == 1
+    assert not occupancy_grid_controller.is_free(Vector2(50, 100))
+
+
+def test_decay(occupancy_grid_controller, clock):
+    """
+    The cells not seen anymore become unknown again.
+    """
+    occupancy_grid_controller.update(Vector2(10, 10),
+                                     Vector2Array(numpy.array([[90, 10]])))
+    clock.advance(60)
+    occupancy_grid_controller.update(Vector2(10, 10),
+                                     Vector2Array(numpy.empty((0, 2))))
+
+    assert abs(occupancy_grid_controller.occupancy(Vector2(90, 10)) -
+               0.5) < 1e-6
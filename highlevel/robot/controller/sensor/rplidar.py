@@ -1,26 +1,74 @@
 """
 Lidar controller module.
 """
-from math import cos, sin
-from typing import Tuple
+from typing import Optional, Tuple
 
-from highlevel.robot.entity.type import Millimeter, Radian
+import numpy
+
+from highlevel.robot.adapter.lidar import Readings
+from highlevel.robot.controller.motion.localization import LocalizationController
+from highlevel.robot.controller.sensor.obstacle import ObstacleController
+from highlevel.robot.controller.sensor.occupancy_grid import OccupancyGridController
+from highlevel.robot.entity.configuration import Configuration
+from highlevel.robot.entity.type import Millimeter
 from highlevel.simulation.controller.probe import SimulationProbe
 from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
+
+# The points closer than this to the sides of the field are the borders of the field, not
+# obstacles.
+FIELD_MARGIN: Millimeter = 20
 
 
 class LidarController:
-    """Lidar controller is a controller for saving positions of obstacles."""
-    def __init__(self, simulation_probe: SimulationProbe):
-        self.seen_polar: Tuple[Tuple[Radian, Millimeter], ...] = ()
-        self.seen_cartesian: Tuple[Vector2, ...] = ()
-        simulation_probe.attach("position_obstacles",
-                                lambda: self.seen_cartesian)
-
-    def set_detection(
-            self, seen_polar: Tuple[Tuple[Radian, Millimeter], ...]) -> None:
+    """
+    Lidar controller is a controller for saving positions of obstacles.
+
+    The readings of each scan are turned into points of the field frame, using the pose of the
+    robot given by the localization controller, which update the occupancy grid. The points
+    outside of the field (or on its borders) are dropped, the others are handed to the obstacle
+    controller.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, configuration: Configuration,
+                 localization_controller: LocalizationController,
+                 obstacle_controller: ObstacleController,
+                 occupancy_grid_controller: OccupancyGridController,
+                 simulation_probe: SimulationProbe):
+        self.configuration = configuration
+        self.localization_controller = localization_controller
+        self.obstacle_controller = obstacle_controller
+        self.occupancy_grid_controller = occupancy_grid_controller
+        self.seen_polar: Readings = ()
+        self.seen_cartesian = Vector2Array(numpy.empty((0, 2)))
+        # Obstacles as Vector2s, built on the first probe after each scan.
+        self._seen_vectors: Optional[Tuple[Vector2, ...]] = ()
+        simulation_probe.attach("position_obstacles", self._probe_obstacles)
+
+    def set_detection(self, seen_polar: Readings) -> None:
         """ Set the detected obstacles to the desired value in the lidar controller. """
-        self.seen_polar = seen_polar
-        self.seen_cartesian = tuple(
-            Vector2(radius * cos(angle), radius * sin(angle))
-            for radius, angle in seen_polar)
+        # (angle, distance) rows, the angles relative to the robot. The readings are copied: the
+        # LIDAR adapter reuses its buffers for the next scans.
+        readings = numpy.array(seen_polar, dtype=numpy.float64).reshape(
+            (-1, 2))
+        self.seen_polar = readings
+        position = self.localization_controller.get_position()
+        angle = self.localization_controller.get_angle()
+
+        points = Vector2Array.from_polar(readings[:, 0] + angle,
+                                         readings[:, 1]).translate(position)
+        self.occupancy_grid_controller.update(position, points)
+
+        width, height = self.configuration.field_shape
+        inside = ((points.x > FIELD_MARGIN) & (points.x < width - FIELD_MARGIN)
+                  & (points.y > FIELD_MARGIN)
+                  & (points.y < height - FIELD_MARGIN))
+        self.seen_cartesian = points[inside]
+        self._seen_vectors = None
+        self.obstacle_controller.update(self.seen_cartesian)
+
+    def _probe_obstacles(self) -> Tuple[Vector2, ...]:
+        if self._seen_vectors is None:
+            self._seen_vectors = self.seen_cartesian.to_vectors()
+        return self._seen_vectors
@@ -0,0 +1,42 @@
+"""
+Benchmarks for the lidar controller: turning a full RPLIDAR express scan into obstacles.
+
+Run them with `make benchmark`.
+"""
+import math
+from unittest.mock import MagicMock
+
+import numpy
+
+from highlevel.container import CONFIG
+from highlevel.robot.controller.motion.localization import LocalizationController
+from highlevel.robot.controller.sensor.obstacle import ObstacleController
+from highlevel.robot.controller.sensor.occupancy_grid import OccupancyGridController
+from highlevel.robot.controller.sensor.rplidar import LidarController
+from highlevel.simulation.controller.probe import SimulationProbe
+
+# Number of measurements in an RPLIDAR express scan.
+SCAN_SIZE = 3500
+
+
+def test_benchmark_set_detection(benchmark):
+    """
+    Benchmark turning a full scan into obstacles of the field frame.
+    """
+    localization_controller = MagicMock(spec=LocalizationController)
+    localization_controller.get_position.return_value = CONFIG.initial_position
+    localization_controller.get_angle.return_value = math.pi / 6
+    lidar_controller = LidarController(CONFIG, localization_controller,
+                                       MagicMock(spec=ObstacleController),
+                                       MagicMock(spec=OccupancyGridController),
+                                       SimulationProbe())
+
+    # Every other reading hits an obstacle inside the field, the others hit the borders.
+    readings = numpy.empty((SCAN_SIZE, 2))
+    readings[:, 0] = numpy.linspace(0, 2 * math.pi, SCAN_SIZE, endpoint=False)
+    readings[:, 1] = numpy.where(numpy.arange(SCAN_SIZE) % 2, 100, 5000)
+    readings.flags.writeable = False
+
+    benchmark(lidar_controller.set_detection, readings)
+
+    assert len(lidar_controller.seen_cartesian) == SCAN_SIZE // 2
@@ -0,0 +1,138 @@
+"""
+Test for lidar controller module.
+"""
+import math
+from unittest.mock import MagicMock
+
+import numpy
+from pytest import fixture
+
+from highlevel.robot.controller.motion.localization import LocalizationController
+from highlevel.robot.controller.sensor.obstacle import ObstacleController
+from highlevel.robot.controller.sensor.occupancy_grid import OccupancyGridController
+from highlevel.robot.controller.sensor.rplidar import LidarController
+from highlevel.simulation.controller.probe import SimulationProbe
+from highlevel.util.geometry.vector import Vector2
+
+
+@fixture(name='localization_controller')
+def localization_controller_setup():
+    """
+    Localization controller of a robot at (50, 50), facing up.
+    """
+    mock = MagicMock(spec=LocalizationController)
+    mock.get_position.return_value = Vector2(50, 50)
+    mock.get_angle.return_value = math.pi / 2
+    return mock
+
+
+@fixture(name='obstacle_controller')
+def obstacle_controller_setup():
+    """
+    Obstacle controller mock.
+    """
+    return MagicMock(spec=ObstacleController)
+
+
+@fixture(name='occupancy_grid_controller')
+def occupancy_grid_controller_setup():
+    """
+    Occupancy grid controller mock.
+    """
+    return MagicMock(spec=OccupancyGridController)
+
+
+@fixture(name='lidar_controller')
+def lidar_controller_setup(configuration_test, localization_controller,
+                           obstacle_controller, occupancy_grid_controller):
+    """
+    Lidar controller.
+    """
+    return LidarController(configuration=configuration_test,
+                           localization_controller=localization_controller,
+                           obstacle_controller=obstacle_controller,
+                           occupancy_grid_controller=occupancy_grid_controller,
+                           simulation_probe=SimulationProbe())
+
+
+def test_set_detection_field_frame(lidar_controller):
+    """
+    The readings are (angle, distance) pairs relative to the robot, turned into points of the
+    field frame.
+    """
+    lidar_controller.set_detection(((0, 10), (math.pi / 2, 20)))
+
+    assert lidar_controller.seen_cartesian.to_vectors() == (
+        Vector2(50, 60),
+        Vector2(30, 50),
+    )
+
+
+def test_set_detection_array(lidar_controller):
+    """
+    The readings can be sent as an (N, 2) array.
+    """
+    lidar_controller.set_detection(numpy.array([[0, 10], [math.pi, 10]]))
+
+    assert lidar_controller.seen_cartesian.to_vectors() == (
+        Vector2(50, 60),
+        Vector2(50, 40),
+    )
+
+
+def test_set_detection_copies_readings(lidar_controller):
+    """
+    The controller keeps its own copy of the readings, the adapter reuses its buffers.
+    """
+    readings = numpy.array([[0, 10], [math.pi, 10]])
+    lidar_controller.set_detection(readings)
+    readings[:] = 0
+
+    assert lidar_controller.seen_polar.tolist() == [[0, 10], [math.pi, 10]]
+
+
+def test_set_detection_drops_field_borders(lidar_controller,
+                                           obstacle_controller,
+                                           occupancy_grid_controller):
+    """
+    The points outside of the field or on its borders are not obstacles, the others are handed to
+    the obstacle controller. The occupancy grid gets every point.
+    """
+    lidar_controller.set_detection(((0, 10), (0, 50), (0, 100)))
+
+    origin, hits = occupancy_grid_controller.update.call_args[0]
+    assert origin == Vector2(50, 50)
+    assert len(hits) == 3
+
+    assert lidar_controller.seen_cartesian.to_vectors() == (Vector2(50,
+                                                                    60), )
+    obstacle_controller.update.assert_called_once_with(
+        lidar_controller.seen_cartesian)
+
+
+def test_set_detection_empty(lidar_controller):
+    """
+    An empty scan clears the obstacles.
+    """
+    lidar_controller.set_detection(((0, 10), ))
+    lidar_controller.set_detection(())
+
+    assert len(lidar_controller.seen_cartesian) == 0
+
+
+def test_probe_obstacles(configuration_test, localization_controller,
+                         obstacle_controller, occupancy_grid_controller):
+    """
+    The probe returns the obstacles as Vector2s.
+    """
+    simulation_probe = SimulationProbe()
+    lidar_controller = LidarController(configuration_test,
+                                       localization_controller,
+                                       obstacle_controller,
+                                       occupancy_grid_controller,
+                                       simulation_probe)
+
+    assert simulation_probe.probe()['position_obstacles'] == ()
+    lidar_controller.set_detection(((0, 10), ))
+    assert simulation_probe.probe()['position_obstacles'] == (Vector2(50,
+                                                                      60), )
@@ -8,6 +8,7 @@ from highlevel.robot.entity.color import Color
 from highlevel.robot.entity.configuration import Configuration
 from highlevel.robot.entity.type import Radian
 from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
 
 
 class SymmetryController:
@@ -26,6 +27,14 @@ class SymmetryController:
             return symmetric_position
         return position
 
+    def symmetries_positions(self, positions: Vector2Array) -> Vector2Array:
+        """
+        Symmetries an array of positions if necessary
+        """
+        if self.configuration.color == Color.YELLOW:
+            return positions.x_symmetry()
+        return positions
+
     def symmetries_rotate(self, angle: Radian) -> Radian:
         """
         Symmetries an absolute angle if necessary
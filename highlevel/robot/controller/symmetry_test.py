@@ -7,6 +7,7 @@ from highlevel.robot.controller.symmetry import SymmetryController
 from highlevel.robot.entity.color import Color
 from highlevel.robot.entity.configuration import Configuration
 from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
 
 
 def get_symmetry_controller(color: Color) -> SymmetryController:
@@ -51,6 +52,28 @@ def test_vector_sym2():
     assert sym_vec.y == 124
 
 
+def test_vector_array_sym1():
+    """
+    Test vector array symmetry
+    """
+    vecs = Vector2Array.from_vectors([Vector2(-148, 29), Vector2(12, -3)])
+    symmetry_controller = get_symmetry_controller(color=Color.YELLOW)
+    sym_vecs = symmetry_controller.symmetries_positions(vecs)
+
+    assert sym_vecs.to_vectors() == (Vector2(148, 29), Vector2(-12, -3))
+
+
+def test_vector_array_sym2():
+    """
+    Test vector array symmetry
+    """
+    vecs = Vector2Array.from_vectors([Vector2(-148, 29), Vector2(12, -3)])
+    symmetry_controller = get_symmetry_controller(color=Color.BLUE)
+    sym_vecs = symmetry_controller.symmetries_positions(vecs)
+
+    assert sym_vecs == vecs
+
+
 def test_angle_sym1():
     """
     Test angle symmetry
@@ -41,3 +41,6 @@ class Configuration:
     distance_between_wheels: Millimeter
 
     debug: DebugConfiguration = field(default_factory=DebugConfiguration)
+
+    # Size of the cells of the occupancy grid built from the LIDAR scans.
+    occupancy_grid_resolution: Millimeter = 20
@@ -0,0 +1,18 @@
+"""
+Obstacle entity.
+"""
+from dataclasses import dataclass
+
+from highlevel.robot.entity.type import Millimeter
+from highlevel.util.geometry.vector import Vector2
+
+
+@dataclass(frozen=True)
+class TrackedObstacle:
+    """
+    An obstacle seen by the LIDAR, followed from one scan to the next.
+    """
+    id: int  # Same for every scan the obstacle is seen in. pylint: disable=invalid-name
+    position: Vector2
+    velocity: Vector2  # In millimeters per second.
+    radius: Millimeter
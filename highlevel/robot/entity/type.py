@@ -9,6 +9,8 @@ MillimeterPerSec = float
 Radian = float
 RadianPerSec = float
 Hz = float
+TickPerSec = float  # Encoder ticks per second.
+TickPerSecSq = float  # Encoder ticks per second squared.
 
 
 class Wheel(Enum):
@@ -1,20 +1,36 @@
 """
 HTTP client module.
 """
+import gzip
 import io
 
 import requests
 
+TIMEOUT = 30  # Seconds.
+
 
 class HTTPClient:
     """
     HTTP client.
     """
-    def post_file(self, url: str, data: str) -> dict:  # pylint: disable=no-self-use
+    def post_file(self, url: str, data: str, compress: bool = False) -> dict:  # pylint: disable=no-self-use
         """
         Make a HTTP Post request to an URL and send a file.
+        If `compress` is set, the body of the request is gzip encoded.
+        Raise a requests.RequestException if the request fails.
         """
         file = io.StringIO(data)
         files = {'my_file': file}
-        resp = requests.post(url, files=files)
+        request = requests.Request('POST', url, files=files).prepare()
+        if compress:
+            if not isinstance(request.body, bytes):
+                raise TypeError(
+                    f"cannot compress a body of type {type(request.body)}")
+            request.body = gzip.compress(request.body)
+            request.headers['Content-Encoding'] = 'gzip'
+            request.headers['Content-Length'] = str(len(request.body))
+
+        with requests.Session() as session:
+            resp = session.send(request, timeout=TIMEOUT)
+        resp.raise_for_status()
         return resp.json()
@@ -0,0 +1,144 @@
+"""
+Collision detector module.
+"""
+import math
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from highlevel.robot.entity.configuration import Configuration
+from highlevel.robot.entity.type import Millimeter, Radian
+from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
+from highlevel.simulation.entity.robot_id import Collision, RobotID
+from highlevel.simulation.entity.simulation_state import RobotState, RobotStateArray
+from highlevel.util.geometry.broad_phase import Box, sweep_and_prune
+from highlevel.util.geometry.direction import forward, left
+from highlevel.util.geometry.intersection import segment_segment_intersection
+from highlevel.util.geometry.segment import Segment
+from highlevel.util.geometry.segment_grid import SegmentGrid
+from highlevel.util.geometry.vector import Vector2
+
+OBSTACLE_CELL_SIZE: Millimeter = 200
+
+# Pose of a robot: (x, y, angle).
+Pose = Tuple[Millimeter, Millimeter, Radian]
+
+
+class CollisionDetector:
+    """
+    Find the robots of the simulation that touch another robot or an obstacle. The footprint of a
+    robot is the rectangle of its length and width, centered on its position.
+
+    Only the robots whose bounding boxes overlap are tested against each other (sweep and prune),
+    and the robots are only tested against the obstacles whose bounding box overlaps theirs (found
+    with a segment grid), so the cost of a tick does not grow with the square of the number of
+    robots or with the number of obstacles.
+    """
+    def __init__(self, configuration: Configuration,
+                 simulation_configuration: SimulationConfiguration):
+        self.configuration = configuration
+        self._obstacles = SegmentGrid(OBSTACLE_CELL_SIZE,
+                                      simulation_configuration.obstacles)
+
+        # Bounding box of each robot and whether it touches an obstacle, for its last pose: the
+        # robots stand still most of the time.
+        self._cache: Dict[RobotID, Tuple[Pose, Box, bool]] = {}
+
+    def footprint(self, robot: RobotState) -> List[Segment]:
+        """
+        Sides of the footprint of a robot, counterclockwise.
+        """
+        front = forward(robot.angle) * (self.configuration.robot_length / 2)
+        side = left(robot.angle) * (self.configuration.robot_width / 2)
+        corners = [
+            robot.position + front + side,
+            robot.position - front + side,
+            robot.position - front - side,
+            robot.position + front - side,
+        ]
+        return [
+            Segment(start=corners[index - 1], end=corners[index])
+            for index in range(len(corners))
+        ]
+
+    def detect(self, robots: RobotStateArray) -> FrozenSet[Collision]:
+        """
+        Return the contacts between the robots, and between the robots and the obstacles.
+        """
+        collisions: Set[Collision] = set()
+        boxes = []
+        for robot_id, (x, y, angle) in zip(robots, robots.poses.tolist()):
+            box, touches_obstacle = self._update(robots, robot_id,
+                                                 (x, y, angle))
+            boxes.append(box)
+            if touches_obstacle:
+                collisions.add(Collision(robot=robot_id))
+
+        robot_ids = list(robots)
+        for first, second in sweep_and_prune(boxes):
+            if _footprints_overlap(self.footprint(robots[robot_ids[first]]),
+                                   self.footprint(robots[robot_ids[second]])):
+                collisions.add(
+                    Collision(robot=robot_ids[first], other=robot_ids[second]))
+
+        return frozenset(collisions)
+
+    def bounding_box(self, robot: RobotState) -> Box:
+        """
+        Axis-aligned bounding box of the footprint of a robot.
+        """
+        return self._bounding_box(
+            (robot.position.x, robot.position.y, robot.angle))
+
+    def _bounding_box(self, pose: Pose) -> Box:
+        x, y, angle = pose
+        cos, sin = abs(math.cos(angle)), abs(math.sin(angle))
+        length = self.configuration.robot_length
+        width = self.configuration.robot_width
+        half_x = (cos * length + sin * width) / 2
+        half_y = (sin * length + cos * width) / 2
+        return (x - half_x, y - half_y, x + half_x, y + half_y)
+
+    def _update(self, robots: RobotStateArray, robot_id: RobotID,
+                pose: Pose) -> Tuple[Box, bool]:
+        """
+        Return the bounding box of a robot and whether it touches an obstacle.
+        """
+        cached = self._cache.get(robot_id)
+        if cached is not None and cached[0] == pose:
+            return cached[1], cached[2]
+
+        box = self._bounding_box(pose)
+        obstacles = self._obstacles.query_box(*box)
+        touches_obstacle = False
+        if obstacles:
+            footprint = self.footprint(robots[robot_id])
+            touches_obstacle = any(
+                segment_segment_intersection(side, obstacle) is not None
+                for obstacle in obstacles for side in footprint)
+        self._cache[robot_id] = (pose, box, touches_obstacle)
+        return box, touches_obstacle
+
+
+def _footprints_overlap(footprint1: List[Segment],
+                        footprint2: List[Segment]) -> bool:
+    """
+    Check if two footprints overlap: either their sides cross or one is inside the other.
+    """
+    for side1 in footprint1:
+        for side2 in footprint2:
+            if segment_segment_intersection(side1, side2) is not None:
+                return True
+
+    return _contains(footprint1, footprint2[0].start) or _contains(
+        footprint2, footprint1[0].start)
+
+
+def _contains(footprint: List[Segment], point: Vector2) -> bool:
+    """
+    Check if a point is inside a footprint: it is on the left of every side.
+    """
+    for side in footprint:
+        direction = side.end - side.start
+        offset = point - side.start
+        if direction.x * offset.y - direction.y * offset.x < 0:
+            return False
+    return True
@@ -0,0 +1,115 @@
+"""
+Test for collision detector module.
+"""
+import math
+
+import pytest
+from pytest import fixture
+
+from highlevel.simulation.controller.collision import CollisionDetector
+from highlevel.simulation.entity.robot_id import Collision, RobotID
+from highlevel.simulation.entity.simulation_state import RobotState, RobotStateArray
+from highlevel.util.geometry.vector import Vector2
+
+
+@fixture(name='collision_detector')
+def collision_detector_setup(configuration_test,
+                             simulation_configuration_test):
+    """
+    Collision detector for 10x10 robots in a 100x100 box.
+    """
+    return CollisionDetector(configuration_test, simulation_configuration_test)
+
+
+def test_footprint(collision_detector):
+    """
+    The footprint is the rectangle of the robot, turned by its angle.
+    """
+    robot = RobotState(position=Vector2(50, 50), angle=math.pi / 4)
+    footprint = collision_detector.footprint(robot)
+
+    half_diagonal = math.hypot(5, 5)
+    corners = {(round(side.start.x, 6), round(side.start.y, 6))
+               for side in footprint}
+    assert corners == {
+        (round(50 + half_diagonal, 6), 50),
+        (50, round(50 + half_diagonal, 6)),
+        (round(50 - half_diagonal, 6), 50),
+        (50, round(50 - half_diagonal, 6)),
+    }
+    assert collision_detector.bounding_box(robot) == pytest.approx(
+        (50 - half_diagonal, 50 - half_diagonal, 50 + half_diagonal,
+         50 + half_diagonal))
+
+
+def test_no_collision(collision_detector):
+    """
+    Robots far from each other and from the walls do not collide.
+    """
+    assert not collision_detector.detect(
+        RobotStateArray({
+            RobotID.RobotA: RobotState(position=Vector2(20, 20)),
+            RobotID.RobotB: RobotState(position=Vector2(40, 20)),
+        }))
+
+
+def test_collision_with_obstacle(collision_detector):
+    """
+    A robot crossing a wall collides with it.
+    """
+    robots = RobotStateArray({
+        RobotID.RobotA:
+        RobotState(position=Vector2(20, 20)),
+        RobotID.RobotB:
+        RobotState(position=Vector2(97, 50)),
+    })
+
+    assert collision_detector.detect(robots) == {
+        Collision(robot=RobotID.RobotB)
+    }
+
+    # The robot moves away from the wall.
+    robots[RobotID.RobotB].position = Vector2(90, 50)
+    assert not collision_detector.detect(robots)
+
+
+def test_collision_between_robots(collision_detector):
+    """
+    Robots whose footprints cross collide, the bounding boxes overlapping is not enough.
+    """
+    robots = RobotStateArray({
+        RobotID.RobotA:
+        RobotState(position=Vector2(30, 30), angle=math.pi / 4),
+        RobotID.RobotB:
+        RobotState(position=Vector2(39, 39)),
+        RobotID.RobotC:
+        RobotState(position=Vector2(50, 80)),
+        RobotID.RobotD:
+        RobotState(position=Vector2(58, 80)),
+    })
+
+    assert collision_detector.detect(robots) == {
+        Collision(robot=RobotID.RobotC, other=RobotID.RobotD)
+    }
+
+    robots[RobotID.RobotB].position = Vector2(36, 36)
+    assert collision_detector.detect(robots) == {
+        Collision(robot=RobotID.RobotA, other=RobotID.RobotB),
+        Collision(robot=RobotID.RobotC, other=RobotID.RobotD),
+    }
+
+
+def test_robot_inside_another(collision_detector):
+    """
+    A robot inside another one collides with it, even if their sides do not cross.
+    """
+    robots = RobotStateArray({
+        RobotID.RobotA:
+        RobotState(position=Vector2(50, 50)),
+        RobotID.RobotB:
+        RobotState(position=Vector2(50, 50)),
+    })
+
+    assert collision_detector.detect(robots) == {
+        Collision(robot=RobotID.RobotA, other=RobotID.RobotB)
+    }
@@ -1,19 +1,42 @@
 """
 Event queue module.
 """
-import heapq
-from typing import List, Iterable
+from dataclasses import dataclass
+from typing import Dict, List, Iterable, Tuple
 
-from highlevel.simulation.entity.event import Event, EventOrder
+from highlevel.simulation.entity.event import EventOrder
+
+
+@dataclass(frozen=True)
+class EventQueueSnapshot:
+    """
+    Events pending in an event queue at a given tick.
+    """
+    tick: int
+    buckets: Dict[int, Tuple[EventOrder, ...]]
 
 
 class EventQueue:
     """
     Event queue.
+    Calendar queue: the events are stored in one bucket per tick, so pushing an event is O(1) and
+    popping the k events of a tick is O(k), whatever the number of events queued for later ticks.
+    Events of the same tick are popped in the order they were pushed.
     """
     def __init__(self) -> None:
-        self._queue: List[Event] = []
+        self._buckets: Dict[int, List[EventOrder]] = {}
         self._tick = 0
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def tick(self) -> int:
+        """
+        Tick of the next events to be popped.
+        """
+        return self._tick
 
     def push(self, event_order: EventOrder, tick_offset: int) -> None:
         """
@@ -21,20 +44,45 @@ class EventQueue:
         If tick_offset is set to 0, the event will be processed at the next tick.
         If tick_offset is set to 3, the event will be processed after 3 ticks.
         """
-        event = Event(
-            tick=self._tick + tick_offset,
-            event=event_order,
-        )
-        heapq.heappush(self._queue, event)
+        # Events in the past are processed at the next tick.
+        tick = self._tick + max(tick_offset, 0)
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            self._buckets[tick] = [event_order]
+        else:
+            bucket.append(event_order)
+        self._length += 1
 
     def pop(self) -> Iterable[EventOrder]:
         """
         Pop all the events to be processed now.
         """
-        result = []
-        while self._queue and self._queue[0].tick <= self._tick:
-            result.append(heapq.heappop(self._queue).event)
+        result = self._buckets.pop(self._tick, [])
+        self._length -= len(result)
 
         self._tick += 1
 
         return result
+
+    def snapshot(self) -> EventQueueSnapshot:
+        """
+        Capture the pending events.
+        """
+        return EventQueueSnapshot(
+            tick=self._tick,
+            buckets={
+                tick: tuple(bucket)
+                for tick, bucket in self._buckets.items()
+            },
+        )
+
+    def restore(self, snapshot: EventQueueSnapshot) -> None:
+        """
+        Replace the pending events by the ones of a snapshot.
+        """
+        self._tick = snapshot.tick
+        self._buckets = {
+            tick: list(bucket)
+            for tick, bucket in snapshot.buckets.items()
+        }
+        self._length = sum(map(len, self._buckets.values()))
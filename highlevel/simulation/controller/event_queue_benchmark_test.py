@@ -0,0 +1,101 @@
+"""
+Benchmarks for the event queue: queuing and processing many events, compared to a binary heap.
+
+Run them with `make benchmark`.
+"""
+import heapq
+import itertools
+import random
+from typing import Iterable, List, Tuple
+
+from pytest import mark, skip
+
+from highlevel.simulation.controller.event_queue import EventQueue
+from highlevel.simulation.entity.event import EventOrder, EventType
+
+
+class HeapEventQueue:
+    """
+    Event queue backed by a binary heap, for reference: O(log n) push and pop.
+    """
+    def __init__(self) -> None:
+        # (tick, insertion order, event), the insertion order breaks the ties between the events
+        # of a tick.
+        self._queue: List[Tuple[int, int, EventOrder]] = []
+        self._counter = itertools.count()
+        self._tick = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def push(self, event_order: EventOrder, tick_offset: int) -> None:
+        """
+        Push a new event to be processed in a specified number of ticks.
+        """
+        heapq.heappush(
+            self._queue,
+            (self._tick + tick_offset, next(self._counter), event_order))
+
+    def pop(self) -> Iterable[EventOrder]:
+        """
+        Pop all the events to be processed now.
+        """
+        result = []
+        while self._queue and self._queue[0][0] <= self._tick:
+            result.append(heapq.heappop(self._queue)[2])
+        self._tick += 1
+        return result
+
+
+def _fill_and_drain(event_queue, offsets):
+    """
+    Queue one event per offset, then process every tick until the queue is empty.
+    """
+    event = EventOrder(type=EventType.MOVE_WHEEL)
+    for offset in offsets:
+        event_queue.push(event, offset)
+
+    count = 0
+    while event_queue:
+        count += len(list(event_queue.pop()))
+    return count
+
+
+def _skip_if_too_slow(benchmark, event_count):
+    """
+    The largest benchmarks take seconds, only run them when actually benchmarking.
+    """
+    if benchmark.disabled and event_count > 100_000:
+        skip("only run with make benchmark")
+
+
+def _offsets(count: int) -> List[int]:
+    """
+    Events spread over ticks, about 10 events per tick (i.e. many movements in flight).
+    """
+    rng = random.Random(0)
+    return [rng.randrange(count // 10) for _ in range(count)]
+
+
+@mark.parametrize('event_count', [10_000, 100_000, 1_000_000])
+def test_benchmark_heap_event_queue(benchmark, event_count):
+    """
+    Benchmark the binary heap.
+    """
+    _skip_if_too_slow(benchmark, event_count)
+    offsets = _offsets(event_count)
+    result = benchmark.pedantic(
+        lambda: _fill_and_drain(HeapEventQueue(), offsets), rounds=3)
+    assert result == event_count
+
+
+@mark.parametrize('event_count', [10_000, 100_000, 1_000_000])
+def test_benchmark_event_queue(benchmark, event_count):
+    """
+    Benchmark the calendar queue.
+    """
+    _skip_if_too_slow(benchmark, event_count)
+    offsets = _offsets(event_count)
+    result = benchmark.pedantic(lambda: _fill_and_drain(EventQueue(), offsets),
+                                rounds=3)
+    assert result == event_count
@@ -30,3 +30,87 @@ def test_queue_happy_path():
     assert set(event_queue.pop()) == {event2, event3}
     assert set(event_queue.pop()) == set()
     assert set(event_queue.pop()) == {event1}
+
+
+def test_queue_len():
+    """
+    The length of the queue is the number of events left to process.
+    """
+    event_queue = EventQueue()
+    assert not event_queue
+
+    event_queue.push(EventOrder(type=EventType.MOVEMENT_DONE), 1)
+    assert len(event_queue) == 1
+
+    event_queue.pop()
+    assert len(event_queue) == 1
+
+    event_queue.pop()
+    assert not event_queue
+
+
+def test_queue_keeps_push_order():
+    """
+    The events of a tick are popped in the order they were pushed.
+    """
+    event_queue = EventQueue()
+    events = [
+        EventOrder(type=EventType.MOVE_WHEEL, payload=index)
+        for index in range(10)
+    ]
+    for event in events:
+        event_queue.push(event, 1)
+
+    assert not list(event_queue.pop())
+    assert list(event_queue.pop()) == events
+
+
+def test_queue_negative_offset():
+    """
+    Events pushed in the past are processed at the next tick.
+    """
+    event_queue = EventQueue()
+    event_queue.pop()
+    event_queue.pop()
+
+    event = EventOrder(type=EventType.MOVEMENT_DONE)
+    event_queue.push(event, -2)
+
+    assert list(event_queue.pop()) == [event]
+    assert not event_queue
+
+
+def test_queue_many_ticks():
+    """
+    Every event is popped on its tick, whatever the order they were pushed in.
+    """
+    event_queue = EventQueue()
+    offsets = [(index * 7919) % 1000 for index in range(1000)]
+    for offset in offsets:
+        event_queue.push(EventOrder(type=EventType.MOVE_WHEEL, payload=offset),
+                         offset)
+
+    for tick in range(1000):
+        assert [event.payload for event in event_queue.pop()] == [tick]
+    assert not event_queue
+
+
+def test_queue_snapshot_restore():
+    """
+    Restoring a snapshot brings back the events pending when it was taken.
+    """
+    event_queue = EventQueue()
+    event1 = EventOrder(type=EventType.MOVE_WHEEL, payload=1)
+    event2 = EventOrder(type=EventType.MOVEMENT_DONE)
+    event_queue.push(event1, 0)
+    event_queue.push(event2, 1)
+    snapshot = event_queue.snapshot()
+
+    for _ in range(2):
+        assert list(event_queue.pop()) == [event1]
+        event_queue.push(event1, 0)
+        assert list(event_queue.pop()) == [event2, event1]
+        assert not event_queue
+
+        event_queue.restore(snapshot)
+        assert len(event_queue) == 2
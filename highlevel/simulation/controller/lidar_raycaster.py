@@ -0,0 +1,80 @@
+"""
+LIDAR raycaster module.
+"""
+import math
+import time
+from typing import Sequence, Tuple
+
+import numpy
+
+from highlevel.logger import LOGGER
+from highlevel.robot.entity.type import Radian, Millimeter
+from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
+from highlevel.util.geometry.intersection import rays_segments_intersection, segments_to_arrays
+from highlevel.util.geometry.segment import Segment
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
+
+
+class LidarRaycaster:
+    """
+    Simulate the readings of the LIDAR: cast one ray per angular step from the robot's position
+    against the obstacles of the simulation.
+    """
+    def __init__(self, simulation_configuration: SimulationConfiguration):
+        self.simulation_configuration = simulation_configuration
+
+        # The obstacles and the directions of the rays in the robot frame never change, convert
+        # them once and for all.
+        self._starts, self._ends = segments_to_arrays(
+            simulation_configuration.obstacles)
+        ray_count = simulation_configuration.lidar_ray_count
+        self._angles = numpy.linspace(0,
+                                      2 * math.pi,
+                                      ray_count,
+                                      endpoint=False)
+        self._directions = Vector2Array.from_polar(self._angles,
+                                                   numpy.ones(ray_count))
+
+        # Duration of the last scan, in seconds.
+        self.last_scan_duration = 0.
+
+    def scan(
+        self,
+        position: Vector2,
+        angle: Radian,
+        moving_obstacles: Sequence[Segment] = ()
+    ) -> Tuple[Tuple[Radian, Millimeter], ...]:
+        """
+        Return the readings of the LIDAR located at `position` and facing `angle`, as (angle,
+        distance) tuples, angle being relative to the robot. Rays that do not hit any obstacle are
+        not part of the readings.
+        The moving obstacles (i.e. the other robots) are hit as well as the obstacles of the
+        simulation configuration.
+        """
+        start_time = time.perf_counter()
+
+        starts, ends = self._starts, self._ends
+        if moving_obstacles:
+            moving_starts, moving_ends = segments_to_arrays(moving_obstacles)
+            starts = Vector2Array(
+                numpy.concatenate(
+                    (starts.as_numpy(), moving_starts.as_numpy())))
+            ends = Vector2Array(
+                numpy.concatenate((ends.as_numpy(), moving_ends.as_numpy())))
+
+        origins = Vector2Array(
+            numpy.broadcast_to((position.x, position.y),
+                               self._directions.as_numpy().shape))
+        distances, _ = rays_segments_intersection(
+            origins, self._directions.rotate(angle), starts, ends)
+
+        hit = numpy.isfinite(distances)
+        readings = tuple(
+            zip(self._angles[hit].tolist(), distances[hit].tolist()))
+
+        self.last_scan_duration = time.perf_counter() - start_time
+        LOGGER.get().debug('lidar_raycaster_scan',
+                           rays=len(distances),
+                           duration=self.last_scan_duration)
+        return readings
@@ -0,0 +1,28 @@
+"""
+Benchmarks for the LIDAR raycaster: one simulated scan on the 2020 field.
+
+The LIDAR sends 11 scans per second, a scan must take a small fraction of 1/11 seconds for the
+simulation to run faster than real time.
+
+Run them with `make benchmark`.
+"""
+import pytest
+
+from highlevel.container import SIMULATION_CONFIG
+from highlevel.simulation.controller.lidar_raycaster import LidarRaycaster
+from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
+from highlevel.util.geometry.vector import Vector2
+
+
+# Express mode of the RPLIDAR gives ~3500 measurements per scan.
+@pytest.mark.parametrize('ray_count', [360, 3500])
+def test_benchmark_scan(benchmark, ray_count):
+    """
+    Benchmark a scan against the walls of the field.
+    """
+    raycaster = LidarRaycaster(
+        SimulationConfiguration(obstacles=SIMULATION_CONFIG.obstacles,
+                                lidar_ray_count=ray_count))
+
+    readings = benchmark(raycaster.scan, Vector2(200, 1200), 0.5)
+    assert len(readings) == ray_count
@@ -0,0 +1,67 @@
+"""
+Test for LIDAR raycaster module.
+"""
+import math
+
+from highlevel.simulation.controller.lidar_raycaster import LidarRaycaster
+from highlevel.util.geometry.segment import Segment
+from highlevel.util.geometry.vector import Vector2
+
+
+def test_scan_happy_path(simulation_configuration_test):
+    """
+    Happy path: the robot is in a 100x100 box.
+    """
+    raycaster = LidarRaycaster(simulation_configuration_test)
+
+    readings = raycaster.scan(Vector2(30, 40), 0)
+
+    assert len(readings) == 360
+    angles = [angle for angle, _ in readings]
+    assert angles[90] == math.pi / 2
+    distances = [distance for _, distance in readings]
+    assert distances[0] == 70
+    assert distances[90] == 60
+    assert distances[180] == 30
+    assert distances[270] == 40
+    assert raycaster.last_scan_duration > 0
+
+
+def test_scan_angles_are_relative_to_the_robot(simulation_configuration_test):
+    """
+    The angles of the readings are relative to the robot's heading.
+    """
+    raycaster = LidarRaycaster(simulation_configuration_test)
+
+    readings = raycaster.scan(Vector2(30, 40), math.pi / 2)
+
+    assert readings[0][0] == 0
+    assert math.isclose(readings[0][1], 60)
+    assert math.isclose(readings[90][1], 30)
+
+
+def test_scan_no_obstacle_in_sight(simulation_configuration_test):
+    """
+    Rays that do not hit anything are not part of the readings.
+    """
+    raycaster = LidarRaycaster(simulation_configuration_test)
+
+    readings = raycaster.scan(Vector2(-30, 50), 0)
+
+    assert readings
+    assert all(-math.pi / 2 < angle < math.pi / 2 or angle > 3 * math.pi / 2
+               for angle, _ in readings)
+
+
+def test_scan_moving_obstacles(simulation_configuration_test):
+    """
+    The moving obstacles are hit as well as the obstacles of the configuration.
+    """
+    raycaster = LidarRaycaster(simulation_configuration_test)
+
+    readings = raycaster.scan(Vector2(
+        30, 40), 0, [Segment(start=Vector2(50, 0), end=Vector2(50, 100))])
+
+    distances = [distance for _, distance in readings]
+    assert distances[0] == 20
+    assert distances[180] == 30
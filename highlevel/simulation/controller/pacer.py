@@ -0,0 +1,114 @@
+"""
+Tick pacer module.
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from highlevel.util.clock import Clock, RealClock
+
+
+@dataclass
+class PacingMetrics:
+    """
+    How closely a simulation run followed its speed factor. The durations are in seconds of wall
+    clock time.
+    """
+    ticks: int = 0
+    # Simulated time over wall clock time, equal to the speed factor if the simulation kept up.
+    real_time_factor: float = 0
+    # Distance between the deadline of a tick and the moment it actually started.
+    mean_jitter: float = 0
+    max_jitter: float = 0
+    late_ticks: int = 0  # Ticks that started after their deadline.
+    skipped_frames: int = 0  # Notification frames skipped to catch up.
+    resyncs: int = 0  # Times the simulation was too late to catch up and dropped its backlog.
+
+
+class TickPacer:  # pylint: disable=too-many-instance-attributes
+    """
+    Schedule the ticks of the simulation on absolute deadlines of a monotonic clock: tick n starts
+    n / tickrate / speed_factor seconds after the first one. The time spent simulating a tick is
+    taken out of the wait before the next one, so the simulation does not drift from the wall
+    clock.
+
+    A late simulation runs its ticks back to back until it is on schedule again, and skips the
+    notification frames meanwhile (see is_late). Past `max_lag` seconds of delay, it stops trying
+    to catch up and starts a new schedule from the current time.
+
+    With an infinite speed factor the ticks have no deadline, the pacer only measures the achieved
+    real time factor.
+    """
+    def __init__(self,
+                 tickrate: int,
+                 speed_factor: float,
+                 max_lag: float,
+                 clock: Optional[Clock] = None):
+        self.tickrate = tickrate
+        self.period = 0 if math.isinf(
+            speed_factor) else 1 / tickrate / speed_factor
+        self.max_lag = max_lag
+        self.metrics = PacingMetrics()
+        self._clock = clock or RealClock()
+        self._start_time = 0.
+        # Start of the current schedule, and number of ticks scheduled since then.
+        self._origin = 0.
+        self._scheduled_ticks = 0
+        self._total_jitter = 0.
+
+    def start(self) -> None:
+        """
+        Start the schedule, at the current time.
+        """
+        self._start_time = self._origin = self._clock.time()
+        self._scheduled_ticks = 0
+
+    def is_late(self) -> bool:
+        """
+        Check if the current tick overran its slot: the next one should have started already.
+        """
+        return bool(self.period) and self._clock.time() > self._deadline(
+            self._scheduled_ticks + 1)
+
+    def skip_frame(self) -> None:
+        """
+        Record a notification frame skipped to catch up.
+        """
+        self.metrics.skipped_frames += 1
+
+    async def wait_next_tick(self) -> None:
+        """
+        Wait until the deadline of the next tick, return at once if it is already over.
+        """
+        self._scheduled_ticks += 1
+        metrics = self.metrics
+        metrics.ticks += 1
+
+        if self.period:
+            now = self._clock.time()
+            delay = self._deadline(self._scheduled_ticks) - now
+            if delay > 0:
+                await self._clock.sleep(delay)
+                now = self._clock.time()
+            else:
+                metrics.late_ticks += 1
+                if -delay > self.max_lag:
+                    metrics.resyncs += 1
+                    self._origin = now
+                    self._scheduled_ticks = 0
+                # Still give the hand to the robots.
+                await self._clock.sleep(0)
+
+            jitter = abs(now - self._deadline(self._scheduled_ticks))
+            self._total_jitter += jitter
+            metrics.mean_jitter = self._total_jitter / metrics.ticks
+            metrics.max_jitter = max(metrics.max_jitter, jitter)
+        else:
+            now = self._clock.time()
+
+        elapsed = now - self._start_time
+        if elapsed > 0:
+            metrics.real_time_factor = metrics.ticks / self.tickrate / elapsed
+
+    def _deadline(self, tick: int) -> float:
+        return self._origin + tick * self.period
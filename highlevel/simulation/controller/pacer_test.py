@@ -0,0 +1,116 @@
+"""
+Test for tick pacer module.
+"""
+import math
+
+import pytest
+
+from highlevel.simulation.controller.pacer import TickPacer
+from highlevel.util.clock import Clock
+
+
+class FakeClock(Clock):
+    """
+    Clock whose time only moves when sleeping or working.
+    """
+    def __init__(self):
+        self.now = 100.
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += max(delay, 0)
+
+    def work(self, duration):
+        """Spend some time simulating a tick."""
+        self.now += duration
+
+
+@pytest.mark.asyncio
+async def test_pacer_subtracts_processing_time():
+    """
+    The time spent simulating a tick is taken out of the wait, the ticks do not drift.
+    """
+    clock = FakeClock()
+    pacer = TickPacer(tickrate=10, speed_factor=2, max_lag=1, clock=clock)
+    pacer.start()
+
+    for _ in range(10):
+        clock.work(0.01)
+        assert not pacer.is_late()
+        await pacer.wait_next_tick()
+
+    assert clock.sleeps == pytest.approx([0.04] * 10)
+    assert clock.now == pytest.approx(100.5)
+    assert pacer.metrics.ticks == 10
+    assert pacer.metrics.late_ticks == 0
+    assert pacer.metrics.max_jitter == pytest.approx(0)
+    assert pacer.metrics.real_time_factor == pytest.approx(2)
+
+
+@pytest.mark.asyncio
+async def test_pacer_catches_up():
+    """
+    A late simulation runs its ticks back to back until it is on schedule again.
+    """
+    clock = FakeClock()
+    pacer = TickPacer(tickrate=10, speed_factor=1, max_lag=1, clock=clock)
+    pacer.start()
+
+    clock.work(0.25)
+    assert pacer.is_late()
+    pacer.skip_frame()
+    await pacer.wait_next_tick()
+    assert pacer.is_late()
+    await pacer.wait_next_tick()
+    assert not pacer.is_late()
+    await pacer.wait_next_tick()
+
+    assert clock.sleeps == pytest.approx([0, 0, 0.05])
+    assert pacer.metrics.late_ticks == 2
+    assert pacer.metrics.skipped_frames == 1
+    assert pacer.metrics.resyncs == 0
+    assert pacer.metrics.max_jitter == pytest.approx(0.15)
+
+
+@pytest.mark.asyncio
+async def test_pacer_resyncs_past_max_lag():
+    """
+    Past the maximum lag, the pacer drops its backlog and schedules from the current time.
+    """
+    clock = FakeClock()
+    pacer = TickPacer(tickrate=10, speed_factor=1, max_lag=0.5, clock=clock)
+    pacer.start()
+
+    clock.work(2)
+    await pacer.wait_next_tick()
+    assert pacer.metrics.resyncs == 1
+
+    await pacer.wait_next_tick()
+    assert clock.sleeps == pytest.approx([0, 0.1])
+    assert pacer.metrics.late_ticks == 1
+
+
+@pytest.mark.asyncio
+async def test_pacer_infinite_speed_factor():
+    """
+    With an infinite speed factor, the pacer never waits but still measures the real time factor.
+    """
+    clock = FakeClock()
+    pacer = TickPacer(tickrate=10,
+                      speed_factor=math.inf,
+                      max_lag=0.5,
+                      clock=clock)
+    pacer.start()
+
+    for _ in range(10):
+        clock.work(0.01)
+        assert not pacer.is_late()
+        await pacer.wait_next_tick()
+
+    assert not clock.sleeps
+    assert pacer.metrics.late_ticks == 0
+    assert pacer.metrics.real_time_factor == pytest.approx(10)
@@ -0,0 +1,338 @@
+"""
+Columnar replay module.
+
+Compact binary replay format, with random access to the frames:
+
+  magic (4 bytes) | version (1 byte) | compression (1 byte)
+  block 0 | block 1 | ...
+  footer (JSON) | footer offset (8 bytes, little endian)
+
+Each block holds up to `block_size` frames, stored as columns (time, x, y, angle, obstacles...).
+The columns are quantized to integers, delta encoded (from the start of the block) and written as
+zigzag varints, then the block is compressed. Blocks are independent from each other: reading a
+frame only needs its block to be decoded.
+
+The footer holds the initial configuration, the probes recorded for each robot and the location of
+every block.
+"""
+import json
+import lzma
+import struct
+import zlib
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy
+
+MAGIC = b'OTRP'
+VERSION = 1
+COLUMNAR_EXTENSION = '.rpl'
+
+BLOCK_SIZE = 120  # Frames per block, 2 seconds at 60 frames per second.
+POSITION_SCALE = 100  # Positions are stored in hundredths of millimeter.
+ANGLE_SCALE = 1_000_000  # Angles are stored in microradians.
+
+# Name of the compression: (code stored in the file, compress, decompress).
+Codec = Callable[[bytes], bytes]
+COMPRESSIONS: Dict[str, Tuple[int, Codec, Codec]] = {
+    'none': (0, bytes, bytes),
+    'zlib': (1, zlib.compress, zlib.decompress),
+    'lzma': (2, lzma.compress, lzma.decompress),
+}
+
+# Probes that can be recorded, and the number of columns they are stored in.
+COLUMNS_PER_PROBE = {'position': 2, 'angle': 1, 'position_obstacles': 3}
+
+_HEADER = struct.Struct('<4sBB')
+_FOOTER_OFFSET = struct.Struct('<Q')
+_COLUMN_LENGTH = struct.Struct('<I')
+
+
+# pylint: disable=too-many-instance-attributes
+class ColumnarReplayWriter:
+    """
+    Write a replay in the columnar format, frame by frame.
+    Only the frames of the current block are kept in memory.
+    Same interface as ReplayWriter.
+    """
+    def __init__(self,
+                 path: str,
+                 initial_configuration: dict,
+                 compression: str = 'zlib',
+                 block_size: int = BLOCK_SIZE):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"unknown compression {compression}")
+
+        self.path = path
+        self.initial_configuration = initial_configuration
+        self.compression = compression
+        self.block_size = block_size
+        self.frame_count = 0
+
+        # Probes recorded for each robot, set by the first frame.
+        self._robots: Optional[List[Tuple[str, List[str]]]] = None
+        self._blocks: List[Tuple[int, int, int]] = []
+        self._columns: List[List[int]] = []
+        self._block_frame_count = 0
+
+        self._file = open(path, 'wb')
+        self._file.write(
+            _HEADER.pack(MAGIC, VERSION, COMPRESSIONS[compression][0]))
+
+    def write_frame(self, frame: dict) -> None:
+        """
+        Append a frame to the replay.
+        Every frame must have the same robots and probes as the first one.
+        """
+        robots = frame['robots']
+        if self._robots is None:
+            self._robots = [(robot_id, list(probes))
+                            for robot_id, probes in robots.items()]
+            for _, probes in self._robots:
+                for probe in probes:
+                    if probe not in COLUMNS_PER_PROBE:
+                        raise ValueError(f"cannot record probe {probe}")
+            self._columns = [[] for _ in range(_column_count(self._robots))]
+
+        if [(robot_id, list(probes))
+                for robot_id, probes in robots.items()] != self._robots:
+            raise ValueError("the robots or probes of the frame changed")
+
+        columns = iter(self._columns)
+        next(columns).append(frame['time'])
+        for robot_id, probes in self._robots:
+            for probe in probes:
+                value = robots[robot_id][probe]
+                if probe == 'position':
+                    next(columns).append(round(value.x * POSITION_SCALE))
+                    next(columns).append(round(value.y * POSITION_SCALE))
+                elif probe == 'angle':
+                    next(columns).append(round(value * ANGLE_SCALE))
+                else:
+                    next(columns).append(len(value))
+                    next(columns).extend(
+                        round(vec.x * POSITION_SCALE) for vec in value)
+                    next(columns).extend(
+                        round(vec.y * POSITION_SCALE) for vec in value)
+
+        self.frame_count += 1
+        self._block_frame_count += 1
+        if self._block_frame_count == self.block_size:
+            self._write_block()
+
+    def close(self) -> None:
+        """
+        Write the last block and the footer, then close the file.
+        """
+        if self._block_frame_count:
+            self._write_block()
+
+        footer = json.dumps({
+            'initial_configuration': self.initial_configuration,
+            'robots': self._robots or [],
+            'frame_count': self.frame_count,
+            'block_size': self.block_size,
+            'blocks': self._blocks,
+        }).encode()
+        footer_offset = self._file.tell()
+        self._file.write(footer)
+        self._file.write(_FOOTER_OFFSET.pack(footer_offset))
+        self._file.close()
+
+    def _write_block(self) -> None:
+        payload = bytearray()
+        for column in self._columns:
+            data = encode_column(numpy.array(column, dtype=numpy.int64))
+            payload += _COLUMN_LENGTH.pack(len(data))
+            payload += data
+            column.clear()
+
+        compress = COMPRESSIONS[self.compression][1]
+        data = compress(bytes(payload))
+        self._blocks.append(
+            (self._file.tell(), len(data), self._block_frame_count))
+        self._file.write(data)
+        self._block_frame_count = 0
+
+
+# pylint: disable=too-many-instance-attributes
+class ColumnarReplayReader:
+    """
+    Read a replay written by ColumnarReplayWriter.
+    The frames have the same shape as the JSON frames of the replay viewer, any frame can be
+    accessed by its index without decoding the whole replay.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{path} is not a columnar replay")
+            magic, version, compression = _HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a columnar replay")
+
+            file.seek(-_FOOTER_OFFSET.size, 2)
+            end = file.tell()
+            footer_offset, = _FOOTER_OFFSET.unpack(file.read())
+            file.seek(footer_offset)
+            footer = json.loads(file.read(end - footer_offset))
+
+        self._decompress = next(
+            decompress for code, _, decompress in COMPRESSIONS.values()
+            if code == compression)
+        self.initial_configuration: dict = footer['initial_configuration']
+        self._robots: List[Tuple[str, List[str]]] = footer['robots']
+        self._frame_count: int = footer['frame_count']
+        self._block_size: int = footer['block_size']
+        self._blocks: List[Tuple[int, int, int]] = footer['blocks']
+
+        # Columns of the last decoded block: replays are usually read sequentially.
+        self._cached_block: Tuple[int, List[numpy.ndarray]] = (-1, [])
+
+    def __len__(self) -> int:
+        return self._frame_count
+
+    def __getitem__(self, index: int) -> dict:
+        if index < 0:
+            index += self._frame_count
+        if not 0 <= index < self._frame_count:
+            raise IndexError("frame index out of range")
+
+        block_index, frame_index = divmod(index, self._block_size)
+        if self._cached_block[0] != block_index:
+            self._cached_block = (block_index, self._read_block(block_index))
+        return self._build_frame(self._cached_block[1], frame_index)
+
+    def __iter__(self) -> Iterator[dict]:
+        for block_index, (_, _, frame_count) in enumerate(self._blocks):
+            columns = self._read_block(block_index)
+            for frame_index in range(frame_count):
+                yield self._build_frame(columns, frame_index)
+
+    def _read_block(self, block_index: int) -> List[numpy.ndarray]:
+        """
+        Decode the columns of a block. The obstacle counts are replaced by the offsets of the
+        obstacles of each frame in the obstacle columns.
+        """
+        offset, length, frame_count = self._blocks[block_index]
+        with open(self.path, 'rb') as file:
+            file.seek(offset)
+            payload = self._decompress(file.read(length))
+
+        columns = []
+        position = 0
+        while position < len(payload):
+            column_length, = _COLUMN_LENGTH.unpack_from(payload, position)
+            position += _COLUMN_LENGTH.size
+            columns.append(
+                decode_column(payload[position:position + column_length]))
+            position += column_length
+
+        if len(columns) != _column_count(self._robots) or len(
+                columns[0]) != frame_count:
+            raise ValueError(f"block {block_index} is corrupted")
+
+        index = 1
+        for _, probes in self._robots:
+            for probe in probes:
+                if probe == 'position_obstacles':
+                    columns[index] = numpy.concatenate(
+                        ([0], numpy.cumsum(columns[index])))
+                index += COLUMNS_PER_PROBE[probe]
+        return columns
+
+    def _build_frame(self, columns: List[numpy.ndarray], index: int) -> dict:
+        """
+        Build a frame from the columns of its block.
+        """
+        column_iterator = iter(columns)
+        frame: dict = {
+            'time': int(next(column_iterator)[index]),
+            'robots': {},
+        }
+        for robot_id, probes in self._robots:
+            state: dict = {}
+            frame['robots'][robot_id] = state
+            for probe in probes:
+                if probe == 'position':
+                    state[probe] = {
+                        'x':
+                        int(next(column_iterator)[index]) / POSITION_SCALE,
+                        'y':
+                        int(next(column_iterator)[index]) / POSITION_SCALE,
+                    }
+                elif probe == 'angle':
+                    state[probe] = int(
+                        next(column_iterator)[index]) / ANGLE_SCALE
+                else:
+                    offsets = next(column_iterator)
+                    start, end = offsets[index], offsets[index + 1]
+                    xs = next(column_iterator)[start:end] / POSITION_SCALE
+                    ys = next(column_iterator)[start:end] / POSITION_SCALE
+                    state[probe] = [{
+                        'x': x,
+                        'y': y
+                    } for x, y in zip(xs.tolist(), ys.tolist())]
+        return frame
+
+
+def columnar_replay_to_json(path: str) -> str:
+    """
+    Convert a columnar replay to the JSON document expected by the replay viewer:
+    {"initial_configuration": ..., "frames": [...]}.
+    """
+    reader = ColumnarReplayReader(path)
+    return json.dumps({
+        'initial_configuration': reader.initial_configuration,
+        'frames': list(reader),
+    })
+
+
+def encode_column(values: numpy.ndarray) -> bytes:
+    """
+    Delta encode a column of integers and write it as zigzag varints (LEB128).
+    """
+    deltas = numpy.diff(values, prepend=0)
+    zigzag = ((deltas << 1) ^ (deltas >> 63)).astype(numpy.uint64)
+
+    # One row per value, one column per 7 bits group.
+    groups = numpy.zeros((len(zigzag), 10), dtype=numpy.uint8)
+    lengths = numpy.ones(len(zigzag), dtype=numpy.int64)
+    for group in range(10):
+        groups[:, group] = zigzag & 0x7f
+        zigzag = zigzag >> numpy.uint64(7)
+        more = zigzag != 0
+        if not more.any():
+            break
+        groups[more, group] |= 0x80
+        lengths += more
+
+    return groups[numpy.arange(10) < lengths[:, None]].tobytes()
+
+
+def decode_column(data: bytes) -> numpy.ndarray:
+    """
+    Decode a column written by encode_column.
+    """
+    raw = numpy.frombuffer(data, dtype=numpy.uint8)
+    if not raw.size:
+        return numpy.zeros(0, dtype=numpy.int64)
+
+    is_last = (raw & 0x80) == 0
+    starts = numpy.flatnonzero(numpy.concatenate(([True], is_last[:-1])))
+    value_index = numpy.cumsum(is_last) - is_last
+    shifts = (numpy.arange(len(raw)) - starts[value_index]) * 7
+
+    # The 7 bits groups of a value are contiguous and do not overlap.
+    zigzag = numpy.bitwise_or.reduceat(
+        (raw & 0x7f).astype(numpy.uint64) << shifts.astype(numpy.uint64),
+        starts)
+
+    deltas = (zigzag >> numpy.uint64(1)).astype(
+        numpy.int64) ^ -(zigzag & numpy.uint64(1)).astype(numpy.int64)
+    return numpy.cumsum(deltas)
+
+
+def _column_count(robots: List[Tuple[str, List[str]]]) -> int:
+    return 1 + sum(COLUMNS_PER_PROBE[probe] for _, probes in robots
+                   for probe in probes)
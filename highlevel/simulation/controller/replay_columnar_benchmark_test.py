@@ -0,0 +1,67 @@
+"""
+Benchmarks for the replay formats: recording 10 seconds of simulation and seeking in it.
+
+Run them with `make benchmark`.
+"""
+import math
+import random
+
+from pytest import fixture, mark
+
+from highlevel.simulation.controller.replay_columnar import (
+    ColumnarReplayReader, ColumnarReplayWriter)
+from highlevel.simulation.controller.replay_writer import ReplayWriter
+from highlevel.util.geometry.vector import Vector2
+
+FRAME_COUNT = 600  # 10 seconds at 60 frames per second.
+
+
+@fixture(name='frames')
+def frames_factory():
+    """
+    Frames of a robot seeing 360 obstacles, like the simulated LIDAR.
+    """
+    obstacles = tuple(
+        Vector2(1500 + 1000 * math.cos(i / 360 * 2 * math.pi), 1000 +
+                800 * math.sin(i / 360 * 2 * math.pi)) for i in range(360))
+    return [{
+        'time': time * 16,
+        'robots': {
+            'ROBOT_A': {
+                'angle': time / 1000,
+                'position': Vector2(500 + time / 10, 500),
+                'position_obstacles': obstacles,
+            }
+        }
+    } for time in range(FRAME_COUNT)]
+
+
+@mark.parametrize('writer_class', [ReplayWriter, ColumnarReplayWriter],
+                  ids=['ndjson', 'columnar'])
+def test_benchmark_write_replay(benchmark, tmp_path, frames, writer_class):
+    """
+    Benchmark recording the frames.
+    """
+    def write():
+        writer = writer_class(str(tmp_path / 'replay'), {})
+        for frame in frames:
+            writer.write_frame(frame)
+        writer.close()
+
+    benchmark.pedantic(write, rounds=3)
+
+
+def test_benchmark_random_access(benchmark, tmp_path, frames):
+    """
+    Benchmark reading random frames of a columnar replay.
+    """
+    path = str(tmp_path / 'replay.rpl')
+    writer = ColumnarReplayWriter(path, {})
+    for frame in frames:
+        writer.write_frame(frame)
+    writer.close()
+    reader = ColumnarReplayReader(path)
+    rng = random.Random(0)
+
+    frame = benchmark(lambda: reader[rng.randrange(FRAME_COUNT)])
+    assert len(frame['robots']['ROBOT_A']['position_obstacles']) == 360
@@ -0,0 +1,202 @@
+"""
+Test for columnar replay module.
+"""
+import json
+import math
+import os
+
+import numpy
+import pytest
+
+from highlevel.simulation.controller.replay_columnar import (
+    BLOCK_SIZE, ColumnarReplayReader, ColumnarReplayWriter,
+    columnar_replay_to_json, decode_column, encode_column)
+from highlevel.simulation.controller.replay_writer import ReplayWriter
+from highlevel.util.geometry.vector import Vector2
+
+INITIAL_CONFIGURATION = {'sizes': {'ROBOT_A': [10, 10]}}
+
+
+def _frame(time: int) -> dict:
+    """
+    Frame of a robot moving around, seeing 360 obstacles like the simulated LIDAR.
+    """
+    obstacles = tuple(
+        Vector2(1000 + 0.5 * time + 700 * math.cos(angle), 800 +
+                500 * math.sin(angle))
+        for angle in numpy.linspace(0, 2 * math.pi, 360, endpoint=False))
+    return {
+        'time': time * 16,
+        'robots': {
+            'ROBOT_A': {
+                'angle': math.sin(time / 100),
+                'position': Vector2(200 + time / 3, 1000 - time / 7),
+                'position_obstacles': obstacles,
+            }
+        }
+    }
+
+
+def _write(path: str,
+           frame_count: int,
+           compression: str = 'zlib',
+           block_size: int = BLOCK_SIZE) -> None:
+    writer = ColumnarReplayWriter(path, INITIAL_CONFIGURATION, compression,
+                                  block_size)
+    for time in range(frame_count):
+        writer.write_frame(_frame(time))
+    writer.close()
+
+
+def _assert_frame_equal(actual: dict, time: int) -> None:
+    expected = json.loads(
+        json.dumps(
+            _frame(time),
+            default=lambda vec: {
+                'x': vec.x,
+                'y': vec.y
+            },
+        ))
+    assert actual['time'] == expected['time']
+    actual_state = actual['robots']['ROBOT_A']
+    expected_state = expected['robots']['ROBOT_A']
+    assert actual_state['angle'] == pytest.approx(expected_state['angle'],
+                                                  abs=1e-6)
+    for key in ('x', 'y'):
+        assert actual_state['position'][key] == pytest.approx(
+            expected_state['position'][key], abs=0.01)
+    assert len(actual_state['position_obstacles']) == len(
+        expected_state['position_obstacles'])
+    for actual_obstacle, expected_obstacle in zip(
+            actual_state['position_obstacles'],
+            expected_state['position_obstacles']):
+        for key in ('x', 'y'):
+            assert actual_obstacle[key] == pytest.approx(
+                expected_obstacle[key], abs=0.01)
+
+
+def test_encode_decode_column():
+    """
+    Columns of integers are encoded losslessly.
+    """
+    values = numpy.array(
+        [0, 1, -1, 63, 64, -65, 2**31, -2**40, 2**62, -2**62, 5, 5, 5],
+        dtype=numpy.int64)
+
+    data = encode_column(values)
+
+    assert decode_column(data).tolist() == values.tolist()
+    assert decode_column(encode_column(numpy.array(
+        [], dtype=numpy.int64))).tolist() == []
+
+
+def test_encode_column_small_deltas():
+    """
+    Slowly changing values take one byte each.
+    """
+    values = numpy.arange(1000, 2000, dtype=numpy.int64)
+
+    assert len(encode_column(values)) == len(values) + 1
+
+
+@pytest.mark.parametrize('compression', ['none', 'zlib', 'lzma'])
+def test_write_read(tmp_path, compression):
+    """
+    Frames are read back, within the resolution of the format.
+    """
+    path = str(tmp_path / 'replay.rpl')
+    _write(path, 25, compression=compression, block_size=10)
+
+    reader = ColumnarReplayReader(path)
+
+    assert reader.initial_configuration == INITIAL_CONFIGURATION
+    assert len(reader) == 25
+    frames = list(reader)
+    assert len(frames) == 25
+    for time, frame in enumerate(frames):
+        _assert_frame_equal(frame, time)
+
+
+def test_random_access(tmp_path):
+    """
+    Any frame can be accessed by its index.
+    """
+    path = str(tmp_path / 'replay.rpl')
+    _write(path, 25, block_size=10)
+
+    reader = ColumnarReplayReader(path)
+
+    for time in (24, 3, 17, 0, 10, 9):
+        _assert_frame_equal(reader[time], time)
+    _assert_frame_equal(reader[-1], 24)
+    with pytest.raises(IndexError):
+        reader[25]  # pylint: disable=pointless-statement
+
+
+def test_empty_replay(tmp_path):
+    """
+    A replay can have no frame at all.
+    """
+    path = str(tmp_path / 'replay.rpl')
+    _write(path, 0)
+
+    assert json.loads(columnar_replay_to_json(path)) == {
+        'initial_configuration': INITIAL_CONFIGURATION,
+        'frames': [],
+    }
+
+
+def test_invalid_file(tmp_path):
+    """
+    Only columnar replays can be read.
+    """
+    path = tmp_path / 'replay.ndjson'
+    path.write_text('{}\n')
+
+    with pytest.raises(ValueError):
+        ColumnarReplayReader(str(path))
+
+
+def test_invalid_frames(tmp_path):
+    """
+    Unknown probes cannot be recorded and all the frames must have the same probes.
+    """
+    writer = ColumnarReplayWriter(str(tmp_path / 'replay.rpl'),
+                                  INITIAL_CONFIGURATION)
+    with pytest.raises(ValueError):
+        writer.write_frame({'time': 0, 'robots': {'ROBOT_A': {'foo': 1}}})
+
+    writer = ColumnarReplayWriter(str(tmp_path / 'replay.rpl'),
+                                  INITIAL_CONFIGURATION)
+    writer.write_frame({'time': 0, 'robots': {'ROBOT_A': {'angle': 1}}})
+    with pytest.raises(ValueError):
+        writer.write_frame({'time': 1, 'robots': {'ROBOT_B': {'angle': 1}}})
+
+
+def test_columnar_replay_to_json(tmp_path):
+    """
+    The columnar replay converts to the document of the replay viewer.
+    """
+    path = str(tmp_path / 'replay.rpl')
+    _write(path, 3)
+
+    result = json.loads(columnar_replay_to_json(path))
+
+    assert result['initial_configuration'] == INITIAL_CONFIGURATION
+    for time, frame in enumerate(result['frames']):
+        _assert_frame_equal(frame, time)
+
+
+def test_size_reduction(tmp_path):
+    """
+    The columnar replay is at least 10 times smaller than the NDJSON one.
+    """
+    columnar_path = str(tmp_path / 'replay.rpl')
+    ndjson_path = str(tmp_path / 'replay.ndjson')
+    _write(columnar_path, 240)
+    writer = ReplayWriter(ndjson_path, INITIAL_CONFIGURATION)
+    for time in range(240):
+        writer.write_frame(_frame(time))
+    writer.close()
+
+    assert os.path.getsize(ndjson_path) >= 10 * os.path.getsize(columnar_path)
@@ -1,63 +1,80 @@
 """
 Replay saver module.
 """
-import json
-from typing import List
+import os
+import shutil
+import time
+import uuid
+from typing import Optional, Union
 
 from highlevel.logger import LOGGER
 from highlevel.robot.entity.configuration import Configuration
-from highlevel.simulation.client.http import HTTPClient
-from highlevel.simulation.client.web_browser import WebBrowserClient
+from highlevel.simulation.controller.replay_columnar import COLUMNAR_EXTENSION, ColumnarReplayWriter
+from highlevel.simulation.controller.replay_writer import ReplayWriter
 from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
-from highlevel.simulation.entity.simulation_state import RobotID
-from highlevel.util.json_encoder import RobotJSONEncoder
-
-REPLAY_API_URL = 'https://replay-api.outech.fr/replay/'
-REPLAY_VIEWER_URL = 'https://outech-robotic.github.io/replay/index.html'
-# REPLAY_VIEWER_URL = 'http://127.0.0.1:8000/'
+from highlevel.simulation.entity.robot_id import RobotID
 
 
 class ReplaySaver:
     """
     Save simulation state for future replay.
+    The frames are streamed to the replay file as they come, in the columnar format if the file
+    has the columnar extension (see ColumnarReplayWriter), as NDJSON otherwise (see ReplayWriter).
+    Nothing is recorded if the simulation configuration has no replay path.
+
+    Once saved, the replay is moved to the spool directory, to be uploaded by the ReplayUploader.
     """
     def __init__(self, configuration: Configuration,
-                 simulation_configuration: SimulationConfiguration,
-                 http_client: HTTPClient,
-                 web_browser_client: WebBrowserClient):
+                 simulation_configuration: SimulationConfiguration):
         size = (int(configuration.robot_length),
                 int(configuration.robot_width))
 
-        self.frames: List[dict] = []
-        self.result = {
-            'initial_configuration': {
-                'sizes': {
-                    RobotID.RobotA: size,
-                }
-            },
-            'frames': self.frames,
+        # All the robots have the same size.
+        robot_ids = [RobotID.RobotA, *simulation_configuration.extra_robots]
+        self.initial_configuration = {
+            'sizes': {robot_id: size
+                      for robot_id in robot_ids}
         }
         self.configuration = configuration
         self.simulation_configuration = simulation_configuration
-        self.http_client = http_client
-        self.web_browser_client = web_browser_client
+        self._writer: Optional[Union[ReplayWriter,
+                                     ColumnarReplayWriter]] = None
 
     def on_tick(self, state: dict) -> None:
         """
         Should be called to append the state to the result to be saved.
         """
-        self.frames.append(state)
+        replay_path = self.simulation_configuration.replay_path
+        if replay_path is None:
+            return
+
+        if self._writer is None:
+            writer_class = ColumnarReplayWriter if replay_path.endswith(
+                COLUMNAR_EXTENSION) else ReplayWriter
+            self._writer = writer_class(replay_path,
+                                        self.initial_configuration)
+        self._writer.write_frame(state)
 
-    def save_replay(self):
+    def save_replay(self) -> Optional[str]:
         """
-        Save the replay.
+        Save the replay to the spool directory. Return the path of the saved replay, None if
+        nothing was recorded.
         """
+        if self._writer is None:
+            LOGGER.get().info("no_replay_to_save")
+            return None
 
-        dump = json.dumps(self.result, cls=RobotJSONEncoder)
-        LOGGER.get().info("saving_replay", size=len(dump))
+        self._writer.close()
 
-        replay_id = self.http_client.post_file(REPLAY_API_URL, dump)['id']
+        spool_dir = self.simulation_configuration.replay_spool_dir
+        os.makedirs(spool_dir, exist_ok=True)
+        extension = os.path.splitext(self._writer.path)[1]
+        name = time.strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:8]
+        spool_path = os.path.join(spool_dir, name + extension)
+        shutil.move(self._writer.path, spool_path)
 
-        LOGGER.get().info("saved_replay", url=REPLAY_API_URL + replay_id)
-        self.web_browser_client.open(REPLAY_VIEWER_URL + '?replay=' +
-                                     REPLAY_API_URL + replay_id)
+        LOGGER.get().info("saved_replay",
+                          path=spool_path,
+                          frames=self._writer.frame_count)
+        self._writer = None
+        return spool_path
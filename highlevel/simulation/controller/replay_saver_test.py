@@ -2,26 +2,27 @@
 Test for replay saver module.
 """
 import json
-from unittest.mock import MagicMock
+import os
 
-from highlevel.simulation.client.http import HTTPClient
-from highlevel.simulation.client.web_browser import WebBrowserClient
+from highlevel.simulation.controller.replay_columnar import columnar_replay_to_json
 from highlevel.simulation.controller.replay_saver import ReplaySaver
+from highlevel.simulation.controller.replay_writer import replay_to_json
 from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.util.geometry.vector import Vector2
 
 
-def test_happy_path(configuration_test):
+def test_happy_path(configuration_test, tmp_path):
     """
     Happy path.
     """
 
-    http_client = MagicMock(spec=HTTPClient)
-    http_client.post_file = MagicMock(return_value={'id': 'test_id'})
     replay_saver = ReplaySaver(
         configuration=configuration_test,
-        simulation_configuration=SimulationConfiguration(obstacles=[]),
-        http_client=http_client,
-        web_browser_client=MagicMock(spec=WebBrowserClient))
+        simulation_configuration=SimulationConfiguration(
+            obstacles=[],
+            replay_path=str(tmp_path / 'replay.ndjson'),
+            replay_spool_dir=str(tmp_path / 'spool')))
 
     replay_saver.on_tick({
         "time": 0,
@@ -48,14 +49,16 @@ def test_happy_path(configuration_test):
         }
     })
 
-    replay_saver.save_replay()
+    spool_path = replay_saver.save_replay()
 
-    http_client.post_file.assert_called_once()
+    # The replay was moved to the spool directory.
+    assert spool_path is not None
+    assert os.listdir(tmp_path / 'spool') == [os.path.basename(spool_path)]
+    assert spool_path.endswith('.ndjson')
+    assert not os.path.exists(tmp_path / 'replay.ndjson')
 
-    # Make sure the 2nd argument of the call is a valid JSON string and that it conforms to the
-    # JSON expected output.
-    data = http_client.post_file.call_args_list[0][0][1]
-    assert json.loads(data) == {
+    # Make sure the replay converts to the JSON expected output.
+    assert json.loads(replay_to_json(spool_path)) == {
         'initial_configuration': {
             'sizes': {
                 'ROBOT_A': [10, 10]
@@ -85,3 +88,79 @@ def test_happy_path(configuration_test):
             }
         }]
     }
+
+
+def test_no_replay_path(configuration_test, tmp_path):
+    """
+    Nothing is recorded nor saved without a replay path.
+    """
+    replay_saver = ReplaySaver(
+        configuration=configuration_test,
+        simulation_configuration=SimulationConfiguration(
+            obstacles=[], replay_spool_dir=str(tmp_path / 'spool')))
+
+    replay_saver.on_tick({"time": 0, "robots": {}})
+
+    assert replay_saver.save_replay() is None
+    assert not os.path.exists(tmp_path / 'spool')
+
+
+def test_extra_robots_sizes(configuration_test):
+    """
+    The initial configuration has the size of every simulated robot.
+    """
+    replay_saver = ReplaySaver(
+        configuration=configuration_test,
+        simulation_configuration=SimulationConfiguration(
+            obstacles=[], extra_robots={RobotID.RobotC: (Vector2(10, 10), 0)}))
+
+    assert replay_saver.initial_configuration == {
+        'sizes': {
+            RobotID.RobotA: (10, 10),
+            RobotID.RobotC: (10, 10),
+        }
+    }
+
+
+def test_columnar_replay(configuration_test, tmp_path):
+    """
+    The replay is recorded in the columnar format when the replay file has the columnar extension.
+    """
+    replay_saver = ReplaySaver(
+        configuration=configuration_test,
+        simulation_configuration=SimulationConfiguration(
+            obstacles=[],
+            replay_path=str(tmp_path / 'replay.rpl'),
+            replay_spool_dir=str(tmp_path / 'spool')))
+
+    replay_saver.on_tick({
+        "time": 0,
+        "robots": {
+            "ROBOT_A": {
+                "angle": 0.5,
+                "position": Vector2(1, 2),
+                "position_obstacles": (Vector2(3, 4), ),
+            }
+        }
+    })
+    spool_path = replay_saver.save_replay()
+
+    assert spool_path is not None
+    assert spool_path.endswith('.rpl')
+    assert json.loads(columnar_replay_to_json(spool_path))['frames'] == [{
+        "time":
+        0,
+        "robots": {
+            "ROBOT_A": {
+                "angle": 0.5,
+                "position": {
+                    "x": 1,
+                    "y": 2,
+                },
+                "position_obstacles": [{
+                    "x": 3,
+                    "y": 4,
+                }],
+            }
+        }
+    }]
@@ -0,0 +1,158 @@
+"""
+Replay uploader module.
+"""
+import asyncio
+import os
+import time
+from typing import List, Optional
+
+import requests
+
+from highlevel.logger import LOGGER
+from highlevel.simulation.client.http import HTTPClient
+from highlevel.simulation.client.web_browser import WebBrowserClient
+from highlevel.simulation.controller.replay_columnar import (
+    COLUMNAR_EXTENSION, columnar_replay_to_json)
+from highlevel.simulation.controller.replay_writer import replay_to_json
+
+REPLAY_API_URL = 'https://replay-api.outech.fr/replay/'
+REPLAY_VIEWER_URL = 'https://outech-robotic.github.io/replay/index.html'
+# REPLAY_VIEWER_URL = 'http://127.0.0.1:8000/'
+
+# Suffix of the replays being uploaded, so that two uploaders never upload the same replay.
+UPLOADING_SUFFIX = '.uploading'
+# Replays marked as being uploaded for longer than this, in seconds, were left by an uploader that
+# was killed: they are uploaded again.
+STALE_UPLOAD_AGE = 3600
+
+
+class ReplayUploader:
+    """
+    Upload the replays saved in the spool directory by the ReplaySaver, then open them in the
+    replay viewer.
+    The uploads are retried with an exponential backoff, a replay is only removed from the spool
+    directory once uploaded: the replays that could not be uploaded (or read) are retried the next
+    time.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self,
+                 http_client: HTTPClient,
+                 web_browser_client: WebBrowserClient,
+                 api_url: str = REPLAY_API_URL,
+                 max_attempts: int = 5,
+                 backoff_delay: float = 1,
+                 compress: bool = False,
+                 stale_upload_age: float = STALE_UPLOAD_AGE):
+        self.http_client = http_client
+        self.web_browser_client = web_browser_client
+        self.api_url = api_url
+        self.max_attempts = max_attempts
+        self.backoff_delay = backoff_delay  # Seconds, doubled after each failed attempt.
+        self.compress = compress
+        self.stale_upload_age = stale_upload_age
+
+    async def upload_spool(self, spool_dir: str) -> List[str]:
+        """
+        Upload all the replays of the spool directory. Return the IDs of the uploaded replays.
+        """
+        if not os.path.isdir(spool_dir):
+            return []
+
+        replay_ids = []
+        for name in sorted(os.listdir(spool_dir)):
+            path = os.path.join(spool_dir, name)
+            if name.endswith(UPLOADING_SUFFIX):
+                reclaimed = self._reclaim(path)
+                if reclaimed is None:
+                    continue
+                path = reclaimed
+
+            try:
+                replay_id = await self.upload(path)
+            except Exception as exc:  # pylint: disable=broad-except
+                # A replay that cannot be read must not prevent the others from being uploaded.
+                LOGGER.get().error("replay_upload_error", path=path, error=str(exc))
+                continue
+            if replay_id is not None:
+                replay_ids.append(replay_id)
+        return replay_ids
+
+    async def upload(self, path: str) -> Optional[str]:
+        """
+        Upload a replay and open it in the browser. Return the ID of the replay, None if it could
+        not be uploaded. The replay is left in the spool directory if it could not be uploaded, or
+        if reading it raised.
+        """
+        uploading_path = path + UPLOADING_SUFFIX
+        try:
+            os.rename(path, uploading_path)
+        except FileNotFoundError:
+            # Another uploader took it.
+            return None
+        # Start of the upload, see _reclaim.
+        os.utime(uploading_path)
+
+        replay_id = None
+        try:
+            replay_id = await self._post(path, uploading_path)
+        finally:
+            if replay_id is None:
+                os.rename(uploading_path, path)
+        if replay_id is None:
+            return None
+
+        os.remove(uploading_path)
+        LOGGER.get().info("uploaded_replay", url=self.api_url + replay_id)
+        self.web_browser_client.open(REPLAY_VIEWER_URL + '?replay=' +
+                                     self.api_url + replay_id)
+        return replay_id
+
+    async def _post(self, path: str, uploading_path: str) -> Optional[str]:
+        """
+        Convert a replay to JSON and post it, retrying on failure. Return the ID of the replay,
+        None if all the attempts failed.
+        """
+        loop = asyncio.get_event_loop()
+        if path.endswith(COLUMNAR_EXTENSION):
+            dump = await loop.run_in_executor(None, columnar_replay_to_json,
+                                              uploading_path)
+        else:
+            dump = await loop.run_in_executor(None, replay_to_json,
+                                              uploading_path)
+
+        delay = self.backoff_delay
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = await loop.run_in_executor(
+                    None, self.http_client.post_file, self.api_url, dump,
+                    self.compress)
+                return response['id']
+            except (requests.RequestException, ValueError, KeyError) as exc:
+                LOGGER.get().warning("replay_upload_failed",
+                                     path=path,
+                                     attempt=attempt,
+                                     error=str(exc))
+                if attempt < self.max_attempts:
+                    await asyncio.sleep(delay)
+                    delay *= 2
+        return None
+
+    def _reclaim(self, uploading_path: str) -> Optional[str]:
+        """
+        Give back to the spool a replay whose upload started more than `stale_upload_age` seconds
+        ago: the uploader was killed before it could finish. Return the path of the replay, None if
+        it is still being uploaded.
+        """
+        try:
+            if time.time() - os.path.getmtime(
+                    uploading_path) < self.stale_upload_age:
+                return None
+            path = uploading_path[:-len(UPLOADING_SUFFIX)]
+            os.rename(uploading_path, path)
+        except FileNotFoundError:
+            # The upload just ended.
+            return None
+
+        LOGGER.get().warning("reclaimed_stale_replay_upload", path=path)
+        return path
@@ -0,0 +1,209 @@
+"""
+Test for replay uploader module.
+"""
+import gzip
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+from pytest import fixture
+
+from highlevel.simulation.client.http import HTTPClient
+from highlevel.simulation.client.web_browser import WebBrowserClient
+from highlevel.simulation.controller.replay_uploader import ReplayUploader, REPLAY_VIEWER_URL
+from highlevel.simulation.controller.replay_writer import ReplayWriter
+
+
+class StandInServer(HTTPServer):
+    """
+    Local stand-in for the replay API: fails the first `failures` requests, then answers with the
+    ID of the replay.
+    """
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.failures = 0
+        self.bodies: List[bytes] = []
+
+    @property
+    def url(self) -> str:
+        """
+        URL of the server.
+        """
+        return f'http://127.0.0.1:{self.server_port}/replay/'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of the stand-in server.
+    """
+    server: StandInServer
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        Handle an upload.
+        """
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+        if self.server.failures:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        self.server.bodies.append(body)
+        payload = json.dumps({'id': f'id{len(self.server.bodies)}'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        pass
+
+
+@fixture(name='server')
+def server_factory():
+    """
+    Stand-in server, running in a thread.
+    """
+    server = StandInServer()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+@fixture(name='spool_dir')
+def spool_dir_factory(tmp_path):
+    """
+    Spool directory with a replay.
+    """
+    writer = ReplayWriter(str(tmp_path / 'replay.ndjson'), {'sizes': {}})
+    writer.write_frame({'time': 0, 'robots': {}})
+    writer.close()
+    return str(tmp_path)
+
+
+@fixture(name='web_browser_client')
+def web_browser_client_mock():
+    """
+    Web browser client.
+    """
+    return MagicMock(spec=WebBrowserClient)
+
+
+def _uploader(server, web_browser_client, **kwargs):
+    return ReplayUploader(http_client=HTTPClient(),
+                          web_browser_client=web_browser_client,
+                          api_url=server.url,
+                          backoff_delay=0,
+                          **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_upload_spool(server, spool_dir, web_browser_client):
+    """
+    Happy path: the replay is uploaded, removed from the spool and opened in the browser.
+    """
+    uploader = _uploader(server, web_browser_client)
+
+    assert await uploader.upload_spool(spool_dir) == ['id1']
+
+    assert not os.listdir(spool_dir)
+    assert len(server.bodies) == 1
+    assert b'{"initial_configuration": {"sizes": {}}, "frames": [{' in server.bodies[
+        0]
+    web_browser_client.open.assert_called_once_with(REPLAY_VIEWER_URL +
+                                                    '?replay=' + server.url +
+                                                    'id1')
+
+
+@pytest.mark.asyncio
+async def test_upload_compressed(server, spool_dir, web_browser_client):
+    """
+    The body of the upload can be compressed.
+    """
+    uploader = _uploader(server, web_browser_client, compress=True)
+
+    assert await uploader.upload_spool(spool_dir) == ['id1']
+    assert b'"frames"' in server.bodies[0]
+
+
+@pytest.mark.asyncio
+async def test_upload_retry(server, spool_dir, web_browser_client):
+    """
+    Failed uploads are retried.
+    """
+    server.failures = 2
+    uploader = _uploader(server, web_browser_client, max_attempts=3)
+
+    assert await uploader.upload_spool(spool_dir) == ['id1']
+    assert not os.listdir(spool_dir)
+
+
+@pytest.mark.asyncio
+async def test_upload_give_up(server, spool_dir, web_browser_client):
+    """
+    The replay is kept in the spool directory if it could not be uploaded.
+    """
+    server.failures = 3
+    uploader = _uploader(server, web_browser_client, max_attempts=3)
+
+    assert await uploader.upload_spool(spool_dir) == []
+    assert os.listdir(spool_dir) == ['replay.ndjson']
+    web_browser_client.open.assert_not_called()
+
+    # Uploaded the next time.
+    assert await uploader.upload_spool(spool_dir) == ['id1']
+
+
+@pytest.mark.asyncio
+async def test_upload_spool_does_not_exist(tmp_path, web_browser_client):
+    """
+    Nothing to upload if nothing was ever saved.
+    """
+    uploader = ReplayUploader(http_client=MagicMock(spec=HTTPClient),
+                              web_browser_client=web_browser_client)
+
+    assert await uploader.upload_spool(str(tmp_path / 'spool')) == []
+
+
+@pytest.mark.asyncio
+async def test_upload_corrupt_replay(server, spool_dir, web_browser_client):
+    """
+    A replay that cannot be read is left in the spool directory, and does not prevent the others
+    from being uploaded.
+    """
+    with open(os.path.join(spool_dir, 'corrupt.rpl'), 'wb') as file:
+        file.write(b'\x00truncated')
+    uploader = _uploader(server, web_browser_client)
+
+    assert await uploader.upload_spool(spool_dir) == ['id1']
+    assert os.listdir(spool_dir) == ['corrupt.rpl']
+
+
+@pytest.mark.asyncio
+async def test_upload_stale(server, spool_dir, web_browser_client):
+    """
+    A replay whose upload started long ago (the uploader was killed) is uploaded again, a replay
+    being uploaded is not.
+    """
+    path = os.path.join(spool_dir, 'replay.ndjson')
+    os.rename(path, path + '.uploading')
+    uploader = _uploader(server, web_browser_client, stale_upload_age=60)
+
+    assert await uploader.upload_spool(spool_dir) == []
+    assert os.listdir(spool_dir) == ['replay.ndjson.uploading']
+
+    os.utime(path + '.uploading', (0, 0))
+    assert await uploader.upload_spool(spool_dir) == ['id1']
+    assert not os.listdir(spool_dir)
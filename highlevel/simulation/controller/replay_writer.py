@@ -0,0 +1,84 @@
+"""
+Replay writer module.
+"""
+import io
+import json
+from typing import Iterator
+
+from highlevel.util.json_encoder import RobotJSONEncoder
+
+# Flush the file every second of simulation (at 60 frames per second).
+FLUSH_INTERVAL = 60
+
+
+class ReplayWriter:
+    """
+    Write a replay to a file frame by frame, in the NDJSON format (one JSON document per line):
+    the first line holds the initial configuration, each of the following lines holds a frame.
+    Only the current frame is kept in memory, whatever the length of the simulation.
+    """
+    def __init__(self,
+                 path: str,
+                 initial_configuration: dict,
+                 flush_interval: int = FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.frame_count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write(initial_configuration)
+
+    def write_frame(self, frame: dict) -> None:
+        """
+        Append a frame to the replay.
+        """
+        self._write(frame)
+        self.frame_count += 1
+        if self.frame_count % self.flush_interval == 0:
+            self._file.flush()
+
+    def close(self) -> None:
+        """
+        Flush and close the file.
+        """
+        self._file.close()
+
+    def _write(self, document: dict) -> None:
+        self._file.write(json.dumps(document, cls=RobotJSONEncoder))
+        self._file.write('\n')
+
+
+def read_initial_configuration(path: str) -> dict:
+    """
+    Read the initial configuration of a replay file written by ReplayWriter.
+    """
+    with open(path, encoding='utf-8') as file:
+        return json.loads(file.readline())
+
+
+def read_frames(path: str) -> Iterator[dict]:
+    """
+    Iterate over the frames of a replay file written by ReplayWriter, reading one at a time.
+    """
+    with open(path, encoding='utf-8') as file:
+        file.readline()  # Skip the initial configuration.
+        for line in file:
+            yield json.loads(line)
+
+
+def replay_to_json(path: str) -> str:
+    """
+    Convert a replay file written by ReplayWriter to the JSON document expected by the replay
+    viewer: {"initial_configuration": ..., "frames": [...]}.
+    The lines are already JSON documents, they are concatenated without being decoded.
+    """
+    result = io.StringIO()
+    with open(path, encoding='utf-8') as file:
+        result.write('{"initial_configuration": ')
+        result.write(file.readline().rstrip('\n'))
+        result.write(', "frames": [')
+        for index, line in enumerate(file):
+            if index:
+                result.write(', ')
+            result.write(line.rstrip('\n'))
+        result.write(']}')
+    return result.getvalue()
@@ -0,0 +1,98 @@
+"""
+Test for replay writer module.
+"""
+import json
+
+from highlevel.simulation.controller.replay_writer import (
+    ReplayWriter, read_frames, read_initial_configuration, replay_to_json)
+from highlevel.util.geometry.vector import Vector2
+
+INITIAL_CONFIGURATION = {'sizes': {'ROBOT_A': [10, 10]}}
+
+
+def _frame(time: int) -> dict:
+    return {
+        'time': time,
+        'robots': {
+            'ROBOT_A': {
+                'angle': time / 10,
+                'position': Vector2(time, 2 * time),
+            }
+        }
+    }
+
+
+def _json_frame(time: int) -> dict:
+    return json.loads(
+        json.dumps({
+            'time': time,
+            'robots': {
+                'ROBOT_A': {
+                    'angle': time / 10,
+                    'position': {
+                        'x': time,
+                        'y': 2 * time,
+                    },
+                }
+            }
+        }))
+
+
+def test_write_read(tmp_path):
+    """
+    The frames can be read back, one per line.
+    """
+    path = str(tmp_path / 'replay.ndjson')
+    writer = ReplayWriter(path, INITIAL_CONFIGURATION)
+    for time in range(3):
+        writer.write_frame(_frame(time))
+    writer.close()
+
+    assert writer.frame_count == 3
+    assert read_initial_configuration(path) == INITIAL_CONFIGURATION
+    assert list(read_frames(path)) == [_json_frame(time) for time in range(3)]
+    with open(path, encoding='utf-8') as file:
+        assert len(file.readlines()) == 4
+
+
+def test_flush(tmp_path):
+    """
+    The frames are periodically flushed to the file, before it is closed.
+    """
+    path = str(tmp_path / 'replay.ndjson')
+    writer = ReplayWriter(path, INITIAL_CONFIGURATION, flush_interval=2)
+    writer.write_frame(_frame(0))
+    writer.write_frame(_frame(1))
+    writer.write_frame(_frame(2))
+
+    assert list(read_frames(path)) == [_json_frame(0), _json_frame(1)]
+    writer.close()
+
+
+def test_replay_to_json(tmp_path):
+    """
+    The replay file converts to the document of the replay viewer.
+    """
+    path = str(tmp_path / 'replay.ndjson')
+    writer = ReplayWriter(path, INITIAL_CONFIGURATION)
+    for time in range(3):
+        writer.write_frame(_frame(time))
+    writer.close()
+
+    assert json.loads(replay_to_json(path)) == {
+        'initial_configuration': INITIAL_CONFIGURATION,
+        'frames': [_json_frame(time) for time in range(3)],
+    }
+
+
+def test_replay_to_json_without_frames(tmp_path):
+    """
+    A replay can have no frame at all.
+    """
+    path = str(tmp_path / 'replay.ndjson')
+    ReplayWriter(path, INITIAL_CONFIGURATION).close()
+
+    assert json.loads(replay_to_json(path)) == {
+        'initial_configuration': INITIAL_CONFIGURATION,
+        'frames': [],
+    }
@@ -2,31 +2,76 @@
 Simulation runner module.
 """
 import asyncio
+import math
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy
 
 from highlevel.logger import LOGGER
-from highlevel.simulation.controller.event_queue import EventQueue
+from highlevel.robot.entity.configuration import Configuration
+from highlevel.robot.entity.type import Radian
+from highlevel.simulation.controller.collision import CollisionDetector
+from highlevel.simulation.controller.event_queue import EventQueue, EventQueueSnapshot
+from highlevel.simulation.controller.lidar_raycaster import LidarRaycaster
+from highlevel.simulation.controller.pacer import TickPacer
 from highlevel.simulation.controller.probe import SimulationProbe
 from highlevel.simulation.controller.replay_saver import ReplaySaver
 from highlevel.simulation.entity.event import EventType, EventOrder
 from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
-from highlevel.simulation.entity.simulation_state import SimulationState, RobotID
+from highlevel.simulation.entity.cup import CupFlag
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.simulation.entity.simulation_state import RobotState, SimulationState
+from highlevel.simulation.entity.wheel_motion import SpeedWheelMotion
 from highlevel.simulation.gateway.simulation import SimulationGateway
+from highlevel.util.clock import ClockSnapshot, SimulationClock
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.profiler import TickProfiler
+
+
+@dataclass(frozen=True)
+class SimulatedRobot:
+    """
+    Components the simulation uses to talk to one of the robots it hosts.
+    """
+    event_queue: EventQueue
+    simulation_gateway: SimulationGateway
+    simulation_probe: SimulationProbe
+
+
+@dataclass(frozen=True)
+class RunnerSnapshot:
+    """
+    State of the simulation at a given tick, see SimulationRunner.snapshot.
+    """
+    tick: int
+    random_state: Any
+    simulation_state: SimulationState
+    event_queues: Dict[RobotID, EventQueueSnapshot]
+    clock: ClockSnapshot
 
 
 class SimulationRunner:
     """
     Run the simulation. Re-caculate the position of every object on the map at certain rate and 
     notify the robot by sending information to the sensors.
+
+    The simulation hosts the robot it is built with (ROBOT_A) and the ones added by add_robot.
+    Each robot has its own state, event queue and sensors, the robots see each other with their
+    LIDAR and their collisions are recorded in the simulation state.
     """
 
     # Constructor with multiple dependencies:
     # pylint: disable=too-many-arguments,too-many-instance-attributes
-    def __init__(self, event_queue: EventQueue,
-                 simulation_gateway: SimulationGateway,
-                 replay_saver: ReplaySaver,
-                 simulation_configuration: SimulationConfiguration,
-                 simulation_state: SimulationState,
-                 simulation_probe: SimulationProbe):
+    def __init__(
+        self, event_queue: EventQueue, simulation_gateway: SimulationGateway,
+        replay_saver: ReplaySaver, configuration: Configuration,
+        simulation_configuration: SimulationConfiguration,
+        simulation_state: SimulationState, simulation_probe: SimulationProbe,
+        lidar_raycaster: LidarRaycaster, collision_detector: CollisionDetector,
+        clock: SimulationClock, tick_profiler: TickProfiler):
 
         self.event_queue = event_queue
         self.simulation_gateway = simulation_gateway
@@ -34,49 +79,74 @@ class SimulationRunner:
         self.simulation_configuration = simulation_configuration
         self.state = simulation_state
         self.simulation_probe = simulation_probe
+        self.configuration = configuration
+        self.lidar_raycaster = lidar_raycaster
+        self.collision_detector = collision_detector
+        self.clock = clock
+        self.tick_profiler = tick_profiler
+        self.robots: Dict[RobotID, SimulatedRobot] = {
+            RobotID.RobotA:
+            SimulatedRobot(event_queue, simulation_gateway, simulation_probe)
+        }
 
         self.tick = 0
         self.running = True
+        self._random = random.Random(simulation_configuration.seed)
+        # Poses of the robots when the collisions were last detected.
+        self._collision_poses: Optional[numpy.ndarray] = None
+        # Encoder ticks last sent to each robot, they are only sent again once they changed.
+        self._sent_ticks: Dict[RobotID, Tuple[int, int]] = {}
+        # Pacing of the last run, see run.
+        self.pacer = self._create_pacer()
+
+        # Distance travelled by a wheel for each tick of its encoder, and matrix turning the
+        # distances travelled by the wheels (left, right) of a robot into the distance travelled by
+        # the robot and its rotation.
+        self._distance_per_tick = (2 * math.pi * configuration.wheel_radius /
+                                   configuration.encoder_ticks_per_revolution)
+        self._wheel_kinematics = numpy.array(
+            [[1 / 2, -1 / configuration.distance_between_wheels],
+             [1 / 2, 1 / configuration.distance_between_wheels]])
 
     async def run(self) -> None:
         """
-        Run the simulation.
+        Run the simulation, until it is stopped or the match is over.
         """
-        while self.running:
+        start_tick = self.tick
+        start_time = time.perf_counter()
+        self.pacer = self._create_pacer()
+        self.pacer.start()
+        profiler = self.tick_profiler
+
+        while self.running and not self._is_match_over():
             current_tick = self.tick
-            events = self.event_queue.pop()
-
-            # Process all the events.
-            for event in events:
-                await self._process_event(event)
-
-            # Send the encoder positions periodically.
-            interval = 1 / self.simulation_configuration.encoder_position_rate * 1000
-            if self.state.time - self.state.last_position_update > interval:
-                self.state.last_position_update = self.state.time
-                await self.simulation_gateway.encoder_position(
-                    self.state.left_tick, self.state.right_tick)
-
-            # Send the LIDAR positions periodically.
-            interval = 1 / self.simulation_configuration.lidar_position_rate * 1000
-            if self.state.time - self.state.last_lidar_update > interval:
-                self.state.last_lidar_update = self.state.time
-                await self.simulation_gateway.push_lidar_readings()
-
-            # Send the feedback to the subscribers.
-            if current_tick % (
-                    self.simulation_configuration.tickrate //
-                    self.simulation_configuration.simulation_notify_rate) == 0:
-                # Notify subscribers at 60 FPS.
-                self._notify_subscribers()
+            with profiler.phase('tick'):
+                with profiler.phase('events'):
+                    wheel_ticks = await self._process_events()
+                with profiler.phase('motion'):
+                    if wheel_ticks.any():
+                        self._move_robots(wheel_ticks)
+                    self._detect_collisions()
+                await self._send_encoder_positions()
+                await self._send_lidar_readings()
+                self._send_feedback(current_tick)
 
             self.tick = current_tick + 1
             self.state.time = int(
                 self.tick / self.simulation_configuration.tickrate * 1000)
-            await asyncio.sleep(1 / self.simulation_configuration.tickrate /
-                                self.simulation_configuration.speed_factor)
+            woken_up = self.clock.advance(self.state.time / 1000)
+            await self._wait_next_tick(woken_up)
 
-        LOGGER.get().info("simulation_runner_quit", time=self.state.time)
+        duration = time.perf_counter() - start_time
+        ticks = self.tick - start_tick
+        LOGGER.get().info("simulation_runner_quit",
+                          time=self.state.time,
+                          ticks=ticks,
+                          ticks_per_second=ticks / duration if duration else 0,
+                          pacing=asdict(self.pacer.metrics))
+        if profiler.enabled:
+            LOGGER.get().info("simulation_tick_profile",
+                              phases=profiler.summary())
 
     def stop(self):
         """
@@ -84,30 +154,301 @@ class SimulationRunner:
         """
         self.running = False
 
-    async def _process_event(self, event: EventOrder) -> None:
+    def snapshot(self) -> RunnerSnapshot:
+        """
+        Capture the state of the simulation: the current tick, the simulation state, the pending
+        events, the time of the simulation clock and the state of the random generator.
+        """
+        return RunnerSnapshot(
+            tick=self.tick,
+            random_state=self._random.getstate(),
+            simulation_state=self.state.clone(),
+            event_queues={
+                robot_id: robot.event_queue.snapshot()
+                for robot_id, robot in self.robots.items()
+            },
+            clock=self.clock.snapshot(),
+        )
+
+    def restore(self, snapshot: RunnerSnapshot) -> None:
+        """
+        Go back to a state captured by snapshot. The same snapshot can be restored many times.
+        """
+        self.tick = snapshot.tick
+        self._random.setstate(snapshot.random_state)
+        self.state.restore(snapshot.simulation_state)
+        for robot_id, robot in self.robots.items():
+            robot.event_queue.restore(snapshot.event_queues[robot_id])
+        self.clock.restore(snapshot.clock)
+        self._sent_ticks.clear()
+
+    def add_robot(self, robot_id: RobotID, robot: SimulatedRobot,
+                  position: Vector2, angle: Radian) -> None:
+        """
+        Host another robot in the simulation, at the given pose.
+        """
+        if robot_id in self.robots:
+            raise ValueError(f"{robot_id} is already simulated")
+
+        self.robots[robot_id] = robot
+        self.state.robots[robot_id] = RobotState(position=position,
+                                                 angle=angle)
+
+    async def _process_events(self) -> numpy.ndarray:
+        """
+        Process the events of every robot for the current tick and advance their wheel motions.
+        Return the ticks the wheels of each robot turn by during this tick, one row per robot.
+        """
+        wheel_ticks = numpy.zeros((len(self.state.robots), 2),
+                                  dtype=numpy.int64)
+        for robot_id, robot in self.robots.items():
+            for event in robot.event_queue.pop():
+                await self._process_event(robot_id, event, wheel_ticks)
+            self._advance_wheel_motions(robot_id, wheel_ticks)
+        return wheel_ticks
+
+    async def _send_encoder_positions(self) -> None:
+        """
+        Send the encoder positions periodically, to the robots whose wheels turned.
+        """
+        interval = 1 / self.simulation_configuration.encoder_position_rate * 1000
+        if self.state.time - self.state.last_position_update <= interval:
+            return
+
+        with self.tick_profiler.phase('encoder'):
+            self.state.last_position_update = self.state.time
+            for robot_id, robot in self.robots.items():
+                robot_state = self.state.robots[robot_id]
+                ticks = (robot_state.left_tick, robot_state.right_tick)
+                if self._sent_ticks.get(robot_id) == ticks:
+                    continue
+                self._sent_ticks[robot_id] = ticks
+                await robot.simulation_gateway.encoder_position(*ticks)
+
+    async def _send_lidar_readings(self) -> None:
+        """
+        Send the LIDAR positions periodically.
+        """
+        interval = 1 / self.simulation_configuration.lidar_position_rate * 1000
+        if self.state.time - self.state.last_lidar_update <= interval:
+            return
+
+        with self.tick_profiler.phase('lidar'):
+            self.state.last_lidar_update = self.state.time
+            await self._push_lidar_readings()
+
+    def _send_feedback(self, current_tick: int) -> None:
+        """
+        Notify the subscribers at simulation_notify_rate, unless the simulation has to catch up.
+        """
+        if current_tick % (
+                self.simulation_configuration.tickrate //
+                self.simulation_configuration.simulation_notify_rate):
+            return
+
+        # Headless without a replay, no one would see the frames.
+        if not self.pacer.period and self.simulation_configuration.replay_path is None:
+            return
+
+        if self.pacer.is_late():
+            self.pacer.skip_frame()
+            return
+
+        with self.tick_profiler.phase('notify'):
+            self._notify_subscribers()
+
+    def _is_match_over(self) -> bool:
+        """
+        Check if the simulation reached the end of the match.
+        """
+        match_duration = self.simulation_configuration.match_duration
+        return match_duration is not None and self.state.time >= match_duration
+
+    def _create_pacer(self) -> TickPacer:
+        return TickPacer(self.simulation_configuration.tickrate,
+                         self.simulation_configuration.speed_factor,
+                         self.simulation_configuration.max_pacing_lag)
+
+    async def _wait_next_tick(self, woken_up: int) -> None:
+        """
+        Wait until the next tick should be simulated.
+        """
+        await self.pacer.wait_next_tick()
+
+        # Headless mode: a robot only has something to do once the simulation ran out of events
+        # for it (i.e. its movement is done) or once one of its sleeps on the simulation clock is
+        # over, only give the hand at that moment. Also yield once per simulated second so that
+        # the other coroutines are not starved.
+        if not self.pacer.period and (
+                woken_up or self._has_idle_robot()
+                or self.tick % self.simulation_configuration.tickrate == 0):
+            await asyncio.sleep(0)
+
+    def _has_idle_robot(self) -> bool:
         """
-        Process an event.
+        Check if one of the robots has no event nor wheel motion in progress.
         """
+        return any(not robot.event_queue
+                   and not self.state.robots[robot_id].wheel_motions
+                   for robot_id, robot in self.robots.items())
+
+    async def _process_event(self, robot_id: RobotID, event: EventOrder,
+                             wheel_ticks: numpy.ndarray) -> None:
+        """
+        Process an event of a robot, the wheel movements are added to the robot's row of
+        `wheel_ticks`.
+        """
+        robot_state = self.state.robots[robot_id]
 
         if event.type == EventType.MOVE_WHEEL:
-            self.state.left_tick += event.payload['left']
-            self.state.right_tick += event.payload['right']
+            wheel_ticks[self.state.robots.index(robot_id)] += (
+                event.payload['left'], event.payload['right'])
+
+        elif event.type == EventType.WHEEL_MOTION:
+            if isinstance(event.payload, SpeedWheelMotion):
+                # The new speeds replace the previous ones.
+                robot_state.wheel_motions = [
+                    motion for motion in robot_state.wheel_motions
+                    if not isinstance(motion, SpeedWheelMotion)
+                ]
+            robot_state.wheel_motions.append(event.payload)
 
         elif event.type == EventType.MOVEMENT_DONE:
-            await self.simulation_gateway.movement_done()
+            await self.robots[robot_id].simulation_gateway.movement_done()
 
         else:
             raise RuntimeError(f"cannot handle event {event}")
 
+    def _advance_wheel_motions(self, robot_id: RobotID,
+                               wheel_ticks: numpy.ndarray) -> None:
+        """
+        Add the ticks of the wheel motions of a robot in progress for the current tick to the
+        robot's row of `wheel_ticks`.
+        """
+        robot_state = self.state.robots[robot_id]
+        wheel_motions = robot_state.wheel_motions
+        if not wheel_motions:
+            return
+
+        row = wheel_ticks[self.state.robots.index(robot_id)]
+        for motion in wheel_motions:
+            left_before, right_before = motion.ticks_at(self.tick - 1)
+            left_after, right_after = motion.ticks_at(self.tick)
+            row += (left_after - left_before, right_after - right_before)
+
+        robot_state.wheel_motions = [
+            motion for motion in wheel_motions if motion.end_tick > self.tick
+        ]
+
+    def _move_robots(self, wheel_ticks: numpy.ndarray) -> None:
+        """
+        Rotate the wheels of every robot by the given number of ticks (one row per robot) and move
+        the robots accordingly, then push the cups in the way.
+        """
+        robots = self.state.robots
+        robots.ticks += wheel_ticks
+        distances = wheel_ticks * self._distance_per_tick
+
+        # The wheels do not move exactly by the number of ticks counted by the encoders.
+        encoder_noise = self.simulation_configuration.encoder_noise
+        if encoder_noise:
+            for index in numpy.flatnonzero(wheel_ticks.any(axis=1)):
+                distances[index] *= (1 + self._random.gauss(0, encoder_noise),
+                                     1 + self._random.gauss(0, encoder_noise))
+
+        # Midpoint approximation: the robot moves along its mean heading during the tick. This is
+        # exact when it moves straight or rotates in place, and close enough for the short arcs of
+        # a single tick otherwise.
+        distance, delta_angle = (distances @ self._wheel_kinematics).T
+        heading = robots.poses[:, 2] + delta_angle / 2
+        displacement = numpy.stack((numpy.cos(heading), numpy.sin(heading)),
+                                   axis=1) * distance[:, None]
+        robots.poses[:, :2] += displacement
+        robots.poses[:, 2] += delta_angle
+
+        if len(self.state.cups):
+            self._push_cups(displacement)
+
+    def _push_cups(self, displacement: numpy.ndarray) -> None:
+        """
+        Move the cups touching the footprint of a robot along with it, `displacement` holds the
+        movement of each robot during this tick.
+        """
+        cups = self.state.cups
+        poses = self.state.robots.poses
+
+        # Position of each cup in the frame of each robot, one row per cup and one column per
+        # robot.
+        offset_x = cups.positions[:, 0, None] - poses[None, :, 0]
+        offset_y = cups.positions[:, 1, None] - poses[None, :, 1]
+        cos, sin = numpy.cos(poses[:, 2]), numpy.sin(poses[:, 2])
+        along = offset_x * cos + offset_y * sin
+        across = offset_y * cos - offset_x * sin
+
+        radius = self.simulation_configuration.cup_radius
+        pushed = (
+            (numpy.abs(along) <= self.configuration.robot_length / 2 + radius)
+            &
+            (numpy.abs(across) <= self.configuration.robot_width / 2 + radius)
+            & displacement.any(axis=1))
+        cups.positions += pushed @ displacement
+        cups.flags[pushed.any(axis=1)] |= numpy.uint8(CupFlag.PUSHED)
+
+    def _detect_collisions(self) -> None:
+        """
+        Record the contacts of the robots, log the ones that just started. The contacts only
+        change when a robot moves.
+        """
+        poses = self.state.robots.poses
+        if self._collision_poses is not None and numpy.array_equal(
+                poses, self._collision_poses):
+            return
+        self._collision_poses = poses.copy()
+
+        collisions = self.collision_detector.detect(self.state.robots)
+        for collision in collisions - self.state.collisions:
+            LOGGER.get().warning('simulation_collision',
+                                 time=self.state.time,
+                                 robot=collision.robot,
+                                 other=collision.other or 'obstacle')
+        self.state.collisions = collisions
+
+    async def _push_lidar_readings(self) -> None:
+        """
+        Simulate a LIDAR scan for every robot reading its LIDAR, the other robots are obstacles.
+        """
+        scanning_robots = {
+            robot_id: robot
+            for robot_id, robot in self.robots.items()
+            if robot.simulation_gateway.reads_lidar()
+        }
+        if not scanning_robots:
+            return
+
+        footprints = {
+            robot_id: self.collision_detector.footprint(robot_state)
+            for robot_id, robot_state in self.state.robots.items()
+        }
+        for robot_id, robot in scanning_robots.items():
+            robot_state = self.state.robots[robot_id]
+            other_robots = [
+                side for other_id, footprint in footprints.items()
+                if other_id != robot_id for side in footprint
+            ]
+            readings = self.lidar_raycaster.scan(robot_state.position,
+                                                 robot_state.angle,
+                                                 other_robots)
+            await robot.simulation_gateway.push_lidar_readings(readings)
+
     def _notify_subscribers(self) -> None:
         """
         Notify the subscribers of state change.
         """
 
-        state = self.simulation_probe.probe()
         self.replay_saver.on_tick({
             'time': self.state.time,
             'robots': {
-                RobotID.RobotA: state
+                robot_id: robot.simulation_probe.probe()
+                for robot_id, robot in self.robots.items()
             },
         })
@@ -0,0 +1,206 @@
+"""
+Benchmarks for the simulation runner: simulating a whole match in headless mode.
+
+Run them with `make benchmark`.
+"""
+import asyncio
+import math
+import time
+
+import attr
+import pytest
+
+from proto.gen.python.outech_pb2 import BusMessage
+from highlevel.container import CONFIG, SIMULATION_CONFIG
+from highlevel.robot.adapter.lidar.simulated import SimulatedLIDARAdapter
+from highlevel.robot.adapter.socket.socket_adapter import LoopbackSocketAdapter
+from highlevel.robot.gateway.motion.motion import MotionGateway
+from highlevel.simulation.controller.collision import CollisionDetector
+from highlevel.simulation.controller.event_queue import EventQueue
+from highlevel.simulation.controller.lidar_raycaster import LidarRaycaster
+from highlevel.simulation.controller.probe import SimulationProbe
+from highlevel.simulation.controller.runner import SimulatedRobot, SimulationRunner
+from highlevel.simulation.entity.motion_limit import MotionLimit
+from highlevel.simulation.entity.cup import Cup
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.simulation.entity.simulation_state import (CupArray, RobotState,
+                                                          SimulationState)
+from highlevel.simulation.gateway.simulation import SimulationGateway
+from highlevel.simulation.handler.simulation import SimulationHandler
+from highlevel.util.clock import SimulationClock
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.profiler import TickProfiler
+
+
+async def _run_robot(robot_id, robot, state, simulation_configuration):
+    """
+    Robot going back and forth, forever.
+    """
+    movement_done = asyncio.Event()
+
+    async def robot_handler(data: bytes) -> None:
+        bus_message = BusMessage()
+        bus_message.ParseFromString(data)
+        if bus_message.WhichOneof('message_content') == 'movementEnded':
+            movement_done.set()
+
+    motor_board_adapter = robot.simulation_gateway.motor_board_adapter
+    motor_board_adapter.register_handler(robot_handler)
+    simulation_handler = SimulationHandler(
+        configuration=CONFIG,
+        event_queue=robot.event_queue,
+        simulation_state=state,
+        simulation_configuration=simulation_configuration,
+        robot_id=robot_id)
+    motor_board_adapter.register_handler(
+        simulation_handler.handle_movement_order)
+
+    motion_gateway = MotionGateway(motor_board_adapter=motor_board_adapter)
+    ticks = CONFIG.encoder_ticks_per_revolution
+    while True:
+        movement_done.clear()
+        await motion_gateway.translate(ticks)
+        await movement_done.wait()
+        ticks = -ticks
+
+
+async def _run_match(replay_saver,
+                     simulation_configuration=SIMULATION_CONFIG,
+                     robot_count=1):
+    """
+    Run a whole match, the robots going back and forth on parallel lines until the end.
+    """
+    robots = {
+        robot_id:
+        SimulatedRobot(event_queue=EventQueue(),
+                       simulation_gateway=SimulationGateway(
+                           simulation_configuration=simulation_configuration,
+                           motor_board_adapter=LoopbackSocketAdapter(),
+                           lidar_adapter=SimulatedLIDARAdapter()),
+                       simulation_probe=SimulationProbe())
+        for robot_id in list(RobotID)[:robot_count]
+    }
+    main_robot = robots[RobotID.RobotA]
+    state = SimulationState(time=0,
+                            last_position_update=0,
+                            cups=CupArray(simulation_configuration.cups))
+    runner = SimulationRunner(
+        event_queue=main_robot.event_queue,
+        simulation_gateway=main_robot.simulation_gateway,
+        replay_saver=replay_saver,
+        configuration=CONFIG,
+        simulation_configuration=simulation_configuration,
+        simulation_state=state,
+        simulation_probe=main_robot.simulation_probe,
+        lidar_raycaster=LidarRaycaster(simulation_configuration),
+        collision_detector=CollisionDetector(CONFIG, simulation_configuration),
+        clock=SimulationClock(),
+        tick_profiler=TickProfiler())
+
+    tasks = []
+    for index, (robot_id, robot) in enumerate(robots.items()):
+        position = Vector2(CONFIG.initial_position.x, 300 + 450 * index)
+        if robot_id == RobotID.RobotA:
+            state.robots[robot_id] = RobotState(position=position,
+                                                angle=CONFIG.initial_angle)
+        else:
+            runner.add_robot(robot_id, robot, position, CONFIG.initial_angle)
+        tasks.append(
+            asyncio.create_task(
+                _run_robot(robot_id, robot, state, simulation_configuration)))
+
+    await runner.run()
+    for task in tasks:
+        task.cancel()
+    return runner
+
+
+# Wall time budget of a headless match without a replay, for one and four robots, in seconds.
+# It measures about 0.9s and 2.4s, with some margin for slower machines.
+HEADLESS_MATCH_BUDGET = {1: 1.5, 4: 4}
+
+
+@pytest.mark.parametrize('robot_count', sorted(HEADLESS_MATCH_BUDGET))
+def test_headless_match_budget(robot_count, replay_saver_mock):
+    """
+    A whole match simulated as fast as possible, without a replay, fits in its time budget.
+    """
+    simulation_configuration = attr.evolve(SIMULATION_CONFIG, replay_path=None)
+
+    start_time = time.perf_counter()
+    runner = asyncio.run(
+        _run_match(replay_saver_mock, simulation_configuration, robot_count))
+    duration = time.perf_counter() - start_time
+
+    assert runner.state.time == SIMULATION_CONFIG.match_duration
+    assert duration < HEADLESS_MATCH_BUDGET[robot_count]
+
+
+def test_benchmark_headless_match(benchmark, replay_saver_mock):
+    """
+    Benchmark a whole match simulated as fast as possible.
+    """
+    assert math.isinf(SIMULATION_CONFIG.speed_factor)
+
+    runner = benchmark.pedantic(
+        lambda: asyncio.run(_run_match(replay_saver_mock)),
+        rounds=3,
+    )
+
+    assert runner.state.time == SIMULATION_CONFIG.match_duration
+
+
+def test_benchmark_headless_match_with_motion_limit(benchmark,
+                                                    replay_saver_mock):
+    """
+    Benchmark a whole match simulated as fast as possible, the wheels accelerating and
+    decelerating at every movement.
+    """
+    simulation_configuration = attr.evolve(SIMULATION_CONFIG,
+                                           motion_limit=MotionLimit(
+                                               wheel_speed=1000,
+                                               wheel_acceleration=2000))
+
+    runner = benchmark.pedantic(
+        lambda: asyncio.run(
+            _run_match(replay_saver_mock, simulation_configuration)),
+        rounds=3,
+    )
+
+    assert runner.state.time == SIMULATION_CONFIG.match_duration
+
+
+def test_benchmark_headless_match_four_robots(benchmark, replay_saver_mock):
+    """
+    Benchmark a whole match simulated as fast as possible, with four robots.
+    """
+    runner = benchmark.pedantic(
+        lambda: asyncio.run(_run_match(replay_saver_mock, robot_count=4)),
+        rounds=3,
+    )
+
+    assert runner.state.time == SIMULATION_CONFIG.match_duration
+    assert len(runner.state.robots) == 4
+    assert not runner.state.collisions
+
+
+def test_benchmark_headless_match_with_cups(benchmark, replay_saver_mock):
+    """
+    Benchmark a whole match simulated as fast as possible, with two dozen cups on the field. Some
+    of them are in the way of the robot.
+    """
+    simulation_configuration = attr.evolve(
+        SIMULATION_CONFIG,
+        cups=[
+            Cup(position=Vector2(300 + 200 * column, 300 + 200 * row))
+            for row in range(3) for column in range(8)
+        ])
+
+    runner = benchmark.pedantic(
+        lambda: asyncio.run(
+            _run_match(replay_saver_mock, simulation_configuration)),
+        rounds=3,
+    )
+
+    assert runner.state.time == SIMULATION_CONFIG.match_duration
+    assert len(runner.state.cups) == 24
@@ -2,13 +2,27 @@
 Test for simulation runner.
 """
 import asyncio
+import math
+import time
+from unittest.mock import MagicMock
 
+import attr
 import pytest
 from pytest import fixture
 
+from highlevel.simulation.controller.collision import CollisionDetector
 from highlevel.simulation.controller.event_queue import EventQueue
-from highlevel.simulation.controller.runner import SimulationRunner
+from highlevel.simulation.controller.lidar_raycaster import LidarRaycaster
+from highlevel.simulation.controller.runner import SimulatedRobot, SimulationRunner
 from highlevel.simulation.entity.event import EventOrder, EventType
+from highlevel.simulation.entity.cup import Cup, CupFlag
+from highlevel.simulation.entity.robot_id import Collision, RobotID
+from highlevel.simulation.entity.simulation_state import CupArray
+from highlevel.simulation.entity.wheel_motion import WheelMotion, SpeedRamp, SpeedWheelMotion
+from highlevel.simulation.gateway.simulation import SimulationGateway
+from highlevel.util.clock import SimulationClock
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.profiler import TickProfiler
 
 
 @fixture(name='event_queue')
@@ -23,7 +37,8 @@ def event_queue_setup():
 @fixture(name='simulation_runner')
 def simulation_runner_factory(event_queue, simulation_gateway_mock,
                               simulation_configuration_test, replay_saver_mock,
-                              simulation_state_mock, simulation_probe_mock):
+                              simulation_state_mock, simulation_probe_mock,
+                              configuration_test):
     """
     Simulation runner.
     """
@@ -34,6 +49,12 @@ def simulation_runner_factory(event_queue, simulation_gateway_mock,
         replay_saver=replay_saver_mock,
         simulation_state=simulation_state_mock,
         simulation_probe=simulation_probe_mock,
+        configuration=configuration_test,
+        lidar_raycaster=LidarRaycaster(simulation_configuration_test),
+        collision_detector=CollisionDetector(configuration_test,
+                                             simulation_configuration_test),
+        clock=SimulationClock(),
+        tick_profiler=TickProfiler(),
     )
 
 
@@ -59,8 +80,8 @@ async def test_run_move_wheel(simulation_runner, event_queue):
     await asyncio.sleep(0.05)
     task.cancel()
 
-    assert simulation_runner.state.right_tick == 20
-    assert simulation_runner.state.left_tick == 0
+    assert simulation_runner.state.robots[RobotID.RobotA].right_tick == 20
+    assert simulation_runner.state.robots[RobotID.RobotA].left_tick == 0
 
 
 @pytest.mark.asyncio
@@ -104,3 +125,547 @@ async def test_stop(simulation_runner):
     simulation_runner.stop()
     await asyncio.sleep(0.05)
     assert task.done() is True
+
+
+@pytest.mark.asyncio
+async def test_run_move_wheel_moves_robot(simulation_runner, event_queue):
+    """
+    Moving the wheels moves the simulated robot.
+    """
+    # Wheel radius is 1 and there is 1 tick per revolution: 1 tick is 2 * pi mm.
+    event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                            payload={
+                                                'left': 1,
+                                                'right': 1,
+                                            }),
+                     tick_offset=0)
+    # Distance between wheels is 1: rotate by 4 * pi.
+    event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                            payload={
+                                                'left': -1,
+                                                'right': 1,
+                                            }),
+                     tick_offset=1)
+
+    task = asyncio.create_task(simulation_runner.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert simulation_runner.state.robots[RobotID.RobotA].position == Vector2(
+        2 * math.pi, 0)
+    assert simulation_runner.state.robots[RobotID.RobotA].angle == 4 * math.pi
+
+
+@pytest.mark.asyncio
+async def test_run_push_lidar_readings(simulation_runner,
+                                       simulation_gateway_mock):
+    """
+    The LIDAR readings are cast from the simulated robot's position and pushed to the robot.
+    """
+    simulation_runner.state.robots[RobotID.RobotA].position = Vector2(50, 40)
+
+    task = asyncio.create_task(simulation_runner.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    simulation_gateway_mock.push_lidar_readings.assert_called()
+    readings = simulation_gateway_mock.push_lidar_readings.call_args[0][0]
+    assert len(readings) == 360
+    assert readings[0] == (0, 50)
+
+
+@pytest.mark.asyncio
+async def test_run_headless_stops_at_match_duration(
+    simulation_runner, simulation_configuration_test):
+    """
+    In headless mode, the whole match is simulated without waiting.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=10_000)
+
+    await asyncio.wait_for(simulation_runner.run(), timeout=1)
+
+    assert simulation_runner.state.time == 10_000
+    assert simulation_runner.tick == 2000
+
+
+@pytest.mark.asyncio
+async def test_run_profile_ticks(simulation_runner,
+                                 simulation_configuration_test):
+    """
+    When the profiler is enabled, the duration of each phase of the ticks is recorded.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=1000,
+        replay_path='replay.rpl')
+    simulation_runner.tick_profiler = TickProfiler(enabled=True, capacity=50)
+
+    await simulation_runner.run()
+
+    summary = simulation_runner.tick_profiler.summary()
+    assert set(summary) == {
+        'events', 'motion', 'encoder', 'lidar', 'notify', 'tick'
+    }
+    assert summary['tick']['count'] == 200
+    assert summary['notify']['count'] == 67
+    assert summary['tick']['p50'] <= summary['tick']['max']
+
+
+@pytest.mark.asyncio
+async def test_run_profiler_disabled(simulation_runner,
+                                     simulation_configuration_test):
+    """
+    When the profiler is disabled, nothing is recorded.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=1000)
+
+    await simulation_runner.run()
+
+    assert not simulation_runner.tick_profiler.phases
+
+
+@pytest.mark.asyncio
+async def test_run_headless_without_replay(simulation_runner,
+                                           simulation_configuration_test,
+                                           simulation_probe_mock,
+                                           simulation_gateway_mock):
+    """
+    Headless without a replay, the frames are not built, the LIDAR is only simulated for the
+    robots reading it and the encoder positions are only sent when they change.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=1000)
+    simulation_gateway_mock.reads_lidar.return_value = False
+
+    await simulation_runner.run()
+
+    simulation_probe_mock.probe.assert_not_called()
+    simulation_runner.replay_saver.on_tick.assert_not_called()
+    simulation_gateway_mock.push_lidar_readings.assert_not_called()
+    simulation_gateway_mock.encoder_position.assert_called_once_with(0, 0)
+
+
+@pytest.mark.asyncio
+async def test_run_skips_frames_when_late(simulation_runner,
+                                         simulation_configuration_test,
+                                         simulation_probe_mock):
+    """
+    When notifying the subscribers takes longer than a tick, the simulation catches up by skipping
+    notification frames, and the pacing metrics report the lag.
+    """
+    # Ticks of 5 ms, a frame every 3 ticks taking 20 ms to probe.
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test, speed_factor=1, match_duration=300)
+    simulation_probe_mock.probe.side_effect = lambda: time.sleep(0.02)
+
+    await simulation_runner.run()
+
+    metrics = simulation_runner.pacer.metrics
+    assert metrics.ticks == 60
+    assert metrics.skipped_frames > 0
+    assert simulation_probe_mock.probe.call_count + metrics.skipped_frames == 20
+    assert metrics.late_ticks > 0
+    assert metrics.max_jitter > 0.005
+    assert metrics.resyncs == 0
+
+
+@pytest.mark.asyncio
+async def test_run_headless_yields_when_out_of_events(
+    simulation_runner, simulation_configuration_test, event_queue):
+    """
+    In headless mode, the robot only gets the hand once the simulation ran out of events.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=500)
+    for tick_offset in range(50):
+        event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                                payload={
+                                                    'left': 1,
+                                                    'right': 1,
+                                                }),
+                         tick_offset=tick_offset)
+
+    pending_events = []
+
+    async def robot():
+        while True:
+            pending_events.append(len(event_queue))
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(robot())
+    await simulation_runner.run()
+    task.cancel()
+
+    assert simulation_runner.state.robots[RobotID.RobotA].right_tick == 50
+    assert pending_events
+    assert set(pending_events) == {0}
+
+
+@pytest.mark.asyncio
+async def test_run_move_wheel_with_encoder_noise(simulation_runner,
+                                                 simulation_configuration_test,
+                                                 event_queue):
+    """
+    With encoder noise, the robot does not move exactly by the number of ticks counted by the
+    encoders.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test, encoder_noise=0.1)
+    event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                            payload={
+                                                'left': 1,
+                                                'right': 1,
+                                            }),
+                     tick_offset=0)
+
+    task = asyncio.create_task(simulation_runner.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert simulation_runner.state.robots[RobotID.RobotA].left_tick == 1
+    assert simulation_runner.state.robots[RobotID.RobotA].right_tick == 1
+    assert simulation_runner.state.robots[RobotID.RobotA].position != Vector2(
+        2 * math.pi, 0)
+
+
+@pytest.mark.asyncio
+async def test_run_wheel_motion(simulation_runner,
+                                simulation_configuration_test, event_queue):
+    """
+    The wheels move at every tick of a wheel motion, the same way as with one event per tick.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=1000,
+        replay_path='replay.rpl')
+    event_queue.push(event_order=EventOrder(type=EventType.WHEEL_MOTION,
+                                            payload=WheelMotion(start_tick=0,
+                                                                duration=5,
+                                                                left_tick=-3,
+                                                                right_tick=3)),
+                     tick_offset=0)
+
+    right_ticks = []
+
+    def on_tick(_):
+        right_ticks.append(
+            simulation_runner.state.robots[RobotID.RobotA].right_tick)
+
+    simulation_runner.replay_saver.on_tick.side_effect = on_tick
+    await asyncio.wait_for(simulation_runner.run(), timeout=1)
+
+    # Notified every 3 ticks (tickrate is 200, notify rate 60): after the ticks 0, 3 and 6.
+    assert right_ticks[:3] == [1, 3, 3]
+    assert simulation_runner.state.robots[RobotID.RobotA].left_tick == -3
+    assert simulation_runner.state.robots[RobotID.RobotA].right_tick == 3
+    assert simulation_runner.state.robots[
+        RobotID.RobotA].angle == 6 * 2 * math.pi
+    assert not simulation_runner.state.robots[RobotID.RobotA].wheel_motions
+
+
+@pytest.mark.asyncio
+async def test_run_speed_wheel_motion(simulation_runner,
+                                      simulation_configuration_test,
+                                      event_queue):
+    """
+    In speed mode, the wheels keep moving until the next speed order, which replaces the previous
+    one.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=1000)
+    event_queue.push(event_order=EventOrder(type=EventType.WHEEL_MOTION,
+                                            payload=SpeedWheelMotion(
+                                                start_tick=0,
+                                                tickrate=200,
+                                                left=SpeedRamp(0, 200),
+                                                right=SpeedRamp(0, 200))),
+                     tick_offset=0)
+    event_queue.push(event_order=EventOrder(type=EventType.WHEEL_MOTION,
+                                            payload=SpeedWheelMotion(
+                                                start_tick=100,
+                                                tickrate=200,
+                                                left=SpeedRamp(200, 0),
+                                                right=SpeedRamp(200, 400))),
+                     tick_offset=100)
+
+    await asyncio.wait_for(simulation_runner.run(), timeout=1)
+
+    # 1 tick per simulation tick for 100 ticks, then the left wheel stops and the right wheel
+    # moves 2 ticks per simulation tick for the 100 remaining ticks.
+    assert simulation_runner.state.robots[RobotID.RobotA].left_tick == 100
+    assert simulation_runner.state.robots[RobotID.RobotA].right_tick == 300
+    assert len(
+        simulation_runner.state.robots[RobotID.RobotA].wheel_motions) == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_restore(simulation_runner,
+                                simulation_configuration_test, event_queue):
+    """
+    Restoring a snapshot and simulating again gives the same result, random noise included.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        encoder_noise=0.1,
+        match_duration=100)
+    for tick_offset in range(40):
+        event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                                payload={
+                                                    'left': 1,
+                                                    'right': 2,
+                                                }),
+                         tick_offset=tick_offset)
+    await simulation_runner.run()
+    snapshot = simulation_runner.snapshot()
+
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_runner.simulation_configuration, match_duration=200)
+    await simulation_runner.run()
+    first_run = simulation_runner.state.clone()
+
+    simulation_runner.restore(snapshot)
+    assert simulation_runner.state.time == 100
+    assert simulation_runner.clock.time() == 0.1
+    assert simulation_runner.tick == 20
+    assert len(event_queue) == 20
+
+    await simulation_runner.run()
+    assert simulation_runner.state == first_run
+    assert simulation_runner.state.robots[RobotID.RobotA].right_tick == 80
+
+
+@pytest.mark.asyncio
+async def test_run_clock_lockstep(simulation_runner,
+                                  simulation_configuration_test):
+    """
+    The coroutines sleeping on the simulation clock wake up at the simulated time they asked for,
+    even in headless mode.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=1000)
+    wake_up_times = []
+
+    async def robot():
+        while True:
+            await simulation_runner.clock.sleep(0.1)
+            wake_up_times.append(simulation_runner.state.time)
+
+    task = asyncio.create_task(robot())
+    await asyncio.sleep(0)
+    await simulation_runner.run()
+    task.cancel()
+
+    assert wake_up_times == list(range(100, 1001, 100))
+
+
+def _simulation_gateway_mock():
+    """
+    Simulation gateway of another robot.
+    """
+    future = asyncio.Future()
+    future.set_result(None)
+    simulation_gateway = MagicMock(spec=SimulationGateway)
+    simulation_gateway.encoder_position = MagicMock(return_value=future)
+    simulation_gateway.push_lidar_readings = MagicMock(return_value=future)
+    simulation_gateway.movement_done = MagicMock(return_value=future)
+    return simulation_gateway
+
+
+def _simulated_robot(simulation_gateway, simulation_probe=None):
+    return SimulatedRobot(event_queue=EventQueue(),
+                          simulation_gateway=simulation_gateway,
+                          simulation_probe=simulation_probe or MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_run_several_robots(simulation_runner,
+                                  simulation_configuration_test, event_queue,
+                                  simulation_probe_mock,
+                                  simulation_gateway_mock):
+    """
+    Every robot has its own events, state and sensors.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=100,
+        replay_path='replay.rpl')
+    robot_b_gateway = _simulation_gateway_mock()
+    robot_b_probe = MagicMock()
+    robot_b_probe.probe.return_value = {'angle': math.pi}
+    robot_b = _simulated_robot(robot_b_gateway, robot_b_probe)
+    simulation_runner.add_robot(RobotID.RobotB, robot_b, Vector2(70, 50),
+                                math.pi)
+    event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                            payload={
+                                                'left': 1,
+                                                'right': 1,
+                                            }),
+                     tick_offset=0)
+    robot_b.event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                                    payload={
+                                                        'left': 2,
+                                                        'right': 2,
+                                                    }),
+                             tick_offset=0)
+    robot_b.event_queue.push(
+        event_order=EventOrder(type=EventType.MOVEMENT_DONE), tick_offset=1)
+    simulation_probe_mock.probe.return_value = {'angle': 0}
+
+    await simulation_runner.run()
+
+    robot_a_state = simulation_runner.state.robots[RobotID.RobotA]
+    robot_b_state = simulation_runner.state.robots[RobotID.RobotB]
+    assert (robot_a_state.left_tick, robot_a_state.right_tick) == (1, 1)
+    assert (robot_b_state.left_tick, robot_b_state.right_tick) == (2, 2)
+    assert robot_b_state.position == Vector2(70 - 4 * math.pi, 50)
+
+    robot_b_gateway.movement_done.assert_called_once()
+    simulation_gateway_mock.movement_done.assert_not_called()
+    robot_b_gateway.encoder_position.assert_called_with(2, 2)
+    frame = simulation_runner.replay_saver.on_tick.call_args[0][0]
+    assert frame['robots'] == {
+        RobotID.RobotA: {
+            'angle': 0
+        },
+        RobotID.RobotB: {
+            'angle': math.pi
+        },
+    }
+
+    with pytest.raises(ValueError):
+        simulation_runner.add_robot(
+            RobotID.RobotB, _simulated_robot(_simulation_gateway_mock()),
+            Vector2(0, 0), 0)
+
+
+@pytest.mark.asyncio
+async def test_run_robots_see_each_other(simulation_runner,
+                                         simulation_gateway_mock):
+    """
+    The LIDAR of a robot hits the other robots.
+    """
+    simulation_runner.state.robots[RobotID.RobotA].position = Vector2(30, 50)
+    robot_b_gateway = _simulation_gateway_mock()
+    simulation_runner.add_robot(RobotID.RobotB,
+                                _simulated_robot(robot_b_gateway),
+                                Vector2(70, 50), 0)
+
+    task = asyncio.create_task(simulation_runner.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    readings = simulation_gateway_mock.push_lidar_readings.call_args[0][0]
+    assert readings[0] == (0, 35)
+    readings = robot_b_gateway.push_lidar_readings.call_args[0][0]
+    assert readings[180] == (math.pi, 35)
+
+
+@pytest.mark.asyncio
+async def test_run_collisions(simulation_runner, simulation_configuration_test,
+                              event_queue):
+    """
+    The collisions of the robots are recorded in the simulation state.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=100)
+    simulation_runner.state.robots[RobotID.RobotA].position = Vector2(30, 50)
+    simulation_runner.add_robot(RobotID.RobotB,
+                                _simulated_robot(_simulation_gateway_mock()),
+                                Vector2(50, 50), 0)
+    await simulation_runner.run()
+    assert not simulation_runner.state.collisions
+
+    # Robot A moves by 4 * 2pi towards robot B.
+    event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                            payload={
+                                                'left': 2,
+                                                'right': 2,
+                                            }),
+                     tick_offset=0)
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_runner.simulation_configuration, match_duration=200)
+    await simulation_runner.run()
+
+    assert simulation_runner.state.collisions == {
+        Collision(robot=RobotID.RobotA, other=RobotID.RobotB)
+    }
+
+
+@pytest.mark.asyncio
+async def test_run_collisions_only_when_moving(simulation_runner,
+                                               simulation_configuration_test,
+                                               event_queue):
+    """
+    The collisions are only detected again once a robot moved.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=100)
+    collision_detector = MagicMock(wraps=simulation_runner.collision_detector)
+    simulation_runner.collision_detector = collision_detector
+    await simulation_runner.run()
+    assert collision_detector.detect.call_count == 1
+
+    event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                            payload={
+                                                'left': 1,
+                                                'right': 1,
+                                            }),
+                     tick_offset=0)
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_runner.simulation_configuration, match_duration=200)
+    await simulation_runner.run()
+    assert collision_detector.detect.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_push_cups(simulation_runner, simulation_configuration_test,
+                             event_queue):
+    """
+    The cups touching a moving robot move along with it.
+    """
+    simulation_runner.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        speed_factor=math.inf,
+        match_duration=100,
+        cup_radius=2)
+    simulation_runner.state.robots[RobotID.RobotA].position = Vector2(30, 50)
+    simulation_runner.state.cups = CupArray([
+        Cup(position=Vector2(36, 50), flags=CupFlag.GREEN),
+        Cup(position=Vector2(30, 70)),
+    ])
+
+    # Robot A moves forward by 2 * 2pi.
+    event_queue.push(event_order=EventOrder(type=EventType.MOVE_WHEEL,
+                                            payload={
+                                                'left': 2,
+                                                'right': 2,
+                                            }),
+                     tick_offset=0)
+    await simulation_runner.run()
+
+    cups = simulation_runner.state.cups
+    assert cups[0] == Cup(position=Vector2(36 + 4 * math.pi, 50),
+                          flags=CupFlag.GREEN | CupFlag.PUSHED)
+    assert cups[1] == Cup(position=Vector2(30, 70))
@@ -0,0 +1,54 @@
+"""
+Snapshot controller module.
+"""
+from dataclasses import dataclass
+
+from highlevel.robot.controller.motion.localization import LocalizationController, State
+from highlevel.robot.controller.motion.odometry import OdometryController, OdometryState
+from highlevel.simulation.controller.runner import RunnerSnapshot, SimulationRunner
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    State of the simulation and of the robot at a given tick.
+    """
+    runner: RunnerSnapshot
+    localization: State
+    odometry: OdometryState
+
+
+class SnapshotController:
+    """
+    Capture the state of the world at a decision point and roll back to it later, i.e. to simulate
+    several candidate actions from the same point without re-running the match from the start.
+
+    The simulation (state, pending events, clock, random generator) and the robot's localization
+    and odometry are captured, the localization of the other robots of the simulation is not. The
+    coroutines running on the robot (i.e. the strategy) are not either: the caller is responsible
+    for not having a movement in progress when restoring.
+    """
+    def __init__(self, simulation_runner: SimulationRunner,
+                 localization_controller: LocalizationController,
+                 odometry_controller: OdometryController):
+        self.simulation_runner = simulation_runner
+        self.localization_controller = localization_controller
+        self.odometry_controller = odometry_controller
+
+    def snapshot(self) -> Snapshot:
+        """
+        Capture the state of the world.
+        """
+        return Snapshot(
+            runner=self.simulation_runner.snapshot(),
+            localization=self.localization_controller.snapshot(),
+            odometry=self.odometry_controller.snapshot(),
+        )
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Roll back to a captured state. The same snapshot can be restored many times.
+        """
+        self.simulation_runner.restore(snapshot.runner)
+        self.localization_controller.restore(snapshot.localization)
+        self.odometry_controller.restore(snapshot.odometry)
@@ -0,0 +1,65 @@
+"""
+Test for snapshot controller module.
+"""
+from unittest.mock import MagicMock
+
+from pytest import fixture
+
+from highlevel.robot.controller.motion.localization import LocalizationController
+from highlevel.robot.controller.motion.odometry import OdometryController
+from highlevel.simulation.controller.runner import SimulationRunner
+from highlevel.simulation.controller.snapshot import SnapshotController
+
+
+@fixture(name='simulation_runner')
+def simulation_runner_mock():
+    """
+    Simulation runner.
+    """
+    return MagicMock(spec=SimulationRunner)
+
+
+@fixture(name='localization_controller')
+def localization_controller_mock():
+    """
+    Localization controller.
+    """
+    return MagicMock(spec=LocalizationController)
+
+
+@fixture(name='odometry_controller')
+def odometry_controller_mock():
+    """
+    Odometry controller.
+    """
+    return MagicMock(spec=OdometryController)
+
+
+@fixture(name='snapshot_controller')
+def snapshot_controller_setup(simulation_runner, localization_controller,
+                              odometry_controller):
+    """
+    Snapshot controller.
+    """
+    return SnapshotController(
+        simulation_runner=simulation_runner,
+        localization_controller=localization_controller,
+        odometry_controller=odometry_controller,
+    )
+
+
+def test_snapshot_restore(snapshot_controller, simulation_runner,
+                          localization_controller, odometry_controller):
+    """
+    The simulation and the robot are captured and restored together.
+    """
+    snapshot = snapshot_controller.snapshot()
+    assert snapshot.runner == simulation_runner.snapshot.return_value
+    assert snapshot.localization == localization_controller.snapshot.return_value
+    assert snapshot.odometry == odometry_controller.snapshot.return_value
+
+    snapshot_controller.restore(snapshot)
+    simulation_runner.restore.assert_called_once_with(snapshot.runner)
+    localization_controller.restore.assert_called_once_with(
+        snapshot.localization)
+    odometry_controller.restore.assert_called_once_with(snapshot.odometry)
@@ -0,0 +1,24 @@
+"""
+Cup module.
+"""
+from dataclasses import dataclass
+from enum import IntFlag
+
+from highlevel.util.geometry.vector import Vector2
+
+
+class CupFlag(IntFlag):
+    """
+    Flags of a cup.
+    """
+    GREEN = 1  # Red otherwise.
+    PUSHED = 2  # Has been pushed by a robot.
+
+
+@dataclass(frozen=True)
+class Cup:
+    """
+    A cup.
+    """
+    position: Vector2
+    flags: CupFlag = CupFlag(0)
@@ -1,7 +1,7 @@
 """
 Event module.
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
@@ -11,6 +11,7 @@ class EventType(Enum):
     Event type.
     """
     MOVE_WHEEL = 'MOVE_WHEEL'
+    WHEEL_MOTION = 'WHEEL_MOTION'
     MOVEMENT_DONE = 'MOVEMENT_DONE'
 
 
@@ -22,12 +23,3 @@ class EventOrder:
     """
     type: EventType
     payload: Any = None
-
-
-@dataclass(order=True, frozen=True)
-class Event:
-    """
-    Contain an event order that must be executed on a particular tick number.
-    """
-    tick: int
-    event: EventOrder = field(compare=False)
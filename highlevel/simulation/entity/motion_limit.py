@@ -0,0 +1,18 @@
+"""
+Motion limit module.
+"""
+from dataclasses import dataclass
+
+from highlevel.robot.entity.type import TickPerSec, TickPerSecSq
+
+
+@dataclass(frozen=True)
+class MotionLimit:
+    """
+    Speed and acceleration limits of the wheels, as sent by MotionLimitMsg.
+    A limit set to 0 is not enforced.
+    """
+    translation_speed: TickPerSec = 0  # Maximum speed of the wheels when translating.
+    rotation_speed: TickPerSec = 0  # Maximum speed of the wheels when rotating.
+    wheel_speed: TickPerSec = 0  # Maximum speed of each wheel.
+    wheel_acceleration: TickPerSecSq = 0  # Maximum acceleration of each wheel.
@@ -0,0 +1,27 @@
+"""
+Robot ID module.
+"""
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class RobotID(str, Enum):
+    """
+    Object type.
+    Made RobotID inherit from `str` to make it JSON serializable.
+    See https://stackoverflow.com/a/51976841
+    """
+    RobotA = 'ROBOT_A'
+    RobotB = 'ROBOT_B'
+    RobotC = 'ROBOT_C'
+    RobotD = 'ROBOT_D'
+
+
+@dataclass(frozen=True)
+class Collision:
+    """
+    Contact between a robot and another robot, or an obstacle if `other` is None.
+    """
+    robot: RobotID
+    other: Optional[RobotID] = None
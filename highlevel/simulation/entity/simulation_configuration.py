@@ -2,24 +2,62 @@
 Simulation configuration module.
 """
 import math
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+import attr
 from attr import dataclass
 
+from highlevel.simulation.entity.motion_limit import MotionLimit
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.simulation.entity.cup import Cup
+from highlevel.util.geometry.vector import Vector2
 from highlevel.util.geometry.segment import Segment
-from highlevel.robot.entity.type import RadianPerSec, Hz
+from highlevel.robot.entity.type import RadianPerSec, Hz, Millimeter, Millisecond, Radian
 
 
+# pylint: disable=too-many-instance-attributes
 @dataclass(frozen=True)
 class SimulationConfiguration:
     """
     InitialConfiguration for the simulation.
     """
     obstacles: List[Segment]
-    # Speed factor, 1 is normal speed, 2 will run the simulation twice as fast, INF is fastest.
+    # Speed factor, 1 is normal speed, 2 will run the simulation twice as fast, INF is fastest
+    # (headless mode, the simulation never sleeps).
     speed_factor: float = 1
+    # Delay, in seconds, past which a simulation too slow for its speed factor stops catching up
+    # and resumes from the current time.
+    max_pacing_lag: float = 0.5
     tickrate: int = 60  # FPS.
     rotation_speed: RadianPerSec = math.pi * 2 * 4.547
+    # Initial speed and acceleration limits of the wheels, until the robot sends its own. If None,
+    # the wheels turn at `rotation_speed` without accelerating.
+    motion_limit: Optional[MotionLimit] = None
     encoder_position_rate: Hz = 100  # Frequency to send the encoder wheel positions.
     simulation_notify_rate: Hz = 60  # Notify the subscriber at this rate.
     lidar_position_rate: Hz = 11  # Frequency to send the LIDAR positions.
+    lidar_ray_count: int = 360  # Number of rays cast for each simulated LIDAR scan.
+    # Stop the simulation once this simulated time is reached, never stop if None.
+    match_duration: Optional[Millisecond] = None
+    # Standard deviation of the relative error between the actual movement of the wheels and the
+    # ticks counted by the encoders.
+    encoder_noise: float = 0
+    # Seed of the random generator used by the simulation, random if None.
+    seed: Optional[int] = None
+    # File the replay is streamed to, no replay is recorded if None. The replay is written in the
+    # columnar format if the file has the .rpl extension, as NDJSON otherwise.
+    replay_path: Optional[str] = None
+    # Directory the replays are saved to, before being uploaded.
+    replay_spool_dir: str = 'replays'
+    # Gzip encode the body of the replay uploads.
+    compress_replay_upload: bool = False
+    # Robots simulated along with ROBOT_A, with their initial position and angle. Each of them
+    # runs its own copy of the robot's program.
+    extra_robots: Dict[RobotID, Tuple[Vector2, Radian]] = attr.Factory(dict)
+    # Cups on the field at the start of the simulation, the robots push the cups they run into.
+    cups: List[Cup] = attr.Factory(list)
+    cup_radius: Millimeter = 36
+    # Time each phase of the ticks, the statistics are sent on the debug websocket and logged at
+    # the end of the run.
+    profile_ticks: bool = False
+    profile_window: int = 1024  # Number of durations kept for each phase of the ticks.
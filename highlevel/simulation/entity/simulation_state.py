@@ -3,51 +3,289 @@ SimulationState of a simulation at a given moment.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from enum import Enum
-from typing import List
+import copy
 
-from highlevel.robot.entity.type import Millisecond
+from dataclasses import dataclass, field, fields
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional
+
+import numpy
+
+from highlevel.robot.entity.type import Millisecond, Radian
+from highlevel.simulation.entity.cup import Cup, CupFlag
+from highlevel.simulation.entity.motion_limit import MotionLimit
+from highlevel.simulation.entity.robot_id import Collision, RobotID
+from highlevel.simulation.entity.wheel_motion import AnyWheelMotion
 from highlevel.util.geometry.vector import Vector2
 
 
-class RobotID(str, Enum):
+class CupArray:
     """
-    Object type.
-    Made RobotID inherit from `str` to make it JSON serializable.
-    See https://stackoverflow.com/a/51976841
+    The cups of the simulation, as a struct of arrays: an (N, 2) float64 array of positions and an
+    (N,) uint8 array of CupFlags. Moving or flagging any number of cups is a single numpy call.
     """
-    RobotA = 'ROBOT_A'
-    RobotB = 'ROBOT_B'
-    RobotC = 'ROBOT_C'
-    RobotD = 'ROBOT_D'
+    __slots__ = ('positions', 'flags')
 
+    def __init__(self, cups: Iterable[Cup] = ()):
+        cups = tuple(cups)
+        self.positions = numpy.array([(cup.position.x, cup.position.y)
+                                      for cup in cups],
+                                     dtype=numpy.float64).reshape((-1, 2))
+        self.flags = numpy.array([cup.flags for cup in cups],
+                                 dtype=numpy.uint8)
 
-@dataclass
-class Cup:
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def __getitem__(self, index: int) -> Cup:
+        return Cup(position=Vector2(*self.positions[index]),
+                   flags=CupFlag(int(self.flags[index])))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CupArray):
+            return numpy.array_equal(self.positions,
+                                     other.positions) and numpy.array_equal(
+                                         self.flags, other.flags)
+        return False
+
+    def __repr__(self) -> str:
+        return f'CupArray({[self[index] for index in range(len(self))]})'
+
+    def clone(self) -> CupArray:
+        """
+        Clone this entity.
+        """
+        clone = CupArray()
+        clone.positions = self.positions.copy()
+        clone.flags = self.flags.copy()
+        return clone
+
+
+class RobotState:
     """
-    A cup.
+    State of a simulated robot.
+
+    The pose and the ticks of the robot are a row of the arrays of a RobotStateArray, shared with
+    the other robots of the simulation: a robot state is a view on this row. A robot state created
+    on its own has an array of its own.
     """
-    position: Vector2
 
-    def clone(self) -> Cup:
+    # pylint: disable=too-many-arguments
+    def __init__(self,
+                 position: Vector2 = Vector2(0, 0),
+                 angle: Radian = 0,
+                 left_tick: int = 0,
+                 right_tick: int = 0,
+                 wheel_motions: Optional[List[AnyWheelMotion]] = None,
+                 motion_limit: Optional[MotionLimit] = None):
+        self._array = RobotStateArray()
+        self._index = self._array.append_row(position, angle, left_tick,
+                                             right_tick, wheel_motions or [],
+                                             motion_limit)
+
+    @classmethod
+    def row(cls, array: RobotStateArray, index: int) -> RobotState:
         """
-        Clone this entity.
+        Return the state of the robot of a row of an array.
+        """
+        robot = cls.__new__(cls)
+        robot._array = array
+        robot._index = index
+        return robot
+
+    # Actual pose of the robot in the simulation (as opposed to the pose computed by the robot).
+    @property
+    def position(self) -> Vector2:
+        """
+        Position of the robot.
+        """
+        x, y = self._array.poses[self._index, :2].tolist()
+        return Vector2(x, y)
+
+    @position.setter
+    def position(self, position: Vector2) -> None:
+        self._array.poses[self._index, :2] = (position.x, position.y)
+
+    @property
+    def angle(self) -> Radian:
+        """
+        Angle of the robot.
+        """
+        return float(self._array.poses[self._index, 2])
+
+    @angle.setter
+    def angle(self, angle: Radian) -> None:
+        self._array.poses[self._index, 2] = angle
+
+    @property
+    def left_tick(self) -> int:
+        """
+        Position of the left wheel, in encoder ticks.
+        """
+        return int(self._array.ticks[self._index, 0])
+
+    @left_tick.setter
+    def left_tick(self, left_tick: int) -> None:
+        self._array.ticks[self._index, 0] = left_tick
+
+    @property
+    def right_tick(self) -> int:
+        """
+        Position of the right wheel, in encoder ticks.
+        """
+        return int(self._array.ticks[self._index, 1])
+
+    @right_tick.setter
+    def right_tick(self, right_tick: int) -> None:
+        self._array.ticks[self._index, 1] = right_tick
+
+    @property
+    def wheel_motions(self) -> List[AnyWheelMotion]:
+        """
+        Movements of the wheels in progress.
+        """
+        return self._array.wheel_motions[self._index]
+
+    @wheel_motions.setter
+    def wheel_motions(self, wheel_motions: List[AnyWheelMotion]) -> None:
+        self._array.wheel_motions[self._index] = wheel_motions
+
+    @property
+    def motion_limit(self) -> Optional[MotionLimit]:
         """
-        return Cup(position=self.position)
+        Limits set by the robot, the ones of the simulation configuration are used if None.
+        """
+        return self._array.motion_limits[self._index]
+
+    @motion_limit.setter
+    def motion_limit(self, motion_limit: Optional[MotionLimit]) -> None:
+        self._array.motion_limits[self._index] = motion_limit
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RobotState):
+            return self._values() == other._values()
+        return False
+
+    def __repr__(self) -> str:
+        return (f'RobotState(position={self.position!r}, angle={self.angle}, '
+                f'left_tick={self.left_tick}, right_tick={self.right_tick}, '
+                f'wheel_motions={self.wheel_motions!r}, '
+                f'motion_limit={self.motion_limit!r})')
+
+    def clone(self) -> RobotState:
+        """
+        Clone this entity, the clone has an array of its own.
+        """
+        return RobotState(
+            position=self.position,
+            angle=self.angle,
+            left_tick=self.left_tick,
+            right_tick=self.right_tick,
+            wheel_motions=list(self.wheel_motions),
+            motion_limit=self.motion_limit,
+        )
+
+    def _values(self) -> tuple:
+        return (self.position, self.angle, self.left_tick, self.right_tick,
+                self.wheel_motions, self.motion_limit)
+
+
+class RobotStateArray(Mapping[RobotID, RobotState]):
+    """
+    The simulated robots, as a struct of arrays: one row per robot in an (N, 3) float64 array of
+    poses (x, y, angle) and an (N, 2) int64 array of wheel ticks (left, right). Moving every robot
+    is a single numpy call.
+
+    Indexing by RobotID returns a RobotState view on the row of the robot. Setting a RobotState
+    copies it in the row of the robot, the row is added if needed.
+    """
+    def __init__(self, robots: Optional[Mapping[RobotID, RobotState]] = None):
+        self.poses = numpy.zeros((0, 3), dtype=numpy.float64)
+        self.ticks = numpy.zeros((0, 2), dtype=numpy.int64)
+        self.wheel_motions: List[List[AnyWheelMotion]] = []
+        self.motion_limits: List[Optional[MotionLimit]] = []
+        # Row of each robot. Clones share it: it is replaced when a robot is added, never changed
+        # in place.
+        self._indices: Dict[RobotID, int] = {}
+
+        for robot_id, robot in (robots or {}).items():
+            self[robot_id] = robot
+
+    def __getitem__(self, robot_id: RobotID) -> RobotState:
+        return RobotState.row(self, self._indices[robot_id])
+
+    def __setitem__(self, robot_id: RobotID, robot: RobotState) -> None:
+        index = self._indices.get(robot_id)
+        if index is None:
+            index = self.append_row(robot.position, robot.angle,
+                                    robot.left_tick, robot.right_tick,
+                                    list(robot.wheel_motions),
+                                    robot.motion_limit)
+            self._indices = {**self._indices, robot_id: index}
+            return
+
+        self.poses[index] = (robot.position.x, robot.position.y, robot.angle)
+        self.ticks[index] = (robot.left_tick, robot.right_tick)
+        self.wheel_motions[index] = list(robot.wheel_motions)
+        self.motion_limits[index] = robot.motion_limit
+
+    def __iter__(self) -> Iterator[RobotID]:
+        return iter(self._indices)
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __repr__(self) -> str:
+        return f'RobotStateArray({dict(self.items())!r})'
+
+    def index(self, robot_id: RobotID) -> int:
+        """
+        Return the row of a robot.
+        """
+        return self._indices[robot_id]
+
+    # pylint: disable=too-many-arguments
+    def append_row(self, position: Vector2, angle: Radian, left_tick: int,
+                   right_tick: int, wheel_motions: List[AnyWheelMotion],
+                   motion_limit: Optional[MotionLimit]) -> int:
+        """
+        Add a row at the end of the arrays, return its index.
+        """
+        self.poses = numpy.append(self.poses,
+                                  [(position.x, position.y, angle)],
+                                  axis=0)
+        self.ticks = numpy.append(self.ticks, [(left_tick, right_tick)],
+                                  axis=0)
+        self.wheel_motions.append(wheel_motions)
+        self.motion_limits.append(motion_limit)
+        return len(self.poses) - 1
+
+    def clone(self) -> RobotStateArray:
+        """
+        Clone this entity: the arrays are copied at once, whatever the number of robots.
+        """
+        clone = copy.copy(self)
+        clone.poses = self.poses.copy()
+        clone.ticks = self.ticks.copy()
+        clone.wheel_motions = [list(motions) for motions in self.wheel_motions]
+        clone.motion_limits = list(self.motion_limits)
+        return clone
 
 
 @dataclass
 class SimulationState:
     """
     Simulation state.
+    The robots and the cups are stored as arrays (see RobotStateArray and CupArray), cloning the
+    state copies a few arrays, whatever the number of robots and cups.
     """
     time: Millisecond
-    cups: List[Cup]
-    left_tick: int
-    right_tick: int
     last_position_update: float
     last_lidar_update: float = 0
+    robots: RobotStateArray = field(default_factory=lambda: RobotStateArray(
+        {RobotID.RobotA: RobotState()}))
+    cups: CupArray = field(default_factory=CupArray)
+    # Contacts found at the last tick.
+    collisions: FrozenSet[Collision] = frozenset()
 
     def clone(self) -> SimulationState:
         """
@@ -55,8 +293,18 @@ class SimulationState:
         """
         return SimulationState(
             time=self.time,
-            cups=[cup.clone() for cup in self.cups],
-            left_tick=self.left_tick,
-            right_tick=self.right_tick,
             last_position_update=self.last_position_update,
+            last_lidar_update=self.last_lidar_update,
+            robots=self.robots.clone(),
+            cups=self.cups.clone(),
+            collisions=self.collisions,
         )
+
+    def restore(self, other: SimulationState) -> None:
+        """
+        Set this entity to a copy of another one, in place: the components holding a reference to
+        this entity see the change.
+        """
+        clone = other.clone()
+        for state_field in fields(self):
+            setattr(self, state_field.name, getattr(clone, state_field.name))
@@ -0,0 +1,101 @@
+"""
+Test for simulation state module.
+"""
+from highlevel.simulation.entity.cup import Cup, CupFlag
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.simulation.entity.simulation_state import (CupArray, RobotState,
+                                                          RobotStateArray,
+                                                          SimulationState)
+from highlevel.util.geometry.vector import Vector2
+
+
+def test_robot_state_is_a_view():
+    """
+    The state of a robot reads and writes the row of the robot in the arrays.
+    """
+    robots = RobotStateArray({
+        RobotID.RobotA:
+        RobotState(),
+        RobotID.RobotB:
+        RobotState(position=Vector2(1, 2), angle=3),
+    })
+    robot = robots[RobotID.RobotB]
+
+    robot.position = Vector2(4, 5)
+    robot.left_tick += 6
+    robot.wheel_motions.append(None)
+
+    assert robots.index(RobotID.RobotB) == 1
+    assert robots.poses.tolist() == [[0, 0, 0], [4, 5, 3]]
+    assert robots.ticks.tolist() == [[0, 0], [6, 0]]
+    assert robots[RobotID.RobotB] == RobotState(position=Vector2(4, 5),
+                                                angle=3,
+                                                left_tick=6,
+                                                wheel_motions=[None])
+    assert isinstance(robot.position.x, float)
+    assert isinstance(robot.left_tick, int)
+
+
+def test_set_robot_state():
+    """
+    Setting the state of a robot copies it in the row of the robot, the row is added if needed.
+    """
+    robots = RobotStateArray()
+    robot = RobotState(position=Vector2(1, 2))
+
+    robots[RobotID.RobotA] = robot
+    robots[RobotID.RobotA] = RobotState(angle=1)
+    robot.angle = 2
+
+    assert list(robots) == [RobotID.RobotA]
+    assert robots[RobotID.RobotA] == RobotState(angle=1)
+
+
+def test_cup_array():
+    """
+    The cups are stored as arrays, and can be read back one by one.
+    """
+    cups = CupArray([
+        Cup(position=Vector2(1, 2), flags=CupFlag.GREEN),
+        Cup(position=Vector2(3, 4)),
+    ])
+
+    assert len(cups) == 2
+    assert cups.positions.tolist() == [[1, 2], [3, 4]]
+    assert cups[0] == Cup(position=Vector2(1, 2), flags=CupFlag.GREEN)
+    assert cups[1] == Cup(position=Vector2(3, 4))
+    assert not CupArray()
+
+
+def test_clone():
+    """
+    The clone does not share its arrays with the original state.
+    """
+    state = SimulationState(time=0,
+                            last_position_update=0,
+                            cups=CupArray([Cup(position=Vector2(1, 2))]))
+    clone = state.clone()
+    assert clone == state
+
+    clone.robots[RobotID.RobotA].position = Vector2(3, 4)
+    clone.robots[RobotID.RobotA].wheel_motions.append(None)
+    clone.cups.positions[0] = (5, 6)
+    clone.cups.flags[0] = CupFlag.PUSHED
+
+    assert state.robots[RobotID.RobotA] == RobotState()
+    assert state.cups[0] == Cup(position=Vector2(1, 2))
+    assert clone != state
+
+
+def test_add_robot_to_clone():
+    """
+    Adding a robot to a clone does not add it to the original.
+    """
+    robots = RobotStateArray({RobotID.RobotA: RobotState()})
+    clone = robots.clone()
+
+    clone[RobotID.RobotB] = RobotState()
+
+    assert list(robots) == [RobotID.RobotA]
+    assert len(robots.poses) == 1
+    assert list(clone) == [RobotID.RobotA, RobotID.RobotB]
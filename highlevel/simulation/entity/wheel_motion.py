@@ -0,0 +1,203 @@
+"""
+Wheel motion module.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Tuple, Union
+
+import numpy
+
+from highlevel.robot.entity.type import TickPerSec, TickPerSecSq
+
+
+@dataclass(frozen=True)
+class WheelMotion:
+    """
+    Continuous movement of the wheels: `left_tick` and `right_tick` encoder ticks, spread evenly
+    over `duration` simulation ticks starting at `start_tick`. The number of encoder ticks moved
+    can be computed at any simulation tick, without storing one event per tick.
+    """
+    start_tick: int
+    duration: int
+    left_tick: int
+    right_tick: int
+
+    @property
+    def end_tick(self) -> int:
+        """
+        Last simulation tick during which the wheels move.
+        """
+        return self.start_tick + self.duration - 2
+
+    def ticks_at(self, tick: int) -> Tuple[int, int]:
+        """
+        Return the number of encoder ticks the left and right wheels moved by once the simulation
+        tick `tick` has been simulated.
+        The wheels move by round(k * total / (duration - 1)) encoder ticks after k simulation
+        ticks, i.e. the wheels do not move at all if the duration is shorter than 2 ticks.
+        """
+        if self.duration < 2:
+            return 0, 0
+
+        steps = min(max(tick - self.start_tick + 1, 0), self.duration - 1)
+        return (self._progress(self.left_tick,
+                               steps), self._progress(self.right_tick, steps))
+
+    def _progress(self, total: int, steps: int) -> int:
+        if steps == self.duration - 1:
+            return total
+        return round(steps * (total / (self.duration - 1)))
+
+
+@dataclass(frozen=True)
+class ProfiledWheelMotion:
+    """
+    Movement of the wheels following a precomputed position profile: `positions[k]` is the number
+    of encoder ticks moved once the simulation tick `start_tick + k` has been simulated. Both
+    wheels move by the same number of ticks, in the direction given by their sign.
+    """
+    start_tick: int
+    positions: numpy.ndarray = field(compare=False)
+    left_sign: int = 1
+    right_sign: int = 1
+
+    @property
+    def end_tick(self) -> int:
+        """
+        Last simulation tick during which the wheels move.
+        """
+        return self.start_tick + len(self.positions) - 1
+
+    def ticks_at(self, tick: int) -> Tuple[int, int]:
+        """
+        Return the number of encoder ticks the left and right wheels moved by once the simulation
+        tick `tick` has been simulated.
+        """
+        index = tick - self.start_tick
+        if index < 0:
+            return 0, 0
+
+        position = int(self.positions[min(index, len(self.positions) - 1)])
+        return self.left_sign * position, self.right_sign * position
+
+
+@dataclass(frozen=True)
+class SpeedRamp:
+    """
+    Speed of a wheel going from `initial_speed` to `target_speed` at constant acceleration, then
+    staying at `target_speed`.
+    """
+    initial_speed: TickPerSec
+    target_speed: TickPerSec
+    acceleration: TickPerSecSq = math.inf
+
+    @property
+    def duration(self) -> float:
+        """
+        Time to reach the target speed, in seconds.
+        """
+        if math.isinf(self.acceleration):
+            return 0
+        return abs(self.target_speed - self.initial_speed) / self.acceleration
+
+    def speed_at(self, time: float) -> TickPerSec:
+        """
+        Speed of the wheel `time` seconds after the start of the ramp.
+        """
+        if time >= self.duration:
+            return self.target_speed
+        return self.initial_speed + math.copysign(
+            self.acceleration, self.target_speed - self.initial_speed) * time
+
+    def position_at(self, time: float) -> float:
+        """
+        Number of encoder ticks moved `time` seconds after the start of the ramp.
+        """
+        ramp_time = min(time, self.duration)
+        position = (self.initial_speed +
+                    self.speed_at(ramp_time)) / 2 * ramp_time
+        return position + self.target_speed * (time - ramp_time)
+
+
+@dataclass(frozen=True)
+class SpeedWheelMotion:
+    """
+    Movement of the wheels driven in speed mode (MoveWheelAtSpeedMsg): each wheel ramps up to its
+    target speed and keeps it until the next order.
+    """
+    start_tick: int
+    tickrate: int
+    left: SpeedRamp
+    right: SpeedRamp
+
+    @property
+    def end_tick(self) -> float:
+        """
+        Last simulation tick during which the wheels move, infinite unless the wheels stop.
+        """
+        if self.left.target_speed or self.right.target_speed:
+            return math.inf
+        duration = max(self.left.duration, self.right.duration)
+        return self.start_tick + math.ceil(duration * self.tickrate)
+
+    def ticks_at(self, tick: int) -> Tuple[int, int]:
+        """
+        Return the number of encoder ticks the left and right wheels moved by once the simulation
+        tick `tick` has been simulated.
+        """
+        time = max(tick - self.start_tick + 1, 0) / self.tickrate
+        return (round(self.left.position_at(time)),
+                round(self.right.position_at(time)))
+
+    def speeds_at(self, tick: int) -> Tuple[TickPerSec, TickPerSec]:
+        """
+        Return the speed of the left and right wheels once the simulation tick `tick` has been
+        simulated.
+        """
+        time = max(tick - self.start_tick + 1, 0) / self.tickrate
+        return self.left.speed_at(time), self.right.speed_at(time)
+
+
+AnyWheelMotion = Union[WheelMotion, ProfiledWheelMotion, SpeedWheelMotion]
+
+
+def trapezoidal_profile(distance: int, max_speed: TickPerSec,
+                        acceleration: TickPerSecSq,
+                        tickrate: int) -> numpy.ndarray:
+    """
+    Compute the position of a wheel moving by `distance` encoder ticks from standstill to
+    standstill, accelerating up to `max_speed` then decelerating at `acceleration` (trapezoidal
+    velocity profile, triangular if the distance is too short to reach the maximum speed).
+    Return the number of ticks moved after each simulation tick, as integers, the last one being
+    `distance`. The acceleration can be infinite.
+    """
+    if max_speed <= 0 or acceleration <= 0:
+        raise ValueError("the speed and acceleration must be positive")
+
+    length = abs(distance)
+    if math.isinf(acceleration):
+        peak_speed = max_speed
+        ramp_time = ramp_distance = 0.
+    else:
+        peak_speed = min(max_speed, math.sqrt(length * acceleration))
+        ramp_time = peak_speed / acceleration
+        ramp_distance = peak_speed * ramp_time / 2
+    total_time = 2 * ramp_time + (length - 2 * ramp_distance) / peak_speed
+
+    tick_count = max(math.ceil(total_time * tickrate - 1e-9), 1)
+    times = numpy.minimum(
+        numpy.arange(1, tick_count + 1) / tickrate, total_time)
+
+    positions = numpy.empty(tick_count)
+    accelerating = times < ramp_time
+    decelerating = times > total_time - ramp_time
+    cruising = ~accelerating & ~decelerating
+    positions[accelerating] = acceleration / 2 * times[accelerating]**2
+    positions[cruising] = ramp_distance + peak_speed * (times[cruising] -
+                                                        ramp_time)
+    positions[decelerating] = length - acceleration / 2 * (
+        total_time - times[decelerating])**2
+
+    positions = numpy.round(positions).astype(numpy.int64)
+    positions[-1] = length
+    return positions if distance >= 0 else -positions
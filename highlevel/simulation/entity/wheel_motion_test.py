@@ -0,0 +1,167 @@
+"""
+Test for wheel motion module.
+"""
+import math
+from typing import List
+
+import numpy
+from pytest import mark, raises
+
+from highlevel.simulation.entity.wheel_motion import (ProfiledWheelMotion,
+                                                      SpeedRamp,
+                                                      SpeedWheelMotion,
+                                                      WheelMotion,
+                                                      trapezoidal_profile)
+
+
+def _per_tick_deltas(delta: int, ticks: int) -> List[int]:
+    """
+    Encoder ticks moved at each simulation tick, as they used to be queued one event per tick.
+    """
+    return list(
+        map(int, numpy.diff(numpy.round(numpy.linspace(0, delta, num=ticks)))))
+
+
+@mark.parametrize('total,duration', [(3, 5), (-3, 400), (1000, 7),
+                                     (-1234, 567), (1, 1), (5, 0), (7, 2)])
+def test_ticks_at_same_as_per_tick_events(total, duration):
+    """
+    The wheels move by the same number of encoder ticks at every simulation tick as when the
+    movement was split in one event per tick.
+    """
+    motion = WheelMotion(start_tick=10,
+                         duration=duration,
+                         left_tick=-total,
+                         right_tick=total)
+
+    deltas = []
+    for tick in range(10, 10 + max(duration - 1, 0)):
+        left_before, right_before = motion.ticks_at(tick - 1)
+        left_after, right_after = motion.ticks_at(tick)
+        assert left_after - left_before == -(right_after - right_before)
+        deltas.append(right_after - right_before)
+
+    assert deltas == _per_tick_deltas(total, duration)
+
+
+def test_ticks_at_before_and_after():
+    """
+    The wheels do not move before the start of the motion, and are at the target after the end.
+    """
+    motion = WheelMotion(start_tick=10,
+                         duration=5,
+                         left_tick=100,
+                         right_tick=100)
+
+    assert motion.ticks_at(0) == (0, 0)
+    assert motion.ticks_at(9) == (0, 0)
+    assert motion.ticks_at(10) == (25, 25)
+    assert motion.ticks_at(motion.end_tick) == (100, 100)
+    assert motion.ticks_at(1000) == (100, 100)
+
+
+@mark.parametrize('distance', [2400, -2400, 10, 1])
+def test_trapezoidal_profile_limits(distance):
+    """
+    The wheel reaches the distance without exceeding the speed and acceleration limits (give or
+    take the rounding to encoder ticks).
+    """
+    tickrate = 1000
+    positions = trapezoidal_profile(distance, 1000, 2000, tickrate)
+
+    assert positions[-1] == distance
+    speeds = numpy.diff(positions, prepend=0) * tickrate
+    assert numpy.all(numpy.abs(speeds) <= 1000 + tickrate)
+    assert numpy.all(numpy.sign(speeds) * numpy.sign(distance) >= 0)
+
+
+def test_trapezoidal_profile_duration():
+    """
+    Trapezoidal profile: 0.5s to accelerate to 1000 ticks/s (250 ticks), 1.9s at 1000 ticks/s
+    then 0.5s to decelerate.
+    """
+    positions = trapezoidal_profile(2400, 1000, 2000, 100)
+
+    assert len(positions) == 290
+    assert positions[49] == 250
+    assert positions[239] == 2150
+
+
+def test_trapezoidal_profile_triangular():
+    """
+    The maximum speed is not reached if the distance is too short.
+    """
+    positions = trapezoidal_profile(200, 1000, 2000, 100)
+
+    # sqrt(200 / 2000) seconds to accelerate and as much to decelerate.
+    assert len(positions) == math.ceil(2 * math.sqrt(0.1) * 100)
+    # Half of the distance at the peak speed, after 0.316s.
+    assert positions[30] < 100 < positions[31]
+
+
+def test_trapezoidal_profile_infinite_acceleration():
+    """
+    Without acceleration limit, the wheel moves at constant speed.
+    """
+    positions = trapezoidal_profile(100, 1000, math.inf, 100)
+
+    assert list(positions) == list(range(10, 101, 10))
+
+
+def test_trapezoidal_profile_invalid_limits():
+    """
+    The speed and acceleration must be positive.
+    """
+    with raises(ValueError):
+        trapezoidal_profile(100, 0, 1000, 100)
+
+
+def test_profiled_wheel_motion():
+    """
+    The wheels follow the profile, in the direction of their sign.
+    """
+    motion = ProfiledWheelMotion(start_tick=10,
+                                 positions=numpy.array([1, 3, 6]),
+                                 left_sign=-1)
+
+    assert motion.end_tick == 12
+    assert motion.ticks_at(9) == (0, 0)
+    assert motion.ticks_at(10) == (-1, 1)
+    assert motion.ticks_at(12) == (-6, 6)
+    assert motion.ticks_at(100) == (-6, 6)
+
+
+def test_speed_ramp():
+    """
+    The wheel accelerates up to its target speed, then keeps it.
+    """
+    ramp = SpeedRamp(initial_speed=100, target_speed=-100, acceleration=400)
+
+    assert ramp.duration == 0.5
+    assert ramp.speed_at(0.25) == 0
+    assert ramp.position_at(0.5) == 0
+    assert ramp.speed_at(1) == -100
+    assert ramp.position_at(1) == -50
+
+
+def test_speed_wheel_motion():
+    """
+    The wheels move at their speed until the next order, or until they stop.
+    """
+    motion = SpeedWheelMotion(start_tick=10,
+                              tickrate=100,
+                              left=SpeedRamp(0, 100),
+                              right=SpeedRamp(0, -200))
+
+    assert math.isinf(motion.end_tick)
+    assert motion.ticks_at(9) == (0, 0)
+    assert motion.ticks_at(109) == (100, -200)
+    assert motion.speeds_at(109) == (100, -200)
+
+    stop = SpeedWheelMotion(start_tick=10,
+                            tickrate=100,
+                            left=SpeedRamp(100, 0, 1000),
+                            right=SpeedRamp(200, 0, 1000))
+
+    assert stop.end_tick == 30
+    assert stop.ticks_at(stop.end_tick) == (5, 20)
@@ -1,9 +1,12 @@
 """
 Simulation gateway module.
 """
+from typing import Tuple
+
 from proto.gen.python.outech_pb2 import MovementEndedMsg, BusMessage, EncoderPositionMsg
 from highlevel.robot.adapter.lidar.simulated import SimulatedLIDARAdapter
 from highlevel.robot.adapter.socket import SocketAdapter
+from highlevel.robot.entity.type import Radian, Millimeter
 from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
 
 
@@ -18,6 +21,9 @@ class SimulationGateway:
         self.motor_board_adapter = motor_board_adapter
         self.simulation_configuration = simulation_configuration
         self.lidar_adapter = lidar_adapter
+        # Sent at every tick, only its fields are updated.
+        self._encoder_message = BusMessage(
+            encoderPosition=EncoderPositionMsg())
 
     async def movement_done(self) -> None:
         """
@@ -31,15 +37,21 @@ class SimulationGateway:
         """
         Send encoder positions.
         """
-        bus_message = BusMessage(encoderPosition=EncoderPositionMsg(
-            left_tick=left_tick,
-            right_tick=right_tick,
-        ))
-        msg_bytes = bus_message.SerializeToString()
+        encoder_position = self._encoder_message.encoderPosition  # pylint: disable=no-member
+        encoder_position.left_tick = left_tick
+        encoder_position.right_tick = right_tick
+        msg_bytes = self._encoder_message.SerializeToString()
         await self.motor_board_adapter.send(msg_bytes)
 
-    async def push_lidar_readings(self) -> None:
+    async def push_lidar_readings(
+            self, readings: Tuple[Tuple[Radian, Millimeter], ...]) -> None:
         """
         Simulate the LIDAR sending its readings to the robot.
         """
-        self.lidar_adapter.push_simulated_circle_readings()
+        self.lidar_adapter.push_simulated_readings(readings)
+
+    def reads_lidar(self) -> bool:
+        """
+        Check if the robot reads its LIDAR, its readings do not need to be simulated otherwise.
+        """
+        return self.lidar_adapter.has_handlers
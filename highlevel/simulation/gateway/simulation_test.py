@@ -3,6 +3,8 @@ Test for simulation gateway module.
 """
 import pytest
 
+from proto.gen.python.outech_pb2 import BusMessage
+from highlevel.robot.adapter.lidar.simulated import SimulatedLIDARAdapter
 from highlevel.simulation.gateway.simulation import SimulationGateway
 
 
@@ -20,3 +22,44 @@ async def test_movement_done(socket_adapter_mock,
     )
     await simulation_gateway.movement_done()
     socket_adapter_mock.send.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_encoder_position(socket_adapter_mock,
+                                simulation_configuration_test,
+                                simulated_lidar_adapter_mock):
+    """
+    Every call sends the given ticks, even though the message is reused.
+    """
+    simulation_gateway = SimulationGateway(
+        simulation_configuration=simulation_configuration_test,
+        lidar_adapter=simulated_lidar_adapter_mock,
+        motor_board_adapter=socket_adapter_mock,
+    )
+    await simulation_gateway.encoder_position(1, 2)
+    await simulation_gateway.encoder_position(-3, 0)
+
+    messages = []
+    for call in socket_adapter_mock.send.call_args_list:
+        bus_message = BusMessage()
+        bus_message.ParseFromString(call[0][0])
+        encoder_position = bus_message.encoderPosition  # pylint: disable=no-member
+        messages.append(
+            (encoder_position.left_tick, encoder_position.right_tick))
+    assert messages == [(1, 2), (-3, 0)]
+
+
+def test_reads_lidar(socket_adapter_mock, simulation_configuration_test):
+    """
+    The LIDAR is read once the robot listens to it.
+    """
+    lidar_adapter = SimulatedLIDARAdapter()
+    simulation_gateway = SimulationGateway(
+        simulation_configuration=simulation_configuration_test,
+        lidar_adapter=lidar_adapter,
+        motor_board_adapter=socket_adapter_mock,
+    )
+    assert not simulation_gateway.reads_lidar()
+
+    lidar_adapter.register_handler(lambda readings: None)
+    assert simulation_gateway.reads_lidar()
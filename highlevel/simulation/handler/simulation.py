@@ -2,37 +2,38 @@
 Simulation handler module.
 """
 import math
-from typing import Iterator, Tuple
+from typing import Optional, Tuple
 
-import numpy
-
-from proto.gen.python.outech_pb2 import BusMessage
+from proto.gen.python.outech_pb2 import BusMessage, MotionLimitMsg, MoveWheelAtSpeedMsg
 from highlevel.logger import LOGGER
 from highlevel.robot.entity.configuration import Configuration
+from highlevel.robot.entity.type import TickPerSec
 from highlevel.simulation.controller.event_queue import EventQueue
 from highlevel.simulation.entity.event import EventOrder, EventType
+from highlevel.simulation.entity.motion_limit import MotionLimit
 from highlevel.simulation.entity.simulation_configuration import SimulationConfiguration
-from highlevel.simulation.entity.simulation_state import SimulationState
-
-
-def _spread_delta_on_ticks(delta: int,
-                           ticks: int) -> Iterator[Tuple[int, int]]:
-    return enumerate(
-        map(int, numpy.diff(numpy.round(numpy.linspace(0, delta, num=ticks)))))
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.simulation.entity.simulation_state import RobotState, SimulationState
+from highlevel.simulation.entity.wheel_motion import (
+    AnyWheelMotion, ProfiledWheelMotion, SpeedRamp, SpeedWheelMotion,
+    WheelMotion, trapezoidal_profile)
 
 
 class SimulationHandler:
     """
     Listen to all the "real-world" orders from the robot (i.e. move forward) and convert them into 
     actions inside the simulation. This is the entry point of the simulation.
+    There is one handler for each simulated robot, `robot_id` is the robot it listens to.
     """
     def __init__(self, configuration: Configuration, event_queue: EventQueue,
                  simulation_state: SimulationState,
-                 simulation_configuration: SimulationConfiguration):
+                 simulation_configuration: SimulationConfiguration,
+                 robot_id: RobotID):
         self.configuration = configuration
         self.event_queue = event_queue
         self.simulation_state = simulation_state
         self.simulation_configuration = simulation_configuration
+        self.robot_id = robot_id
 
     async def handle_movement_order(self, data: bytes) -> None:
         """
@@ -40,12 +41,19 @@ class SimulationHandler:
         """
         bus_message = BusMessage()
         bus_message.ParseFromString(data)
-        if bus_message.WhichOneof("message_content") == "translate":
+        message_content = bus_message.WhichOneof("message_content")
+        if message_content == "translate":
             rotate = False
             msg_ticks = bus_message.translate.ticks  # pylint: disable=no-member
-        elif bus_message.WhichOneof("message_content") == "rotate":
+        elif message_content == "rotate":
             rotate = True
             msg_ticks = bus_message.rotate.ticks  # pylint: disable=no-member
+        elif message_content == "motionLimit":
+            self._set_motion_limit(bus_message.motionLimit)  # pylint: disable=no-member
+            return
+        elif message_content == "moveWheelAtSpeed":
+            self._move_wheels_at_speed(bus_message.moveWheelAtSpeed)  # pylint: disable=no-member
+            return
         else:
             return
 
@@ -57,32 +65,120 @@ class SimulationHandler:
             self.event_queue.push(EventOrder(type=EventType.MOVEMENT_DONE), 0)
             return
 
-        ticks_per_revolution = self.configuration.encoder_ticks_per_revolution
-        rotation_speed = self.simulation_configuration.rotation_speed
-        tickrate = self.simulation_configuration.tickrate
+        motion, duration = self._plan_movement(msg_ticks, rotate)
 
-        revolution_to_rotate = msg_ticks / ticks_per_revolution
-        angle_to_rotate = revolution_to_rotate * 2 * math.pi
-        time_to_rotate = abs(angle_to_rotate) / rotation_speed
-        time_ticks_to_rotate = round(time_to_rotate * tickrate)
-
-        for k, ticks_to_move in _spread_delta_on_ticks(msg_ticks,
-                                                       time_ticks_to_rotate):
-            if ticks_to_move == 0:
-                continue
-
-            self.event_queue.push(
-                EventOrder(
-                    type=EventType.MOVE_WHEEL,
-                    payload={
-                        'left':
-                        ticks_to_move if not rotate else -ticks_to_move,
-                        'right': ticks_to_move,
-                    },
-                ), k)
+        # A single event for the whole movement, the runner moves the wheels at every tick.
+        self.event_queue.push(
+            EventOrder(type=EventType.WHEEL_MOTION, payload=motion), 0)
 
         self.event_queue.push(
             EventOrder(type=EventType.MOVEMENT_DONE),
-            time_ticks_to_rotate +
-            self.simulation_configuration.tickrate // 10,
+            duration + self.simulation_configuration.tickrate // 10,
+        )
+
+    def _plan_movement(self, msg_ticks: int,
+                       rotate: bool) -> Tuple[AnyWheelMotion, int]:
+        """
+        Compute the movement of the wheels for a translation or a rotation of `msg_ticks` ticks.
+        Return the motion and its duration in simulation ticks.
+        """
+        tickrate = self.simulation_configuration.tickrate
+        motion_limit = self._get_motion_limit()
+        if motion_limit is None:
+            # No limit: the wheels turn at a constant speed.
+            ticks_per_revolution = self.configuration.encoder_ticks_per_revolution
+            revolution_to_rotate = msg_ticks / ticks_per_revolution
+            angle_to_rotate = revolution_to_rotate * 2 * math.pi
+            time_to_rotate = abs(
+                angle_to_rotate) / self.simulation_configuration.rotation_speed
+            time_ticks_to_rotate = round(time_to_rotate * tickrate)
+            return WheelMotion(
+                start_tick=self.event_queue.tick,
+                duration=time_ticks_to_rotate,
+                left_tick=msg_ticks if not rotate else -msg_ticks,
+                right_tick=msg_ticks,
+            ), time_ticks_to_rotate
+
+        max_speed = _min_limit(
+            motion_limit.rotation_speed
+            if rotate else motion_limit.translation_speed,
+            motion_limit.wheel_speed) or self._default_wheel_speed()
+        positions = trapezoidal_profile(
+            msg_ticks, max_speed, motion_limit.wheel_acceleration or math.inf,
+            tickrate)
+        return ProfiledWheelMotion(
+            start_tick=self.event_queue.tick,
+            positions=positions,
+            left_sign=-1 if rotate else 1,
+        ), len(positions)
+
+    def _move_wheels_at_speed(self, message: MoveWheelAtSpeedMsg) -> None:
+        """
+        Drive the wheels in speed mode: ramp from their current speed to the target speed.
+        """
+        LOGGER.get().info('simulation_handler_received_speed_order',
+                          left_tick_per_sec=message.left_tick_per_sec,
+                          right_tick_per_sec=message.right_tick_per_sec)
+
+        start_tick = self.event_queue.tick
+        initial_speeds: Tuple[TickPerSec, TickPerSec] = (0, 0)
+        for motion in self._robot_state().wheel_motions:
+            if isinstance(motion, SpeedWheelMotion):
+                initial_speeds = motion.speeds_at(start_tick - 1)
+
+        motion_limit = self._get_motion_limit() or MotionLimit()
+        acceleration = motion_limit.wheel_acceleration or math.inf
+        max_speed = motion_limit.wheel_speed or math.inf
+        left_speed, right_speed = (max(min(speed, max_speed), -max_speed)
+                                   for speed in (message.left_tick_per_sec,
+                                                 message.right_tick_per_sec))
+
+        self.event_queue.push(
+            EventOrder(type=EventType.WHEEL_MOTION,
+                       payload=SpeedWheelMotion(
+                           start_tick=start_tick,
+                           tickrate=self.simulation_configuration.tickrate,
+                           left=SpeedRamp(initial_speeds[0], left_speed,
+                                          acceleration),
+                           right=SpeedRamp(initial_speeds[1], right_speed,
+                                           acceleration),
+                       )), 0)
+
+    def _set_motion_limit(self, message: MotionLimitMsg) -> None:
+        """
+        Apply the limits sent by the robot to the next movements.
+        """
+        motion_limit = MotionLimit(
+            translation_speed=message.translation_speed,
+            rotation_speed=message.rotation_speed,
+            wheel_speed=message.wheel_speed,
+            wheel_acceleration=message.wheel_acceleration,
         )
+        LOGGER.get().info('simulation_handler_received_motion_limit',
+                          motion_limit=motion_limit)
+        self._robot_state().motion_limit = motion_limit
+
+    def _robot_state(self) -> RobotState:
+        # Looked up every time: the robot states are replaced when a snapshot is restored.
+        return self.simulation_state.robots[self.robot_id]
+
+    def _get_motion_limit(self) -> Optional[MotionLimit]:
+        motion_limit = self._robot_state().motion_limit
+        if motion_limit is not None:
+            return motion_limit
+        return self.simulation_configuration.motion_limit
+
+    def _default_wheel_speed(self) -> TickPerSec:
+        """
+        Speed of the wheels when no limit is set, from the rotation speed of the simulation.
+        """
+        return self.simulation_configuration.rotation_speed / (
+            2 * math.pi) * self.configuration.encoder_ticks_per_revolution
+
+
+def _min_limit(*limits: float) -> float:
+    """
+    Return the lowest limit, ignoring the limits set to 0 (not enforced). Return 0 if no limit is
+    set.
+    """
+    return min((limit for limit in limits if limit), default=0)
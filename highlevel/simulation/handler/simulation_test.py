@@ -3,8 +3,17 @@ Test for simulation handler module.
 """
 import pytest
 
-from proto.gen.python.outech_pb2 import BusMessage, TranslateMsg, RotateMsg
+import attr
+import numpy
+
+from proto.gen.python.outech_pb2 import BusMessage, TranslateMsg, RotateMsg, MotionLimitMsg, \
+    MoveWheelAtSpeedMsg
 from highlevel.simulation.entity.event import EventType, EventOrder
+from highlevel.simulation.entity.motion_limit import MotionLimit
+from highlevel.simulation.entity.robot_id import RobotID
+from highlevel.simulation.entity.simulation_state import RobotState
+from highlevel.simulation.entity.wheel_motion import WheelMotion, ProfiledWheelMotion, SpeedRamp, \
+    SpeedWheelMotion
 from highlevel.simulation.handler.simulation import SimulationHandler
 
 
@@ -20,6 +29,7 @@ def simulation_handler_setup(configuration_test, event_queue_mock,
         event_queue=event_queue_mock,
         simulation_state=simulation_state_mock,
         simulation_configuration=simulation_configuration_test,
+        robot_id=RobotID.RobotA,
     )
 
 
@@ -28,33 +38,20 @@ async def test_move_backward(simulation_handler, event_queue_mock):
     """
     Happy path for translation.
     """
+    event_queue_mock.tick = 42
     bus_message = BusMessage(translate=TranslateMsg(ticks=-3))
     msg_bytes = bus_message.SerializeToString()
     await simulation_handler.handle_movement_order(msg_bytes)
     event_queue_mock.push.assert_any_call(
-        EventOrder(type=EventType.MOVE_WHEEL,
-                   payload={
-                       'left': -1,
-                       'right': -1
-                   }), 62)
-
-    event_queue_mock.push.assert_any_call(
-        EventOrder(type=EventType.MOVE_WHEEL,
-                   payload={
-                       'left': -1,
-                       'right': -1
-                   }), 188)
-
-    event_queue_mock.push.assert_any_call(
-        EventOrder(type=EventType.MOVE_WHEEL,
-                   payload={
-                       'left': -1,
-                       'right': -1
-                   }), 313)
+        EventOrder(type=EventType.WHEEL_MOTION,
+                   payload=WheelMotion(start_tick=42,
+                                       duration=377,
+                                       left_tick=-3,
+                                       right_tick=-3)), 0)
 
     event_queue_mock.push.assert_any_call(
         EventOrder(type=EventType.MOVEMENT_DONE, payload=None), 397)
-    assert event_queue_mock.push.call_count == 4
+    assert event_queue_mock.push.call_count == 2
 
 
 @pytest.mark.asyncio
@@ -62,30 +59,20 @@ async def test_move_rotation(simulation_handler, event_queue_mock):
     """
     Happy path for rotation.
     """
+    event_queue_mock.tick = 42
     bus_message = BusMessage(rotate=RotateMsg(ticks=3))
     msg_bytes = bus_message.SerializeToString()
     await simulation_handler.handle_movement_order(msg_bytes)
     event_queue_mock.push.assert_any_call(
-        EventOrder(type=EventType.MOVE_WHEEL, payload={
-            'left': -1,
-            'right': 1
-        }), 62)
-
-    event_queue_mock.push.assert_any_call(
-        EventOrder(type=EventType.MOVE_WHEEL, payload={
-            'left': -1,
-            'right': 1
-        }), 188)
-
-    event_queue_mock.push.assert_any_call(
-        EventOrder(type=EventType.MOVE_WHEEL, payload={
-            'left': -1,
-            'right': 1
-        }), 313)
+        EventOrder(type=EventType.WHEEL_MOTION,
+                   payload=WheelMotion(start_tick=42,
+                                       duration=377,
+                                       left_tick=-3,
+                                       right_tick=3)), 0)
 
     event_queue_mock.push.assert_any_call(
         EventOrder(type=EventType.MOVEMENT_DONE, payload=None), 397)
-    assert event_queue_mock.push.call_count == 4
+    assert event_queue_mock.push.call_count == 2
 
 
 @pytest.mark.asyncio
@@ -99,3 +86,113 @@ async def test_move_wheels_zero_unit(simulation_handler, event_queue_mock):
 
     event_queue_mock.push.assert_called_with(
         EventOrder(type=EventType.MOVEMENT_DONE, payload=None), 0)
+
+
+@pytest.mark.asyncio
+async def test_motion_limit(simulation_handler, simulation_state_mock):
+    """
+    The motion limits sent by the robot are stored in the simulation state.
+    """
+    bus_message = BusMessage(motionLimit=MotionLimitMsg(
+        translation_speed=100, wheel_acceleration=200))
+    await simulation_handler.handle_movement_order(
+        bus_message.SerializeToString())
+
+    assert simulation_state_mock.robots[
+        RobotID.RobotA].motion_limit == MotionLimit(translation_speed=100,
+                                                    wheel_acceleration=200)
+
+
+@pytest.mark.asyncio
+async def test_motion_limit_other_robot(simulation_handler,
+                                        simulation_state_mock):
+    """
+    The handler of a robot only changes the state of this robot.
+    """
+    simulation_state_mock.robots[RobotID.RobotB] = RobotState()
+    simulation_handler.robot_id = RobotID.RobotB
+    bus_message = BusMessage(motionLimit=MotionLimitMsg(wheel_speed=100))
+    await simulation_handler.handle_movement_order(
+        bus_message.SerializeToString())
+
+    assert simulation_state_mock.robots[
+        RobotID.RobotB].motion_limit == MotionLimit(wheel_speed=100)
+    assert simulation_state_mock.robots[RobotID.RobotA].motion_limit is None
+
+
+@pytest.mark.asyncio
+async def test_move_with_motion_limit(simulation_handler, event_queue_mock,
+                                      simulation_state_mock):
+    """
+    With motion limits, the wheels follow a trapezoidal velocity profile.
+    """
+    event_queue_mock.tick = 42
+    simulation_state_mock.robots[RobotID.RobotA].motion_limit = MotionLimit(
+        rotation_speed=50, wheel_speed=100, wheel_acceleration=200)
+    bus_message = BusMessage(rotate=RotateMsg(ticks=-100))
+    await simulation_handler.handle_movement_order(
+        bus_message.SerializeToString())
+
+    event_order = event_queue_mock.push.call_args_list[0][0][0]
+    motion = event_order.payload
+    assert event_order.type == EventType.WHEEL_MOTION
+    assert isinstance(motion, ProfiledWheelMotion)
+    assert motion.start_tick == 42
+    assert motion.ticks_at(motion.end_tick) == (100, -100)
+    # 0.25s to accelerate to 50 ticks/s, 1.75s at 50 ticks/s, 0.25s to decelerate.
+    assert len(motion.positions) == 450
+    assert numpy.max(numpy.abs(numpy.diff(motion.positions))) == 1
+
+    event_queue_mock.push.assert_called_with(
+        EventOrder(type=EventType.MOVEMENT_DONE), 450 + 20)
+
+
+@pytest.mark.asyncio
+async def test_move_with_configured_motion_limit(
+    simulation_handler, event_queue_mock, simulation_configuration_test):
+    """
+    Without limits sent by the robot, the limits of the simulation configuration are used.
+    """
+    event_queue_mock.tick = 0
+    simulation_handler.simulation_configuration = attr.evolve(
+        simulation_configuration_test,
+        motion_limit=MotionLimit(wheel_speed=100))
+    bus_message = BusMessage(translate=TranslateMsg(ticks=100))
+    await simulation_handler.handle_movement_order(
+        bus_message.SerializeToString())
+
+    motion = event_queue_mock.push.call_args_list[0][0][0].payload
+    assert isinstance(motion, ProfiledWheelMotion)
+    # No acceleration limit, the tickrate is 200: half a tick per simulation tick.
+    assert len(motion.positions) == 200
+    assert motion.positions[99] == 50
+    assert motion.positions[-1] == 100
+
+
+@pytest.mark.asyncio
+async def test_move_wheels_at_speed(simulation_handler, event_queue_mock,
+                                    simulation_state_mock):
+    """
+    In speed mode, the wheels ramp from their current speed to the target speed, within the
+    limits.
+    """
+    event_queue_mock.tick = 10
+    simulation_state_mock.robots[RobotID.RobotA].motion_limit = MotionLimit(
+        wheel_speed=100, wheel_acceleration=200)
+    simulation_state_mock.robots[RobotID.RobotA].wheel_motions = [
+        SpeedWheelMotion(start_tick=0,
+                         tickrate=200,
+                         left=SpeedRamp(0, 50),
+                         right=SpeedRamp(0, 20))
+    ]
+    bus_message = BusMessage(moveWheelAtSpeed=MoveWheelAtSpeedMsg(
+        left_tick_per_sec=-500, right_tick_per_sec=40))
+    await simulation_handler.handle_movement_order(
+        bus_message.SerializeToString())
+
+    event_queue_mock.push.assert_called_once_with(
+        EventOrder(type=EventType.WHEEL_MOTION,
+                   payload=SpeedWheelMotion(start_tick=10,
+                                            tickrate=200,
+                                            left=SpeedRamp(50, -100, 200),
+                                            right=SpeedRamp(20, 40, 200))), 0)
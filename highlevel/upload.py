@@ -0,0 +1,26 @@
+"""
+Upload module.
+Upload the replays of the simulation saved in the spool directory.
+"""
+import asyncio
+
+from highlevel.container import SIMULATION_CONFIG
+from highlevel.simulation.client.http import HTTPClient
+from highlevel.simulation.client.web_browser import WebBrowserClient
+from highlevel.simulation.controller.replay_uploader import ReplayUploader
+
+
+def main() -> None:
+    """
+    Main function.
+    Upload every replay of the spool directory.
+    """
+    uploader = ReplayUploader(
+        http_client=HTTPClient(),
+        web_browser_client=WebBrowserClient(),
+        compress=SIMULATION_CONFIG.compress_replay_upload)
+    asyncio.run(uploader.upload_spool(SIMULATION_CONFIG.replay_spool_dir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Clock module.
+"""
+import asyncio
+import heapq
+import itertools
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import FrozenSet, List, Tuple
+
+# Tolerance on the deadlines, so that the rounding errors of the sum of the delays in seconds do not
+# delay a wake up by a whole tick.
+EPSILON = 1e-9
+
+
+class Clock(ABC):
+    """
+    Clock is an interface for reading the time and waiting, so that the robot can run either on the
+    actual time or on the time of the simulation.
+    """
+    @abstractmethod
+    def time(self) -> float:
+        """Return the current time, in seconds."""
+
+    @abstractmethod
+    async def sleep(self, delay: float) -> None:
+        """Wait for `delay` seconds."""
+
+
+class RealClock(Clock):
+    """
+    Clock following the time of the event loop.
+    """
+    def time(self) -> float:
+        return asyncio.get_event_loop().time()
+
+    async def sleep(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+
+@dataclass(frozen=True)
+class ClockSnapshot:
+    """
+    Time of a simulation clock and its pending sleeps, see SimulationClock.snapshot.
+    """
+    time: float
+    sleepers: FrozenSet[asyncio.Future]
+
+
+class SimulationClock(Clock):
+    """
+    Clock following the time of the simulation: the simulation runner advances it at every tick,
+    and the coroutines sleeping on it are woken up at the simulated time they asked for, however
+    fast the simulation runs. The robot and the simulation stay in lockstep, which makes the runs
+    reproducible.
+    """
+    def __init__(self) -> None:
+        self._time = 0.
+        self._sleepers: List[Tuple[float, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    def time(self) -> float:
+        return self._time
+
+    async def sleep(self, delay: float) -> None:
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+
+        future = asyncio.get_event_loop().create_future()
+        # The counter wakes up the sleepers with the same deadline in the order they fell asleep.
+        heapq.heappush(self._sleepers,
+                       (self._time + delay, next(self._counter), future))
+        await future
+
+    def advance(self, time: float) -> int:
+        """
+        Set the current time and wake up the coroutines whose sleep is over.
+        Return the number of coroutines woken up.
+        """
+        self._time = time
+        woken_up = 0
+        while self._sleepers and self._sleepers[0][0] <= time + EPSILON:
+            _, _, future = heapq.heappop(self._sleepers)
+            if not future.done(
+            ):  # The sleeping coroutine might have been cancelled.
+                future.set_result(None)
+                woken_up += 1
+        return woken_up
+
+    def snapshot(self) -> ClockSnapshot:
+        """
+        Capture the current time and the pending sleeps.
+        """
+        return ClockSnapshot(time=self._time,
+                             sleepers=frozenset(
+                                 future for _, _, future in self._sleepers
+                                 if not future.done()))
+
+    def restore(self, snapshot: ClockSnapshot) -> None:
+        """
+        Go back to the time of a snapshot. The sleeps pending when the snapshot was taken keep
+        their deadline, the ones started since then keep the delay they had left, from the restored
+        time. The sleeps woken up since then cannot be put back to sleep.
+        """
+        shift = snapshot.time - self._time
+        self._sleepers = [(deadline if future in snapshot.sleepers else
+                           deadline + shift, order, future)
+                          for deadline, order, future in self._sleepers
+                          if not future.done()]
+        heapq.heapify(self._sleepers)
+        self._time = snapshot.time
@@ -0,0 +1,100 @@
+"""
+Test for clock module.
+"""
+import asyncio
+
+import pytest
+
+from highlevel.util.clock import RealClock, SimulationClock
+
+
+@pytest.mark.asyncio
+async def test_real_clock():
+    """
+    The real clock follows the time of the event loop.
+    """
+    clock = RealClock()
+    start = clock.time()
+
+    await clock.sleep(0.01)
+
+    assert clock.time() - start >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_simulation_clock_sleep():
+    """
+    The sleeping coroutines wake up when the clock reaches their deadline, in order.
+    """
+    clock = SimulationClock()
+    woken_up = []
+
+    async def sleeper(name, delay):
+        await clock.sleep(delay)
+        woken_up.append((name, clock.time()))
+
+    tasks = [
+        asyncio.create_task(sleeper(name, delay))
+        for name, delay in (('a', 2), ('b', 1), ('c', 1))
+    ]
+    await asyncio.sleep(0)
+
+    assert clock.advance(0.5) == 0
+    await asyncio.sleep(0)
+    assert not woken_up
+
+    assert clock.advance(1.5) == 2
+    await asyncio.sleep(0)
+    assert woken_up == [('b', 1.5), ('c', 1.5)]
+
+    assert clock.advance(10) == 1
+    await asyncio.gather(*tasks)
+    assert woken_up[-1] == ('a', 10)
+
+
+@pytest.mark.asyncio
+async def test_simulation_clock_cancelled_sleep():
+    """
+    A cancelled sleep is not woken up.
+    """
+    clock = SimulationClock()
+    task = asyncio.create_task(clock.sleep(1))
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.sleep(0)
+
+    assert clock.advance(2) == 0
+
+
+@pytest.mark.asyncio
+async def test_simulation_clock_no_delay():
+    """
+    Sleeping for 0 seconds only yields.
+    """
+    clock = SimulationClock()
+    await asyncio.wait_for(clock.sleep(0), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_simulation_clock_snapshot_restore():
+    """
+    Restoring a snapshot goes back to its time. The sleeps pending at the snapshot keep their
+    deadline, the ones started later keep the delay they had left.
+    """
+    clock = SimulationClock()
+    before = asyncio.create_task(clock.sleep(2))
+    await asyncio.sleep(0)
+    snapshot = clock.snapshot()
+
+    clock.advance(1)
+    after = asyncio.create_task(clock.sleep(3))
+    await asyncio.sleep(0)
+    clock.restore(snapshot)
+
+    assert clock.time() == 0
+    assert clock.advance(1.5) == 0
+    assert clock.advance(2) == 1
+    await asyncio.sleep(0)
+    assert before.done() and not after.done()
+    assert clock.advance(3) == 1
+    await asyncio.wait_for(after, timeout=1)
@@ -0,0 +1,33 @@
+"""
+Broad phase module.
+"""
+from typing import List, Sequence, Tuple
+
+from highlevel.robot.entity.type import Millimeter
+
+# Axis-aligned bounding box: (min x, min y, max x, max y).
+Box = Tuple[Millimeter, Millimeter, Millimeter, Millimeter]
+
+
+def sweep_and_prune(boxes: Sequence[Box]) -> List[Tuple[int, int]]:
+    """
+    Find the pairs of overlapping boxes, as (i, j) index pairs with i < j.
+
+    The boxes are sorted along the x axis and swept from left to right, only the boxes whose x
+    interval is still open are tested against each other. This is O(n log n + k) for n boxes and
+    k overlapping x intervals, instead of the O(n²) of testing every pair.
+    """
+    order = sorted(range(len(boxes)), key=lambda index: boxes[index][0])
+    active: List[int] = []
+    pairs = []
+
+    for index in order:
+        min_x, min_y, _, max_y = boxes[index]
+        # The boxes that end before this one starts will not overlap any of the next ones either.
+        active = [other for other in active if boxes[other][2] >= min_x]
+        for other in active:
+            if boxes[other][1] <= max_y and min_y <= boxes[other][3]:
+                pairs.append((min(index, other), max(index, other)))
+        active.append(index)
+
+    return sorted(pairs)
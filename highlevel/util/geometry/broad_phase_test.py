@@ -0,0 +1,51 @@
+"""
+Test for broad phase module.
+"""
+import itertools
+import random
+
+from highlevel.util.geometry.broad_phase import sweep_and_prune
+
+
+def _overlap(box1, box2):
+    return (box1[0] <= box2[2] and box2[0] <= box1[2] and box1[1] <= box2[3]
+            and box2[1] <= box1[3])
+
+
+def test_sweep_and_prune_happy_path():
+    """
+    Only the overlapping boxes are paired, touching boxes overlap.
+    """
+    boxes = [
+        (0, 0, 10, 10),
+        (5, 5, 15, 15),
+        (20, 10, 30, 15),
+        (15, 15, 20, 20),
+        (5, 20, 10, 30),
+    ]
+
+    assert sweep_and_prune(boxes) == [(0, 1), (1, 3), (2, 3)]
+
+
+def test_sweep_and_prune_empty():
+    """
+    No box, no pair.
+    """
+    assert not sweep_and_prune([])
+
+
+def test_same_results_as_all_pairs():
+    """
+    Same pairs as testing every pair of boxes.
+    """
+    rng = random.Random(0)
+    boxes = []
+    for _ in range(200):
+        min_x, min_y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        boxes.append((min_x, min_y, min_x + rng.uniform(0, 100),
+                      min_y + rng.uniform(0, 100)))
+
+    expected = [(i, j)
+                for i, j in itertools.combinations(range(len(boxes)), 2)
+                if _overlap(boxes[i], boxes[j])]
+    assert sweep_and_prune(boxes) == expected
@@ -9,9 +9,14 @@ import numpy
 from highlevel.util.geometry.segment import Segment
 from highlevel.util.geometry.ray import Ray
 from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
 
+# Maximum number of (ray, segment) pairs tested in a single numpy call, to bound the memory used by
+# the temporary (rays, segments) arrays.
+MAX_PAIRS_PER_CHUNK = 1 << 18
 
-def ray_segment_intersection(
+
+def ray_segment_intersection(  # pylint: disable=too-many-locals
         ray: Ray,
         segment: Segment) -> Tuple[Optional[Vector2], Optional[float]]:
     """
@@ -23,11 +28,11 @@ def ray_segment_intersection(
     Return the intersection coordinates and the distance from the origin of the ray otherwise.
     """
 
-    origin = numpy.array([ray.origin.x, ray.origin.y])
-    direction = numpy.array([ray.direction.x, ray.direction.y])
+    origin_x, origin_y = ray.origin.x, ray.origin.y
+    direction_x, direction_y = ray.direction.x, ray.direction.y
 
-    start = numpy.array([segment.start.x, segment.start.y])
-    end = numpy.array([segment.end.x, segment.end.y])
+    start_x, start_y = segment.start.x, segment.start.y
+    segment_x, segment_y = segment.end.x - start_x, segment.end.y - start_y
 
     # Find intersection point:
     # origin + direction * x = start + (end - start) * y
@@ -36,22 +41,24 @@ def ray_segment_intersection(
     # direction ^ (end-start) * x = (start - origin) ^ (end-start)
     # A * x = B
     # x = B / A
-    segment_length2 = (end - start).dot(end - start)
+    segment_length2 = segment_x * segment_x + segment_y * segment_y
     if segment_length2 == 0:
         return None, None  # Segment is 0 length, will never be hit by a ray.
 
-    coef_a = numpy.cross(direction, (end - start))
+    coef_a = direction_x * segment_y - direction_y * segment_x
     if coef_a == 0:
         return None, None  # Collinear, will never intersect.
 
-    coef_b = numpy.cross(start - origin, end - start)
+    offset_x, offset_y = start_x - origin_x, start_y - origin_y
+    coef_b = offset_x * segment_y - offset_y * segment_x
     v_x = coef_b / coef_a
     if v_x < 0:
         return None, None  # Ray hit behind.
 
     # Then...
     # intersection_point = origin + direction * x
-    intersection_point = origin + direction * v_x
+    intersection_x = origin_x + direction_x * v_x
+    intersection_y = origin_y + direction_y * v_x
 
     # To find Y:
     # intersection_point = start + (end - start) * y
@@ -60,12 +67,13 @@ def ray_segment_intersection(
     # (intersection_point - start) . (end - start) = || end - start || ** 2 * y
     # y = (intersection_point - start) . (end - start) / || end - start || ** 2
     # y = (intersection_point - start) . (end - start) / || end - start || ** 2
-    coef_a = (intersection_point - start).dot(end - start)
+    offset_x, offset_y = intersection_x - start_x, intersection_y - start_y
+    coef_a = offset_x * segment_x + offset_y * segment_y
     v_y = coef_a / segment_length2
     if v_y <= 0 or v_y >= 1:
         return None, None  # Ray did not hit segment.
 
-    return Vector2(*intersection_point), v_x
+    return Vector2(intersection_x, intersection_y), v_x
 
 
 def ray_segments_intersection(
@@ -91,6 +99,80 @@ def ray_segments_intersection(
     return closest_point, closest_distance
 
 
+def segments_to_arrays(
+        segments: Iterable[Segment]) -> Tuple[Vector2Array, Vector2Array]:
+    """
+    Convert segments into two arrays: the start points and the end points.
+    """
+    segments = tuple(segments)
+    return (Vector2Array.from_vectors(seg.start for seg in segments),
+            Vector2Array.from_vectors(seg.end for seg in segments))
+
+
+def rays_segments_intersection(
+        origins: Vector2Array, directions: Vector2Array, starts: Vector2Array,
+        ends: Vector2Array) -> Tuple[numpy.ndarray, Vector2Array]:
+    """
+    Vectorized version of ray_segments_intersection: compute the closest intersection of M rays
+    (origins[i], directions[i]) with N segments [starts[j], ends[j]], with the same semantics as
+    ray_segment_intersection.
+
+    Return a (M,) array of distances (inf for the rays that do not hit any segment) and the array
+    of the M intersection points (nan for the rays that do not hit any segment).
+    """
+    distances = numpy.full(len(origins), math.inf)
+    if len(starts) > 0:
+        chunk_size = max(1, MAX_PAIRS_PER_CHUNK // len(starts))
+        for i in range(0, len(origins), chunk_size):
+            distances[i:i + chunk_size] = _closest_hit_distances(
+                origins.as_numpy()[i:i + chunk_size],
+                directions.as_numpy()[i:i + chunk_size], starts.as_numpy(),
+                ends.as_numpy())
+
+    with numpy.errstate(invalid='ignore'):
+        # inf * 0 is nan, which is what we want for the rays that did not hit anything.
+        points = origins.as_numpy() + directions.as_numpy() * numpy.where(
+            numpy.isinf(distances), numpy.nan, distances)[:, numpy.newaxis]
+    return distances, Vector2Array(points)
+
+
+def _closest_hit_distances(  # pylint: disable=too-many-locals
+        origins: numpy.ndarray, directions: numpy.ndarray,
+        starts: numpy.ndarray, ends: numpy.ndarray) -> numpy.ndarray:
+    """
+    Same computation as ray_segment_intersection, on a (rays, segments) grid.
+    """
+    # Every array below has the (rays, segments) shape, see ray_segment_intersection for the maths.
+    segment_x = (ends[:, 0] - starts[:, 0])[numpy.newaxis, :]
+    segment_y = (ends[:, 1] - starts[:, 1])[numpy.newaxis, :]
+    segment_length2 = segment_x * segment_x + segment_y * segment_y
+
+    origin_x = origins[:, 0, numpy.newaxis]
+    origin_y = origins[:, 1, numpy.newaxis]
+    direction_x = directions[:, 0, numpy.newaxis]
+    direction_y = directions[:, 1, numpy.newaxis]
+    start_x = starts[numpy.newaxis, :, 0]
+    start_y = starts[numpy.newaxis, :, 1]
+    offset_x, offset_y = start_x - origin_x, start_y - origin_y
+
+    coef_a = direction_x * segment_y - direction_y * segment_x
+    coef_b = offset_x * segment_y - offset_y * segment_x
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        v_x = coef_b / coef_a
+
+        intersection_x = origin_x + direction_x * v_x
+        intersection_y = origin_y + direction_y * v_x
+        projection = (intersection_x - start_x) * segment_x + (
+            intersection_y - start_y) * segment_y
+        v_y = projection / segment_length2
+
+        hit = (segment_length2 != 0) & (coef_a != 0)
+        hit &= (v_x >= 0) & (v_y > 0) & (v_y < 1)
+
+    return numpy.where(hit, v_x, math.inf).min(axis=1)
+
+
 def segment_segment_intersection(sgmt1: Segment,
                                  sgmt2: Segment) -> Optional[Vector2]:
     """
@@ -0,0 +1,68 @@
+"""
+Benchmarks for the intersection module: casting a full LIDAR scan against a set of segments.
+
+Run them with `make benchmark`.
+"""
+import math
+import random
+from typing import List
+
+import numpy
+import pytest
+
+from highlevel.util.geometry.intersection import (ray_segments_intersection,
+                                                  rays_segments_intersection,
+                                                  segments_to_arrays)
+from highlevel.util.geometry.ray import Ray
+from highlevel.util.geometry.segment import Segment
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
+
+
+def _random_segments(count: int) -> List[Segment]:
+    rng = random.Random(0)
+    return [
+        Segment(start=Vector2(rng.uniform(0, 3000), rng.uniform(0, 3000)),
+                end=Vector2(rng.uniform(0, 3000), rng.uniform(0, 3000)))
+        for _ in range(count)
+    ]
+
+
+def _directions(ray_count: int) -> Vector2Array:
+    angles = numpy.linspace(0, 2 * math.pi, ray_count, endpoint=False)
+    return Vector2Array.from_polar(angles, numpy.ones(ray_count))
+
+
+@pytest.mark.parametrize('ray_count,segment_count', [(360, 4), (360, 100)])
+def test_benchmark_ray_segments_intersection_loop(benchmark, ray_count,
+                                                  segment_count):
+    """
+    Benchmark a scan, casting one ray at a time.
+    """
+    segments = _random_segments(segment_count)
+    origin = Vector2(1500, 1000)
+    rays = [
+        Ray(origin=origin, direction=direction)
+        for direction in _directions(ray_count)
+    ]
+
+    def scan():
+        return [ray_segments_intersection(ray, segments) for ray in rays]
+
+    assert len(benchmark(scan)) == ray_count
+
+
+@pytest.mark.parametrize('ray_count,segment_count', [(360, 4), (360, 100),
+                                                     (3500, 4), (3500, 100)])
+def test_benchmark_rays_segments_intersection(benchmark, ray_count,
+                                              segment_count):
+    """
+    Benchmark a scan, casting all the rays at once with the vectorized kernel.
+    """
+    starts, ends = segments_to_arrays(_random_segments(segment_count))
+    directions = _directions(ray_count)
+    origins = Vector2Array(numpy.full((ray_count, 2), (1500, 1000)))
+
+    distances, _ = benchmark(rays_segments_intersection, origins, directions,
+                             starts, ends)
+    assert len(distances) == ray_count
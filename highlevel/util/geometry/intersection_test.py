@@ -1,13 +1,21 @@
 """
 Test for geometry module.
 """
-from highlevel.util.geometry.segment import Segment
-from highlevel.util.geometry.ray import Ray
-from highlevel.util.geometry.vector import Vector2
+import math
+import random
+
+import numpy
+
 from highlevel.util.geometry.intersection import (ray_segment_intersection,
                                                   ray_segments_intersection,
+                                                  rays_segments_intersection,
+                                                  segments_to_arrays,
                                                   segment_segment_intersection,
                                                   does_segment_intersect)
+from highlevel.util.geometry.segment import Segment
+from highlevel.util.geometry.ray import Ray
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
 
 
 def test_ray_segment_intersection_colinear():
@@ -196,6 +204,97 @@ def test_ray_segments_intersection_does_not_intersect():
     assert dist is None
 
 
+def test_rays_segments_intersection_happy_path():
+    """
+    Happy path, one ray per direction.
+
+               ^ Ray 1
+               |
+    +----------+-----------+ Segment 0
+               |
+               + Ray 0 and 1
+               |
+    +----------+-----------+ Segment 1
+               |
+               v Ray 0
+    """
+    starts, ends = segments_to_arrays([
+        Segment(start=Vector2(-1, 2), end=Vector2(1, 2)),
+        Segment(start=Vector2(-1, -1), end=Vector2(1, -1)),
+    ])
+    origins = Vector2Array.from_vectors([Vector2(0, 0), Vector2(0, 0)])
+    directions = Vector2Array.from_vectors([Vector2(0, -1), Vector2(0, 1)])
+
+    distances, points = rays_segments_intersection(origins, directions, starts,
+                                                   ends)
+
+    assert distances.tolist() == [1, 2]
+    assert points.to_vectors() == (Vector2(0, -1), Vector2(0, 2))
+
+
+def test_rays_segments_intersection_no_hit():
+    """
+    Rays that do not hit anything have an infinite distance and a nan intersection point.
+    """
+    starts, ends = segments_to_arrays([
+        Segment(start=Vector2(-1, -2), end=Vector2(1, -2)),
+    ])
+    origins = Vector2Array.from_vectors([Vector2(0, 0)])
+    directions = Vector2Array.from_vectors([Vector2(0, 1)])
+
+    distances, points = rays_segments_intersection(origins, directions, starts,
+                                                   ends)
+
+    assert distances.tolist() == [math.inf]
+    assert numpy.isnan(points.as_numpy()).all()
+
+
+def test_rays_segments_intersection_no_segment():
+    """
+    Without any segment, no ray hits.
+    """
+    starts, ends = segments_to_arrays([])
+    origins = Vector2Array.from_vectors([Vector2(0, 0)])
+    directions = Vector2Array.from_vectors([Vector2(0, 1)])
+
+    distances, _ = rays_segments_intersection(origins, directions, starts,
+                                              ends)
+
+    assert distances.tolist() == [math.inf]
+
+
+def test_rays_segments_intersection_same_as_scalar():
+    """
+    The vectorized kernel gives exactly the same results as ray_segments_intersection, including
+    the corner cases (0 length segments, colinear rays, rays going through segment ends).
+    """
+    rng = random.Random(42)
+    segments = [
+        Segment(start=Vector2(rng.randint(-5, 5), rng.randint(-5, 5)),
+                end=Vector2(rng.randint(-5, 5), rng.randint(-5, 5)))
+        for _ in range(30)
+    ]
+    rays = [
+        Ray(origin=Vector2(rng.randint(-5, 5), rng.randint(-5, 5)),
+            direction=Vector2(rng.randint(-2, 2), rng.randint(-2, 2)))
+        for _ in range(200)
+    ]
+    starts, ends = segments_to_arrays(segments)
+
+    distances, points = rays_segments_intersection(
+        Vector2Array.from_vectors(ray.origin for ray in rays),
+        Vector2Array.from_vectors(ray.direction for ray in rays), starts, ends)
+
+    for ray, distance, point in zip(rays, distances, points):
+        expected_point, expected_distance = ray_segments_intersection(
+            ray, segments)
+        if expected_distance is None:
+            assert distance == math.inf
+        else:
+            assert distance == expected_distance
+            assert point == expected_point
+
+
 def test_segment_segment_intersection_intersect():
     """
     Happy path.
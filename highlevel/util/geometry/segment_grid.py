@@ -0,0 +1,257 @@
+"""
+Segment grid module.
+"""
+import math
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from highlevel.robot.entity.type import Millimeter
+from highlevel.util.geometry.intersection import (ray_segment_intersection,
+                                                  segment_segment_intersection)
+from highlevel.util.geometry.ray import Ray
+from highlevel.util.geometry.segment import Segment
+from highlevel.util.geometry.vector import Vector2
+
+Cell = Tuple[int, int]
+
+
+class SegmentGrid:
+    """
+    Spatial index for a set of segments: the plane is divided in square cells and every cell holds
+    the segments that go through it (or through one of its 8 neighbours, so that the rounding
+    errors at the cell borders never make us miss a segment).
+
+    Ray and segment queries only test the segments of the cells they go through, instead of every
+    segment of the set. Segments can be inserted and removed at any time (i.e. moving obstacles).
+    """
+    def __init__(self, cell_size: Millimeter,
+                 segments: Iterable[Segment] = ()):
+        if cell_size <= 0:
+            raise ValueError("cell size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[Segment]] = {}
+        self._segment_cells: Dict[Segment, List[Cell]] = {}
+
+        # Bounds of the cells that have been used, segments are never found outside of them.
+        self._min_cell: Cell = (0, 0)
+        self._max_cell: Cell = (-1, -1)
+
+        for segment in segments:
+            self.insert(segment)
+
+    def __len__(self) -> int:
+        return len(self._segment_cells)
+
+    def __contains__(self, segment: object) -> bool:
+        return segment in self._segment_cells
+
+    def __iter__(self) -> Iterator[Segment]:
+        return iter(self._segment_cells)
+
+    def insert(self, segment: Segment) -> None:
+        """
+        Insert a segment in the grid. Inserting a segment that is already in the grid does nothing.
+        """
+        if segment in self._segment_cells:
+            return
+
+        cells = set()
+        for cell_x, cell_y in self._segment_traversal(segment):
+            for neighbour_x in range(cell_x - 1, cell_x + 2):
+                for neighbour_y in range(cell_y - 1, cell_y + 2):
+                    cells.add((neighbour_x, neighbour_y))
+
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(segment)
+        self._segment_cells[segment] = list(cells)
+
+        cells_x = [cell_x for cell_x, _ in cells]
+        cells_y = [cell_y for _, cell_y in cells]
+        if len(self._segment_cells) > 1:
+            cells_x += [self._min_cell[0], self._max_cell[0]]
+            cells_y += [self._min_cell[1], self._max_cell[1]]
+        self._min_cell = (min(cells_x), min(cells_y))
+        self._max_cell = (max(cells_x), max(cells_y))
+
+    def remove(self, segment: Segment) -> None:
+        """
+        Remove a segment from the grid. Raise KeyError if the segment is not in the grid.
+        """
+        for cell in self._segment_cells.pop(segment):
+            segments = self._cells[cell]
+            segments.remove(segment)
+            if not segments:
+                del self._cells[cell]
+
+    def ray_intersection(
+            self, ray: Ray) -> Tuple[Optional[Vector2], Optional[float]]:
+        """
+        Compute the closest intersection of a ray with the segments of the grid.
+        Same result as ray_segments_intersection.
+        """
+        closest_distance = math.inf
+        closest_point = None
+        tested: Set[Segment] = set()
+
+        for cell, cell_exit in self._traversal(ray.origin, ray.direction,
+                                               math.inf):
+            for segment in self._cells.get(cell, ()):
+                if segment in tested:
+                    continue
+                tested.add(segment)
+                point, distance = ray_segment_intersection(ray, segment)
+                if distance is not None and distance < closest_distance:
+                    closest_distance = distance
+                    closest_point = point
+
+            if closest_distance <= cell_exit:
+                # Every segment that could be hit before has already been tested.
+                break
+
+        if closest_point is None:
+            return None, None
+
+        return closest_point, closest_distance
+
+    def does_segment_intersect(self, sgmt1: Segment) -> bool:
+        """
+        Check if a segment intersects with one of the segments of the grid.
+        Same result as does_segment_intersect.
+        """
+        tested: Set[Segment] = set()
+        for cell in self._segment_traversal(sgmt1):
+            for sgmt2 in self._cells.get(cell, ()):
+                if sgmt2 in tested:
+                    continue
+                tested.add(sgmt2)
+                if segment_segment_intersection(sgmt1, sgmt2) is not None:
+                    return True
+
+        return False
+
+    def query_box(self, min_x: Millimeter, min_y: Millimeter,
+                  max_x: Millimeter, max_y: Millimeter) -> Set[Segment]:
+        """
+        Return the segments that may go through the box [min_x, max_x] x [min_y, max_y]: every
+        segment going through the box is returned, along with some of the segments whose bounding
+        box overlaps it.
+        """
+        size = self.cell_size
+        low_x = max(math.floor(min_x / size), self._min_cell[0])
+        low_y = max(math.floor(min_y / size), self._min_cell[1])
+        high_x = min(math.floor(max_x / size), self._max_cell[0])
+        high_y = min(math.floor(max_y / size), self._max_cell[1])
+
+        candidates: Set[Segment] = set()
+        for cell_x in range(low_x, high_x + 1):
+            for cell_y in range(low_y, high_y + 1):
+                candidates.update(self._cells.get((cell_x, cell_y), ()))
+
+        return {
+            segment
+            for segment in candidates
+            if min(segment.start.x, segment.end.x) <= max_x
+            and max(segment.start.x, segment.end.x) >= min_x
+            and min(segment.start.y, segment.end.y) <= max_y
+            and max(segment.start.y, segment.end.y) >= min_y
+        }
+
+    def _segment_traversal(self, segment: Segment) -> Iterator[Cell]:
+        """
+        Iterate over the cells a segment goes through.
+        """
+        for cell, _ in self._traversal(segment.start,
+                                       segment.end - segment.start,
+                                       1,
+                                       bounded=False):
+            yield cell
+
+    def _traversal(  # pylint: disable=too-many-locals
+            self,
+            origin: Vector2,
+            direction: Vector2,
+            t_max: float,
+            bounded: bool = True) -> Iterator[Tuple[Cell, float]]:
+        """
+        Iterate over the cells crossed by origin + direction * t, for t in [0, t_max], in order.
+        Yield the cell and the value of t when leaving the cell.
+        If `bounded` is set, only iterate over the cells that have been used by the segments.
+        See "A Fast Voxel Traversal Algorithm for Ray Tracing", Amanatides & Woo.
+        """
+        size = self.cell_size
+        t_min = 0.
+        if bounded:
+            clipped = self._clip(origin, direction, t_max)
+            if clipped is None:
+                return
+            t_min, t_max = clipped
+
+        cell = [
+            math.floor((origin.x + direction.x * t_min) / size),
+            math.floor((origin.y + direction.y * t_min) / size),
+        ]
+        if bounded:
+            # The entry point might be rounded just outside of the grid.
+            cell = [
+                min(max(cell[0], self._min_cell[0]), self._max_cell[0]),
+                min(max(cell[1], self._min_cell[1]), self._max_cell[1]),
+            ]
+
+        step = [0, 0]
+        t_next = [math.inf, math.inf]
+        t_delta = [math.inf, math.inf]
+        for axis, (axis_origin, axis_direction) in enumerate(
+            ((origin.x, direction.x), (origin.y, direction.y))):
+            if axis_direction > 0:
+                step[axis] = 1
+                t_next[axis] = (
+                    (cell[axis] + 1) * size - axis_origin) / axis_direction
+                t_delta[axis] = size / axis_direction
+            elif axis_direction < 0:
+                step[axis] = -1
+                t_next[axis] = (cell[axis] * size -
+                                axis_origin) / axis_direction
+                t_delta[axis] = -size / axis_direction
+
+        while True:
+            cell_exit = min(t_next)
+            yield (cell[0], cell[1]), cell_exit
+            if cell_exit >= t_max:
+                return
+            axis = 0 if t_next[0] < t_next[1] else 1
+            cell[axis] += step[axis]
+            t_next[axis] += t_delta[axis]
+            if bounded and not self._is_in_bounds(cell[axis], axis):
+                return
+
+    def _clip(self, origin: Vector2, direction: Vector2,
+              t_max: float) -> Optional[Tuple[float, float]]:
+        """
+        Clip origin + direction * t, for t in [0, t_max], to the bounds of the grid.
+        Return the clipped range of t, or None if the line does not go through the grid.
+        """
+        if not self._segment_cells:
+            return None
+
+        size = self.cell_size
+        t_min = 0.
+        for axis_origin, axis_direction, low, high in (
+            (origin.x, direction.x, self._min_cell[0] * size,
+             (self._max_cell[0] + 1) * size),
+            (origin.y, direction.y, self._min_cell[1] * size,
+             (self._max_cell[1] + 1) * size),
+        ):
+            if axis_direction == 0:
+                if not low <= axis_origin <= high:
+                    return None
+                continue
+            t_low = (low - axis_origin) / axis_direction
+            t_high = (high - axis_origin) / axis_direction
+            t_min = max(t_min, min(t_low, t_high))
+            t_max = min(t_max, max(t_low, t_high))
+
+        if t_min > t_max:
+            return None
+        return t_min, t_max
+
+    def _is_in_bounds(self, index: int, axis: int) -> bool:
+        return self._min_cell[axis] <= index <= self._max_cell[axis]
@@ -0,0 +1,62 @@
+"""
+Benchmarks for the segment grid: casting rays against many small obstacles.
+
+Run them with `make benchmark`.
+"""
+import random
+from typing import List
+
+from pytest import mark
+
+from highlevel.util.geometry.segment_grid import SegmentGrid
+from highlevel.util.geometry.intersection import ray_segments_intersection
+from highlevel.util.geometry.ray import Ray
+from highlevel.util.geometry.segment import Segment
+from highlevel.util.geometry.vector import Vector2
+
+
+def _short_segments(count: int) -> List[Segment]:
+    rng = random.Random(0)
+    segments = []
+    for _ in range(count):
+        start = Vector2(rng.uniform(0, 3000), rng.uniform(0, 2000))
+        end = start + Vector2(rng.uniform(-50, 50), rng.uniform(-50, 50))
+        segments.append(Segment(start=start, end=end))
+    return segments
+
+
+def _rays(count: int) -> List[Ray]:
+    rng = random.Random(1)
+    return [
+        Ray(origin=Vector2(rng.uniform(0, 3000), rng.uniform(0, 2000)),
+            direction=Vector2(rng.uniform(-1, 1), rng.uniform(-1, 1)))
+        for _ in range(count)
+    ]
+
+
+@mark.parametrize('segment_count', [10, 100, 1000])
+def test_benchmark_linear_search(benchmark, segment_count):
+    """
+    Benchmark 100 rays, testing every segment.
+    """
+    segments = _short_segments(segment_count)
+    rays = _rays(100)
+
+    def cast():
+        return [ray_segments_intersection(ray, segments) for ray in rays]
+
+    assert len(benchmark(cast)) == 100
+
+
+@mark.parametrize('segment_count', [10, 100, 1000])
+def test_benchmark_segment_grid(benchmark, segment_count):
+    """
+    Benchmark 100 rays, only testing the segments of the crossed cells.
+    """
+    grid = SegmentGrid(cell_size=100, segments=_short_segments(segment_count))
+    rays = _rays(100)
+
+    def cast():
+        return [grid.ray_intersection(ray) for ray in rays]
+
+    assert len(benchmark(cast)) == 100
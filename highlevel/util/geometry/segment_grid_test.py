@@ -0,0 +1,178 @@
+"""
+Test for segment grid module.
+"""
+import random
+from typing import List
+
+import pytest
+
+from highlevel.util.geometry.intersection import (does_segment_intersect,
+                                                  ray_segments_intersection)
+from highlevel.util.geometry.ray import Ray
+from highlevel.util.geometry.segment import Segment
+from highlevel.util.geometry.segment_grid import SegmentGrid
+from highlevel.util.geometry.vector import Vector2
+
+
+def _random_segments(rng: random.Random, count: int,
+                     size: float) -> List[Segment]:
+    segments = []
+    for _ in range(count):
+        start = Vector2(rng.uniform(-100, 100), rng.uniform(-100, 100))
+        end = start + Vector2(rng.uniform(-size, size), rng.uniform(
+            -size, size))
+        segments.append(Segment(start=start, end=end))
+    return segments
+
+
+def test_invalid_cell_size():
+    """
+    Cells must have a positive size.
+    """
+    with pytest.raises(ValueError):
+        SegmentGrid(cell_size=0)
+
+
+def test_insert_remove():
+    """
+    Happy path for insert and remove.
+    """
+    segment1 = Segment(start=Vector2(0, 0), end=Vector2(10, 10))
+    segment2 = Segment(start=Vector2(0, 10), end=Vector2(10, 0))
+    grid = SegmentGrid(cell_size=3, segments=[segment1])
+    grid.insert(segment2)
+    grid.insert(segment2)
+
+    assert len(grid) == 2
+    assert set(grid) == {segment1, segment2}
+
+    grid.remove(segment1)
+
+    assert len(grid) == 1
+    assert segment1 not in grid
+    assert segment2 in grid
+
+    with pytest.raises(KeyError):
+        grid.remove(segment1)
+
+
+def test_ray_intersection_happy_path():
+    """
+    Happy path, intersect the closest segment.
+
+    +----------------+ Segment 0
+    +----------------+ Segment 1
+            ^
+            | Ray
+            +
+    """
+    grid = SegmentGrid(cell_size=1,
+                       segments=[
+                           Segment(start=Vector2(-1, 20), end=Vector2(1, 20)),
+                           Segment(start=Vector2(-1, 10), end=Vector2(1, 10)),
+                       ])
+
+    pos, dist = grid.ray_intersection(
+        Ray(origin=Vector2(0, 0), direction=Vector2(0, 1)))
+
+    assert pos == Vector2(0, 10)
+    assert dist == 10
+
+
+def test_ray_intersection_empty_grid():
+    """
+    Nothing to intersect in an empty grid.
+    """
+    grid = SegmentGrid(cell_size=1)
+
+    pos, dist = grid.ray_intersection(
+        Ray(origin=Vector2(0, 0), direction=Vector2(0, 1)))
+
+    assert pos is None
+    assert dist is None
+
+
+def test_moving_obstacle():
+    """
+    Segments can be moved by removing and inserting them again.
+    """
+    obstacle = Segment(start=Vector2(-1, 10), end=Vector2(1, 10))
+    grid = SegmentGrid(cell_size=1, segments=[obstacle])
+    ray = Ray(origin=Vector2(0, 0), direction=Vector2(0, 1))
+
+    grid.remove(obstacle)
+    grid.insert(Segment(start=Vector2(-1, 5), end=Vector2(1, 5)))
+
+    assert grid.ray_intersection(ray) == (Vector2(0, 5), 5)
+
+
+@pytest.mark.parametrize('cell_size', [1, 10, 50])
+def test_same_results_as_linear_search(cell_size):
+    """
+    The grid gives the same answers as testing every segment, wherever the rays come from (inside
+    or outside of the grid).
+    """
+    rng = random.Random(42)
+    segments = _random_segments(rng, 200, 30)
+    grid = SegmentGrid(cell_size=cell_size, segments=segments)
+
+    for _ in range(300):
+        ray = Ray(origin=Vector2(rng.uniform(-150, 150),
+                                 rng.uniform(-150, 150)),
+                  direction=Vector2(rng.uniform(-1, 1), rng.uniform(-1, 1)))
+        assert grid.ray_intersection(ray) == ray_segments_intersection(
+            ray, segments)
+
+    for segment in _random_segments(rng, 300, 10):
+        assert grid.does_segment_intersect(segment) == does_segment_intersect(
+            segment, segments)
+
+
+def _box_sides(min_x, min_y, max_x, max_y):
+    corners = [
+        Vector2(min_x, min_y),
+        Vector2(max_x, min_y),
+        Vector2(max_x, max_y),
+        Vector2(min_x, max_y)
+    ]
+    return [
+        Segment(start=corners[index - 1], end=corners[index])
+        for index in range(4)
+    ]
+
+
+def _goes_through_box(segment, box):
+    if box[0] <= segment.start.x <= box[2] and box[
+            1] <= segment.start.y <= box[3]:
+        return True
+    return does_segment_intersect(segment, _box_sides(*box))
+
+
+def _bounding_boxes_overlap(segment, box):
+    return (min(segment.start.x, segment.end.x) <= box[2]
+            and max(segment.start.x, segment.end.x) >= box[0]
+            and min(segment.start.y, segment.end.y) <= box[3]
+            and max(segment.start.y, segment.end.y) >= box[1])
+
+
+@pytest.mark.parametrize('cell_size', [1, 10, 50])
+def test_query_box(cell_size):
+    """
+    The box query returns every segment going through the box, and only segments whose bounding
+    box overlaps the box.
+    """
+    rng = random.Random(42)
+    segments = _random_segments(rng, 200, 30)
+    grid = SegmentGrid(cell_size=cell_size, segments=segments)
+
+    for _ in range(100):
+        min_x, min_y = rng.uniform(-150, 150), rng.uniform(-150, 150)
+        box = (min_x, min_y, min_x + rng.uniform(1, 50),
+               min_y + rng.uniform(1, 50))
+        result = grid.query_box(*box)
+
+        for segment in segments:
+            if _goes_through_box(segment, box):
+                assert segment in result
+            if segment in result:
+                assert _bounding_boxes_overlap(segment, box)
@@ -6,74 +6,77 @@ from __future__ import annotations
 import sys
 from math import sqrt, atan2
 
-import numpy
-
 
 class Vector2:
     """
     Vector in 2 dimensions.
+    The components are stored as a pair of python floats: every operation only allocates the
+    resulting Vector2, without going through temporary numpy arrays.
     """
+    __slots__ = ('_x', '_y')
+
     def __init__(self, vec_x: float, vec_y: float):
-        self._v = numpy.array([vec_x, vec_y])
+        self._x = float(vec_x)
+        self._y = float(vec_y)
 
     @property
     def x(self) -> float:  # Allow single character property name. pylint: disable=invalid-name
         """
         Return the X component of the vector.
         """
-        return self._v[0]
+        return self._x
 
     @property
     def y(self) -> float:  # Allow single character property name. pylint: disable=invalid-name
         """
         Return the Y component of the vector.
         """
-        return self._v[1]
+        return self._y
 
     def __hash__(self):
-        return hash((self.x, self.y))
+        return hash((self._x, self._y))
 
     def __eq__(self, other: object) -> bool:
         # Note: we cannot use hash(x) == hash(y) here because we need to compare float values that
         # have a slight imprecision (sys.float_info.epsilon). hash would check that the two values
         # are precisely identical.
         if isinstance(other, Vector2):
-            return abs(self.x - other.x) < sys.float_info.epsilon and \
-                   abs(self.y - other.y) < sys.float_info.epsilon
+            return abs(self._x - other._x) < sys.float_info.epsilon and \
+                   abs(self._y - other._y) < sys.float_info.epsilon
         return False
 
     def __add__(self, other: Vector2) -> Vector2:
-        return _from_array(self._v + _to_array(other))
+        return Vector2(self._x + other._x, self._y + other._y)
 
     def __sub__(self, other: Vector2) -> Vector2:
-        return _from_array(self._v - _to_array(other))
+        return Vector2(self._x - other._x, self._y - other._y)
 
     def __str__(self) -> str:
-        return f'[{self.x:.2f}, {self.y:.2f}]'
+        return f'[{self._x:.2f}, {self._y:.2f}]'
 
     def __repr__(self) -> str:
         return f'Vector2{self}'
 
     def __mul__(self, scalar: float) -> Vector2:
-        return _from_array(self._v * scalar)
+        return Vector2(self._x * scalar, self._y * scalar)
 
     def __truediv__(self, scalar: float) -> Vector2:
         return self * (1 / scalar)
 
     def __neg__(self):
-        return self * (-1)
+        return Vector2(-self._x, -self._y)
 
     def dot(self, vec: Vector2) -> float:
         """
         Return the dot product of 2 vectors.
         """
-        return numpy.dot(self._v, _to_array(vec))
+        return self._x * vec.x + self._y * vec.y
 
     def norm2(self) -> float:
         """
         Return the norm2 of the vector (euclidean norm squared).
         """
-        return self.x**2 + self.y**2
+        return self._x**2 + self._y**2
 
     def euclidean_norm(self) -> float:
         """
@@ -85,12 +88,4 @@ class Vector2:
         """
         Return the angle of the vector.
         """
-        return atan2(self.y, self.x)
-
-
-def _to_array(vec: Vector2) -> numpy.ndarray:
-    return numpy.array([vec.x, vec.y])
-
-
-def _from_array(arr: numpy.ndarray) -> Vector2:
-    return Vector2(*arr)
+        return atan2(self._y, self._x)
@@ -0,0 +1,177 @@
+"""
+Vector array entity.
+"""
+from __future__ import annotations
+
+import sys
+from typing import Iterable, Iterator, Tuple, Union, overload
+
+import numpy
+
+from highlevel.robot.entity.type import Radian
+from highlevel.util.geometry.vector import Vector2
+
+
+class Vector2Array:
+    """
+    Array of N vectors in 2 dimensions, backed by a single (N, 2) float64 numpy array.
+    Every operation is applied to all the vectors at once, in a single numpy call.
+    """
+    __slots__ = ('_v', )
+
+    def __init__(self, array: numpy.ndarray):
+        array = numpy.asarray(array, dtype=numpy.float64)
+        if array.size == 0:
+            array = array.reshape((0, 2))
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError(
+                f"expected an array of shape (N, 2), got {array.shape}")
+        self._v = array
+
+    @staticmethod
+    def from_vectors(vectors: Iterable[Vector2]) -> Vector2Array:
+        """
+        Build an array from Vector2s.
+        """
+        return Vector2Array(
+            numpy.array([(vec.x, vec.y) for vec in vectors],
+                        dtype=numpy.float64))
+
+    @staticmethod
+    def from_polar(angles: numpy.ndarray,
+                   distances: numpy.ndarray) -> Vector2Array:
+        """
+        Build an array from polar coordinates.
+        """
+        result = numpy.empty((len(angles), 2))
+        numpy.multiply(distances, numpy.cos(angles), out=result[:, 0])
+        numpy.multiply(distances, numpy.sin(angles), out=result[:, 1])
+        return Vector2Array(result)
+
+    def to_vectors(self) -> Tuple[Vector2, ...]:
+        """
+        Convert the array into a tuple of Vector2s.
+        """
+        return tuple(Vector2(x, y) for x, y in self._v.tolist())
+
+    def as_numpy(self) -> numpy.ndarray:
+        """
+        Return the underlying (N, 2) numpy array (not a copy).
+        """
+        return self._v
+
+    @property
+    def x(self) -> numpy.ndarray:  # Allow single character property name. pylint: disable=invalid-name
+        """
+        Return the X components of the vectors.
+        """
+        return self._v[:, 0]
+
+    @property
+    def y(self) -> numpy.ndarray:  # Allow single character property name. pylint: disable=invalid-name
+        """
+        Return the Y components of the vectors.
+        """
+        return self._v[:, 1]
+
+    def __len__(self) -> int:
+        return len(self._v)
+
+    def __iter__(self) -> Iterator[Vector2]:
+        return iter(self.to_vectors())
+
+    @overload
+    def __getitem__(self, index: int) -> Vector2:
+        ...
+
+    @overload
+    def __getitem__(self, index: Union[slice, numpy.ndarray]) -> Vector2Array:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, numpy.integer)):
+            return Vector2(*self._v[index])
+        return Vector2Array(self._v[index])
+
+    __hash__ = None  # type: ignore
+
+    def __eq__(self, other: object) -> bool:
+        # Same tolerance as Vector2.__eq__.
+        if isinstance(other, Vector2Array):
+            return self._v.shape == other._v.shape and bool(
+                numpy.all(
+                    numpy.abs(self._v - other._v) < sys.float_info.epsilon))
+        return False
+
+    def __add__(self, other: Union[Vector2, Vector2Array]) -> Vector2Array:
+        return Vector2Array(self._v + _to_operand(other))
+
+    def __sub__(self, other: Union[Vector2, Vector2Array]) -> Vector2Array:
+        return Vector2Array(self._v - _to_operand(other))
+
+    def __mul__(self, scalar: float) -> Vector2Array:
+        return Vector2Array(self._v * scalar)
+
+    def __truediv__(self, scalar: float) -> Vector2Array:
+        return Vector2Array(self._v / scalar)
+
+    def __neg__(self) -> Vector2Array:
+        return Vector2Array(-self._v)
+
+    def __str__(self) -> str:
+        return '[' + ', '.join(str(vec) for vec in self.to_vectors()) + ']'
+
+    def __repr__(self) -> str:
+        return f'Vector2Array{self}'
+
+    def translate(self, vec: Vector2) -> Vector2Array:
+        """
+        Translate all the vectors by `vec`.
+        """
+        return self + vec
+
+    def rotate(self, angle: Radian) -> Vector2Array:
+        """
+        Rotate all the vectors counter-clockwise by `angle` around the origin.
+        """
+        cos, sin = numpy.cos(angle), numpy.sin(angle)
+        rotation = numpy.array([[cos, sin], [-sin, cos]])
+        return Vector2Array(self._v @ rotation)
+
+    def x_symmetry(self) -> Vector2Array:
+        """
+        Return the vectors mirrored along the Y axis (x becomes -x).
+        """
+        return Vector2Array(self._v * (-1, 1))
+
+    def dot(self, vec: Union[Vector2, Vector2Array]) -> numpy.ndarray:
+        """
+        Return the dot products of the vectors with `vec` (or element-wise with another array).
+        """
+        return numpy.einsum(
+            'ij,ij->i', self._v,
+            numpy.broadcast_to(_to_operand(vec), self._v.shape))
+
+    def norm2(self) -> numpy.ndarray:
+        """
+        Return the norm2 of the vectors (euclidean norm squared).
+        """
+        return numpy.einsum('ij,ij->i', self._v, self._v)
+
+    def euclidean_norm(self) -> numpy.ndarray:
+        """
+        Return the euclidean norms of the vectors.
+        """
+        return numpy.sqrt(self.norm2())
+
+    def to_angle(self) -> numpy.ndarray:
+        """
+        Return the angles of the vectors.
+        """
+        return numpy.arctan2(self._v[:, 1], self._v[:, 0])
+
+
+def _to_operand(other: Union[Vector2, Vector2Array]) -> numpy.ndarray:
+    if isinstance(other, Vector2Array):
+        return other.as_numpy()
+    return numpy.array((other.x, other.y))
@@ -0,0 +1,59 @@
+"""
+Benchmarks for vector array, compared against tuples of Vector2s.
+
+Run them with `make benchmark`.
+"""
+import math
+
+import numpy
+from pytest import fixture
+
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
+
+# Number of measurements in an RPLIDAR express scan.
+SCAN_SIZE = 3500
+
+
+@fixture(name='scan')
+def scan_setup():
+    """
+    A full LIDAR scan, in polar coordinates.
+    """
+    angles = numpy.linspace(0, 2 * math.pi, SCAN_SIZE, endpoint=False)
+    distances = numpy.full(SCAN_SIZE, 1000.)
+    return angles, distances
+
+
+def test_benchmark_transform_vectors(benchmark, scan):
+    """
+    Benchmark transforming a scan to the field frame, one Vector2 at a time.
+    """
+    angles, distances = scan
+    position, angle = Vector2(200, 1200), math.pi / 6
+
+    def transform():
+        result = []
+        for reading_angle, distance in zip(angles.tolist(),
+                                           distances.tolist()):
+            result.append(position + Vector2(
+                distance * math.cos(reading_angle + angle),
+                distance * math.sin(reading_angle + angle),
+            ))
+        return tuple(result)
+
+    assert len(benchmark(transform)) == SCAN_SIZE
+
+
+def test_benchmark_transform_vector_array(benchmark, scan):
+    """
+    Benchmark transforming a scan to the field frame, with a single array.
+    """
+    angles, distances = scan
+    position, angle = Vector2(200, 1200), math.pi / 6
+
+    def transform():
+        return Vector2Array.from_polar(angles,
+                                       distances).rotate(angle) + position
+
+    assert len(benchmark(transform)) == SCAN_SIZE
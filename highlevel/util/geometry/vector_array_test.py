@@ -0,0 +1,165 @@
+"""
+Test for vector array.
+"""
+import math
+
+import numpy
+import pytest
+
+from highlevel.util.geometry.vector import Vector2
+from highlevel.util.geometry.vector_array import Vector2Array
+
+SQRT2 = math.sqrt(2) / 2
+
+
+def test_from_vectors_to_vectors():
+    """
+    Test the conversion from and to Vector2s.
+    """
+    vecs = (Vector2(10, -42), Vector2(1, 2))
+    array = Vector2Array.from_vectors(vecs)
+
+    assert len(array) == 2
+    assert array.to_vectors() == vecs
+    assert tuple(array) == vecs
+
+
+def test_from_vectors_empty():
+    """
+    An empty array has the (0, 2) shape.
+    """
+    array = Vector2Array.from_vectors([])
+
+    assert len(array) == 0
+    assert array.as_numpy().shape == (0, 2)
+    assert not array.to_vectors()
+
+
+def test_invalid_shape():
+    """
+    Only (N, 2) arrays are accepted.
+    """
+    with pytest.raises(ValueError):
+        Vector2Array(numpy.zeros((3, 3)))
+
+
+def test_from_polar():
+    """
+    Test the conversion from polar coordinates.
+    """
+    array = Vector2Array.from_polar(numpy.array([0, math.pi / 2]),
+                                    numpy.array([10, 2]))
+
+    assert array[0] == Vector2(10, 0)
+    assert abs(array[1].x) < 1e-12
+    assert array[1].y == 2
+
+
+def test_properties():
+    """
+    Test X and Y properties.
+    """
+    array = Vector2Array.from_vectors([Vector2(10, -42), Vector2(1, 2)])
+
+    assert array.x.tolist() == [10, 1]
+    assert array.y.tolist() == [-42, 2]
+
+
+def test_getitem():
+    """
+    Test indexing with an integer, a slice and a mask.
+    """
+    # pylint: disable=no-member
+    array = Vector2Array.from_vectors(
+        [Vector2(1, 1), Vector2(2, 2),
+         Vector2(3, 3)])
+
+    assert array[1] == Vector2(2, 2)
+    assert array[1:].to_vectors() == (Vector2(2, 2), Vector2(3, 3))
+    assert array[array.x > 1.5].to_vectors() == (Vector2(2, 2), Vector2(3, 3))
+
+
+def test_string():
+    """
+    Test str and repr.
+    """
+    array = Vector2Array.from_vectors([Vector2(10, -42), Vector2(1, 2)])
+
+    assert str(array) == '[[10.00, -42.00], [1.00, 2.00]]'
+    assert repr(array) == 'Vector2Array[[10.00, -42.00], [1.00, 2.00]]'
+
+
+def test_equal():
+    """
+    Test equality.
+    """
+    array = Vector2Array.from_vectors([Vector2(1, 2)])
+
+    assert array == Vector2Array.from_vectors([Vector2(1, 2)])
+    assert array != Vector2Array.from_vectors([Vector2(2, 1)])
+    assert array != Vector2Array.from_vectors([Vector2(1, 2), Vector2(1, 2)])
+    assert array != Vector2(1, 2)
+
+
+def test_addition_subtraction():
+    """
+    Test + and - with a Vector2 and with another array.
+    """
+    array = Vector2Array.from_vectors([Vector2(42, 0), Vector2(1, 1)])
+    other = Vector2Array.from_vectors([Vector2(-40, 12), Vector2(1, 2)])
+
+    vec = Vector2(1, 2)
+
+    assert (array + vec).to_vectors() == (Vector2(43, 2), Vector2(2, 3))
+    assert (array + other).to_vectors() == (Vector2(2, 12), Vector2(2, 3))
+    assert (array - other).to_vectors() == (Vector2(82, -12), Vector2(0, -1))
+    assert array.translate(vec) == array + vec
+
+
+def test_multiplication_division_negation():
+    """
+    Test multiplication, division and negation.
+    """
+    array = Vector2Array.from_vectors([Vector2(42, -10)])
+
+    assert (array * 2).to_vectors() == (Vector2(84, -20), )
+    assert (array / 2).to_vectors() == (Vector2(21, -5), )
+    assert (-array).to_vectors() == (Vector2(-42, 10), )
+
+
+def test_rotate():
+    """
+    Test rotation, counter-clockwise.
+    """
+    array = Vector2Array.from_vectors([Vector2(1, 0), Vector2(0, 1)])
+    rotated = array.rotate(math.pi / 4)
+
+    numpy.testing.assert_allclose(rotated.as_numpy(),
+                                  [[SQRT2, SQRT2], [-SQRT2, SQRT2]])
+
+
+def test_x_symmetry():
+    """
+    Test symmetry along the Y axis.
+    """
+    array = Vector2Array.from_vectors([Vector2(-148, 29)])
+
+    assert array.x_symmetry().to_vectors() == (Vector2(148, 29), )
+
+
+def test_norms_and_angles():
+    """
+    Test dot, norms and angles, compared to the Vector2 implementation.
+    """
+    vecs = [Vector2(1, -1), Vector2(3, 4), Vector2(-2, 0.5)]
+    array = Vector2Array.from_vectors(vecs)
+
+    other = Vector2(3, 4)
+
+    assert array.dot(other).tolist() == [vec.dot(other) for vec in vecs]
+    assert array.dot(array).tolist() == [vec.dot(vec) for vec in vecs]
+    assert array.norm2().tolist() == [vec.norm2() for vec in vecs]
+    assert array.euclidean_norm().tolist() == [
+        vec.euclidean_norm() for vec in vecs
+    ]
+    assert array.to_angle().tolist() == [vec.to_angle() for vec in vecs]
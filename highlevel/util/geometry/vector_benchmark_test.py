@@ -0,0 +1,145 @@
+"""
+Benchmarks for vector, compared against the previous numpy-backed implementation.
+
+Run them with `make benchmark`.
+"""
+from __future__ import annotations
+
+import sys
+from math import sqrt, atan2
+
+import numpy
+import pytest
+
+from highlevel.util.geometry.vector import Vector2
+
+
+class NumpyVector2:
+    """
+    Former implementation of Vector2, wrapping a 2-element numpy array. Kept as a reference for
+    the benchmarks.
+    """
+    def __init__(self, vec_x: float, vec_y: float):
+        self._v = numpy.array([vec_x, vec_y])
+
+    @property
+    def x(self) -> float:  # Allow single character property name. pylint: disable=invalid-name
+        """
+        Return the X component of the vector.
+        """
+        return self._v[0]
+
+    @property
+    def y(self) -> float:  # Allow single character property name. pylint: disable=invalid-name
+        """
+        Return the Y component of the vector.
+        """
+        return self._v[1]
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, NumpyVector2):
+            return abs(self.x - other.x) < sys.float_info.epsilon and \
+                   abs(self.y - other.y) < sys.float_info.epsilon
+        return False
+
+    def __add__(self, other: NumpyVector2) -> NumpyVector2:
+        return NumpyVector2(*(self._v + numpy.array([other.x, other.y])))
+
+    def __sub__(self, other: NumpyVector2) -> NumpyVector2:
+        return NumpyVector2(*(self._v - numpy.array([other.x, other.y])))
+
+    def __mul__(self, scalar: float) -> NumpyVector2:
+        return NumpyVector2(*(self._v * scalar))
+
+    def dot(self, vec: NumpyVector2) -> float:
+        """
+        Return the dot product of 2 vectors.
+        """
+        return numpy.dot(self._v, numpy.array([vec.x, vec.y]))
+
+    def euclidean_norm(self) -> float:
+        """
+        Return the norm2 of the vector.
+        """
+        return sqrt(self.x**2 + self.y**2)
+
+    def to_angle(self) -> float:
+        """
+        Return the angle of the vector.
+        """
+        return atan2(self.y, self.x)
+
+
+IMPLEMENTATIONS = [
+    pytest.param(Vector2, id='slots'),
+    pytest.param(NumpyVector2, id='numpy'),
+]
+
+
+@pytest.mark.parametrize('cls', IMPLEMENTATIONS)
+def test_benchmark_creation(benchmark, cls):
+    """
+    Benchmark the construction of a vector.
+    """
+    benchmark(cls, 1.5, -2.5)
+
+
+@pytest.mark.parametrize('cls', IMPLEMENTATIONS)
+def test_benchmark_addition(benchmark, cls):
+    """
+    Benchmark +.
+    """
+    vec1, vec2 = cls(1.5, -2.5), cls(3, 4)
+    assert benchmark(lambda: vec1 + vec2) == cls(4.5, 1.5)
+
+
+@pytest.mark.parametrize('cls', IMPLEMENTATIONS)
+def test_benchmark_subtraction(benchmark, cls):
+    """
+    Benchmark -.
+    """
+    vec1, vec2 = cls(1.5, -2.5), cls(3, 4)
+    assert benchmark(lambda: vec1 - vec2) == cls(-1.5, -6.5)
+
+
+@pytest.mark.parametrize('cls', IMPLEMENTATIONS)
+def test_benchmark_multiplication(benchmark, cls):
+    """
+    Benchmark multiplication by a scalar.
+    """
+    vec = cls(1.5, -2.5)
+    assert benchmark(lambda: vec * 2) == cls(3, -5)
+
+
+@pytest.mark.parametrize('cls', IMPLEMENTATIONS)
+def test_benchmark_dot(benchmark, cls):
+    """
+    Benchmark dot product.
+    """
+    vec1, vec2 = cls(1, 2), cls(3, 4)
+    assert benchmark(vec1.dot, vec2) == 11
+
+
+@pytest.mark.parametrize('cls', IMPLEMENTATIONS)
+def test_benchmark_norm(benchmark, cls):
+    """
+    Benchmark euclidean norm.
+    """
+    vec = cls(3, 4)
+    assert benchmark(vec.euclidean_norm) == 5
+
+
+@pytest.mark.parametrize('cls', IMPLEMENTATIONS)
+def test_benchmark_odometry_step(benchmark, cls):
+    """
+    Benchmark a typical odometry update: a position translated along the current heading.
+    """
+    pos, heading = cls(200, 1200), cls(0.6, 0.8)
+
+    def step():
+        return pos + heading * 10 - heading * 5
+
+    assert benchmark(step) == cls(203, 1204)
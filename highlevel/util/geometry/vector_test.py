@@ -4,6 +4,8 @@ Test for vector.
 import math
 from math import sqrt
 
+import numpy
+
 from highlevel.util.geometry.vector import Vector2
 
 
@@ -121,3 +123,14 @@ def test_to_angle():
     Test to angle.
     """
     assert Vector2(1, -1).to_angle() == -math.pi / 4
+
+
+def test_components_are_python_floats():
+    """
+    Components are stored as plain python floats, even when built from numpy scalars.
+    """
+    vec = Vector2(numpy.float64(1.5), 2)
+
+    assert type(vec.x) is float  # pylint: disable=unidiomatic-typecheck
+    assert type(vec.y) is float  # pylint: disable=unidiomatic-typecheck
+    assert not hasattr(vec, '__dict__')
@@ -0,0 +1,62 @@
+"""
+Handoff module.
+"""
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+@dataclass
+class HandoffStats:
+    """
+    Counts of the values that went through a handoff.
+    """
+    put: int = 0
+    delivered: int = 0
+    dropped: int = 0  # Values replaced by a newer one before being delivered.
+
+
+class LatestValueHandoff(Generic[T]):
+    """
+    Pass values produced on another thread to a callback run on the event loop.
+
+    The handoff holds a single value: if the loop has not consumed the previous value when a new
+    one is put, the previous one is dropped and only the latest is delivered. The producer never
+    waits for the loop, and no backlog builds up when the loop is busy.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop,
+                 callback: Callable[[T], None]):
+        self._loop = loop
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._pending = False
+        self.stats = HandoffStats()
+
+    def put(self, value: T) -> None:
+        """
+        Hand a value to the event loop, replacing the one not delivered yet. Can be called from
+        any thread.
+        """
+        with self._lock:
+            self.stats.put += 1
+            if self._pending:
+                self.stats.dropped += 1
+            was_pending = self._pending
+            self._value = value
+            self._pending = True
+
+        # A delivery is already scheduled, it will pick up the new value.
+        if not was_pending:
+            self._loop.call_soon_threadsafe(self._deliver)
+
+    def _deliver(self) -> None:
+        with self._lock:
+            value = self._value
+            self._value = None
+            self._pending = False
+            self.stats.delivered += 1
+        self._callback(value)  # type: ignore
@@ -0,0 +1,50 @@
+"""
+Test for handoff module.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from highlevel.util.handoff import LatestValueHandoff
+
+
+@pytest.mark.asyncio
+async def test_handoff_delivers_on_event_loop():
+    """
+    The values put from another thread are delivered on the thread of the event loop.
+    """
+    received = []
+    handoff = LatestValueHandoff(asyncio.get_event_loop(),
+                                 lambda value: received.append(
+                                     (value, threading.get_ident())))
+
+    thread = threading.Thread(target=handoff.put, args=(42, ))
+    thread.start()
+    thread.join()
+    await asyncio.sleep(0)
+
+    assert received == [(42, threading.get_ident())]
+    assert handoff.stats.delivered == 1
+    assert handoff.stats.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_handoff_latest_value_wins():
+    """
+    When the loop is busy, only the latest value is delivered and the others are counted as
+    dropped.
+    """
+    received = []
+    handoff = LatestValueHandoff(asyncio.get_event_loop(), received.append)
+
+    for value in range(5):
+        handoff.put(value)
+    await asyncio.sleep(0)
+    handoff.put(5)
+    await asyncio.sleep(0)
+
+    assert received == [4, 5]
+    assert handoff.stats.put == 6
+    assert handoff.stats.delivered == 2
+    assert handoff.stats.dropped == 4
@@ -0,0 +1,134 @@
+"""
+Tick profiler module.
+"""
+import contextlib
+import time
+from typing import Any, Callable, ContextManager, Dict, Optional
+
+import numpy
+
+# Number of durations kept for each phase.
+DEFAULT_CAPACITY = 1024
+# Context manager of the phases when the profiler is not enabled.
+NO_TIMER = contextlib.nullcontext()
+
+
+class PhaseTimings:
+    """
+    Ring buffer holding the last durations of a phase, in seconds.
+    """
+    def __init__(self, capacity: int):
+        self.durations = numpy.zeros(capacity)
+        self.count = 0  # Durations recorded since the start, including the overwritten ones.
+
+    def record(self, duration: float) -> None:
+        """
+        Record a duration, overwriting the oldest one if the buffer is full.
+        """
+        self.durations[self.count % len(self.durations)] = duration
+        self.count += 1
+
+    def samples(self) -> numpy.ndarray:
+        """
+        Durations currently in the buffer, in no particular order.
+        """
+        return self.durations[:self.count]
+
+    def summary(self) -> dict:
+        """
+        Statistics on the durations in the buffer.
+        """
+        samples = self.samples()
+        p50, p99 = numpy.percentile(samples, (50, 99))
+        return {
+            'count': self.count,
+            'mean': float(samples.mean()),
+            'p50': float(p50),
+            'p99': float(p99),
+            'max': float(samples.max()),
+        }
+
+
+class PhaseTimer:
+    """
+    Context manager recording the duration of its block as a phase of a profiler.
+    """
+    def __init__(self, profiler: 'TickProfiler', phase: str):
+        self._profiler = profiler
+        self._phase = phase
+        self._start = 0.
+
+    def __enter__(self) -> None:
+        self._start = self._profiler.timer()
+
+    def __exit__(self, *_: Any) -> None:
+        self._profiler.record(self._phase,
+                              self._profiler.timer() - self._start)
+
+
+class TickProfiler:
+    """
+    Record how long each phase of a tick takes: the phases are the blocks run in `with
+    profiler.phase(name)`, the whole tick being the 'tick' phase.
+
+    Only the last `capacity` durations of each phase are kept, so the memory used does not grow
+    with the length of the run. When the profiler is not enabled, phase returns a context manager
+    doing nothing, so that the profiler costs next to nothing.
+    """
+    def __init__(self,
+                 enabled: bool = False,
+                 capacity: int = DEFAULT_CAPACITY,
+                 timer: Callable[[], float] = time.perf_counter):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.timer = timer
+        self.phases: Dict[str, PhaseTimings] = {}
+        self._timers: Dict[str, PhaseTimer] = {}
+
+    def phase(self, name: str) -> ContextManager[None]:
+        """
+        Context manager timing the phase `name`.
+        """
+        if not self.enabled:
+            return NO_TIMER
+
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = PhaseTimer(self, name)
+        return timer
+
+    def record(self, phase: str, duration: float) -> None:
+        """
+        Record a duration of `phase`.
+        """
+        timings = self.phases.get(phase)
+        if timings is None:
+            timings = self.phases[phase] = PhaseTimings(self.capacity)
+        timings.record(duration)
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Statistics on the durations of each phase (see PhaseTimings.summary).
+        """
+        return {
+            phase: timings.summary()
+            for phase, timings in self.phases.items()
+        }
+
+    def histogram(self, phase: str, bins: int = 20) -> Optional[dict]:
+        """
+        Histogram of the durations of a phase, on logarithmic bins. Return None if the phase was
+        never recorded.
+        """
+        timings = self.phases.get(phase)
+        if timings is None:
+            return None
+
+        samples = timings.samples()
+        # Durations of 0 (below the resolution of the timer) go to the first bin.
+        low = max(samples.min(), 1e-9)
+        high = max(samples.max(), low * 10)
+        counts, edges = numpy.histogram(numpy.maximum(samples, low),
+                                        bins=numpy.geomspace(
+                                            low, high, bins + 1))
+        return {'counts': counts.tolist(), 'edges': edges.tolist()}
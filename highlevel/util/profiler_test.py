@@ -0,0 +1,94 @@
+"""
+Test for tick profiler module.
+"""
+import pytest
+
+from highlevel.util.profiler import TickProfiler
+
+
+class FakeTimer:
+    """
+    Timer returning the time set by the test.
+    """
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+def test_profiler_records_phases():
+    """
+    Each phase records the time spent in its block.
+    """
+    timer = FakeTimer()
+    profiler = TickProfiler(enabled=True, capacity=10, timer=timer)
+
+    for tick in range(4):
+        with profiler.phase('tick'):
+            with profiler.phase('events'):
+                timer.now += 1
+            if tick % 2 == 0:
+                with profiler.phase('lidar'):
+                    timer.now += 2
+
+    summary = profiler.summary()
+    assert summary['events'] == {
+        'count': 4,
+        'mean': 1,
+        'p50': 1,
+        'p99': 1,
+        'max': 1,
+    }
+    assert summary['lidar']['count'] == 2
+    assert summary['tick']['mean'] == 2
+    assert summary['tick']['max'] == 3
+
+
+def test_profiler_ring_buffer():
+    """
+    Only the last durations are kept.
+    """
+    timer = FakeTimer()
+    profiler = TickProfiler(enabled=True, capacity=3, timer=timer)
+
+    for duration in (10, 1, 2, 3):
+        with profiler.phase('events'):
+            timer.now += duration
+
+    summary = profiler.summary()['events']
+    assert summary['count'] == 4
+    assert summary['max'] == 3
+    assert summary['p50'] == 2
+    assert summary['p99'] == pytest.approx(2.98)
+
+
+def test_profiler_histogram():
+    """
+    The histogram counts every duration of the buffer.
+    """
+    timer = FakeTimer()
+    profiler = TickProfiler(enabled=True, timer=timer)
+
+    for duration in (0, 1e-6, 1e-5, 1e-3):
+        with profiler.phase('events'):
+            timer.now += duration
+
+    histogram = profiler.histogram('events', bins=5)
+    assert sum(histogram['counts']) == 4
+    assert len(histogram['edges']) == 6
+    assert profiler.histogram('lidar') is None
+
+
+def test_profiler_disabled():
+    """
+    A disabled profiler records nothing.
+    """
+    timer = FakeTimer()
+    profiler = TickProfiler(timer=timer)
+
+    with profiler.phase('events'):
+        timer.now += 1
+
+    assert not profiler.phases
+    assert profiler.histogram('events') is None
@@ -0,0 +1,103 @@
+"""
+Virtual time module.
+"""
+import asyncio
+import selectors
+from typing import Any, Awaitable, List, Mapping, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class _VirtualTimeSelector(selectors.BaseSelector):
+    """
+    Selector that never waits for a timer: when nothing is ready, it advances the virtual time of
+    the loop to the next timer instead of sleeping. The I/O events are still polled by the wrapped
+    selector.
+    """
+    def __init__(self, selector: selectors.BaseSelector,
+                 loop: 'VirtualTimeEventLoop'):
+        self._selector = selector
+        self._loop = loop
+
+    def select(
+        self,
+        timeout: Optional[float] = None
+    ) -> List[Tuple[selectors.SelectorKey, int]]:
+        """
+        Poll the I/O events. `timeout` is the time until the next timer, None if there is none.
+        """
+        if timeout is None:
+            # Nothing scheduled: only I/O (or another thread) can wake the loop up.
+            return self._selector.select(None)
+
+        events = self._selector.select(0)
+        if not events:
+            self._loop.advance(timeout)
+        return events
+
+    def register(self,
+                 fileobj: Any,
+                 events: int,
+                 data: Any = None) -> selectors.SelectorKey:
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj: Any) -> selectors.SelectorKey:
+        return self._selector.unregister(fileobj)
+
+    def modify(self,
+               fileobj: Any,
+               events: int,
+               data: Any = None) -> selectors.SelectorKey:
+        return self._selector.modify(fileobj, events, data)
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def get_map(self) -> Mapping[Any, selectors.SelectorKey]:
+        return self._selector.get_map()
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop running on a virtual clock: whenever every task is waiting for a timer (i.e.
+    asyncio.sleep), the clock jumps to the next timer instead of actually waiting. The timers
+    expire in the same order and at the same loop time as with a regular loop, as fast as the CPU
+    allows.
+    """
+    def __init__(self) -> None:
+        self._virtual_time = 0.
+        super().__init__(
+            selector=_VirtualTimeSelector(selectors.DefaultSelector(), self))
+
+    def time(self) -> float:
+        """
+        Return the virtual time.
+        """
+        return self._virtual_time
+
+    def advance(self, delay: float) -> None:
+        """
+        Move the virtual clock forward.
+        """
+        self._virtual_time += delay
+
+
+def run_in_virtual_time(main: Awaitable[T]) -> T:
+    """
+    Run a coroutine in a VirtualTimeEventLoop, the same way as asyncio.run.
+    """
+    loop = VirtualTimeEventLoop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
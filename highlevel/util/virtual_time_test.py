@@ -0,0 +1,73 @@
+"""
+Test for virtual time module.
+"""
+import asyncio
+import time
+
+from highlevel.util.virtual_time import run_in_virtual_time
+
+
+def test_sleep_does_not_wait():
+    """
+    Sleeping advances the virtual clock without waiting.
+    """
+    async def sleep():
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        await asyncio.sleep(3600)
+        return loop.time() - start
+
+    start = time.perf_counter()
+    assert run_in_virtual_time(sleep()) == 3600
+    assert time.perf_counter() - start < 1
+
+
+def test_timers_order():
+    """
+    The timers expire in order, at their exact time.
+    """
+    woken_up = []
+
+    async def sleeper(name, delay):
+        await asyncio.sleep(delay)
+        woken_up.append((name, asyncio.get_event_loop().time()))
+
+    async def sleepers():
+        await asyncio.gather(sleeper('a', 3), sleeper('b', 1),
+                             sleeper('c', 2.5))
+
+    run_in_virtual_time(sleepers())
+
+    assert woken_up == [('b', 1), ('c', 2.5), ('a', 3)]
+
+
+def test_io_is_not_starved():
+    """
+    The loop still waits for the I/O and the other threads when no timer is scheduled.
+    """
+    async def run_in_thread():
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, lambda: time.sleep(0.01) or 42)
+
+    assert run_in_virtual_time(run_in_thread()) == 42
+
+
+def test_pending_tasks_are_cancelled():
+    """
+    The tasks still running when the main coroutine returns are cancelled.
+    """
+    async def forever(flags):
+        try:
+            await asyncio.sleep(1e9)
+        except asyncio.CancelledError:
+            flags.append('cancelled')
+            raise
+
+    async def main(flags):
+        asyncio.create_task(forever(flags))
+        await asyncio.sleep(0)
+
+    flags = []
+    run_in_virtual_time(main(flags))
+
+    assert flags == ['cancelled']